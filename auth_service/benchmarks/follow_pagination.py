@@ -0,0 +1,138 @@
+"""Follower pagination benchmark.
+
+Seeds one author with a large number of followers in the configured auth
+database, then times fetching the same deep page with the deprecated OFFSET
+path and with keyset cursors:
+
+    DB_NAME=bench_db python -m auth_service.benchmarks.follow_pagination --followers 1000000
+
+Seeded rows use the ``@bench.local`` email domain and are removed with
+``--cleanup``. The script refuses to run against databases whose name does
+not contain ``test`` or ``bench``.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+
+from auth_service.src.infrastructure.config import settings
+from auth_service.src.infrastructure.database import async_session_factory, engine
+from auth_service.src.infrastructure.repositories.user_repository import UserRepository
+
+AUTHOR_EMAIL = "author@bench.local"
+
+
+async def seed(followers: int) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("DELETE FROM users WHERE email LIKE '%@bench.local'"))
+        await conn.execute(
+            text(
+                """
+                INSERT INTO users (id, email, username, hashed_password, is_verified, followers_count)
+                VALUES (gen_random_uuid(), :email, 'bench_author', 'not-used', true, :followers)
+                """
+            ),
+            {"email": AUTHOR_EMAIL, "followers": followers},
+        )
+        await conn.execute(
+            text(
+                """
+                INSERT INTO users (id, email, username, hashed_password, is_verified, following_count)
+                SELECT gen_random_uuid(), 'follower' || g || '@bench.local', 'bench_follower_' || g,
+                       'not-used', true, 1
+                FROM generate_series(1, :followers) AS g
+                """
+            ),
+            {"followers": followers},
+        )
+        await conn.execute(
+            text(
+                """
+                INSERT INTO subscriptions (subscriber_id, author_id, created_at)
+                SELECT follower.id, author.id, now() - (row_number() OVER ()) * interval '1 second'
+                FROM users AS follower, users AS author
+                WHERE follower.email LIKE 'follower%@bench.local' AND author.email = :email
+                """
+            ),
+            {"email": AUTHOR_EMAIL},
+        )
+        await conn.execute(text("ANALYZE users"))
+        await conn.execute(text("ANALYZE subscriptions"))
+
+
+async def author_id():
+    async with engine.connect() as conn:
+        result = await conn.execute(text("SELECT id FROM users WHERE email = :email"), {"email": AUTHOR_EMAIL})
+        return result.scalar_one()
+
+
+async def time_offset_page(user_id, page: int, limit: int) -> float:
+    async with async_session_factory() as session:
+        started = time.perf_counter()
+        await UserRepository(session).get_followers(user_id, limit, (page - 1) * limit)
+        return time.perf_counter() - started
+
+
+async def time_keyset_page(user_id, page: int, limit: int) -> float:
+    async with async_session_factory() as session:
+        # Jump straight to the cursor of the previous page, as a client holding
+        # the X-Next-Cursor header would.
+        result = await session.execute(
+            text(
+                """
+                SELECT created_at, subscriber_id FROM subscriptions
+                WHERE author_id = :author_id
+                ORDER BY created_at DESC, subscriber_id DESC
+                OFFSET :offset LIMIT 1
+                """
+            ),
+            {"author_id": user_id, "offset": (page - 1) * limit - 1},
+        )
+        after = tuple(result.one())
+
+        started = time.perf_counter()
+        await UserRepository(session).get_followers(user_id, limit, after=after)
+        return time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--followers", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--pages", type=int, nargs="+", default=[2, 100, 1000, 10000, 40000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    if not any(marker in settings.DB_NAME.lower() for marker in ("test", "bench")):
+        raise SystemExit(f"Refusing to seed non-benchmark database: {settings.DB_NAME}")
+
+    try:
+        if not args.skip_seed:
+            started = time.perf_counter()
+            await seed(args.followers)
+            print(f"seeded {args.followers} followers in {time.perf_counter() - started:.1f}s")
+
+        user_id = await author_id()
+        for page in args.pages:
+            if (page - 1) * args.limit >= args.followers:
+                continue
+            offset_samples = [await time_offset_page(user_id, page, args.limit) for _ in range(args.repeat)]
+            keyset_samples = [await time_keyset_page(user_id, page, args.limit) for _ in range(args.repeat)]
+            print(
+                f"page {page:>6}: offset median={statistics.median(offset_samples) * 1000:8.2f}ms  "
+                f"keyset median={statistics.median(keyset_samples) * 1000:8.2f}ms"
+            )
+
+        if args.cleanup:
+            async with engine.begin() as conn:
+                await conn.execute(text("DELETE FROM users WHERE email LIKE '%@bench.local'"))
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""gRPC transport benchmark.
+
+Serves ``UsersExternal`` in-process on loopback TCP and on a Unix domain
+socket, backed by an in-memory existence loader instead of Postgres, and
+compares ``GetUserExistence`` latency and throughput over both transports:
+
+    python -m auth_service.benchmarks.grpc_transport --calls 20000 --concurrency 64
+
+Only transport and servicer overhead is measured; the token check and the
+existence batcher run as in production.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from uuid import UUID, uuid4
+
+import grpc
+
+from auth_service.benchmarks.login_storm import report
+from auth_service.src.infrastructure.config import settings
+from auth_service.src.infrastructure.existence_batcher import ExistenceBatcher
+from auth_service.src.infrastructure.generated import users_pb2, users_pb2_grpc
+from auth_service.src.presentation.grpc_handler import UsersServicer
+
+
+async def in_memory_loader(user_ids: list[UUID]) -> set[UUID]:
+    return set(user_ids[::2])
+
+
+async def run_calls(target: str, calls: int, concurrency: int) -> tuple[float, list[float]]:
+    metadata = (("x-service-token", settings.GRPC_SERVICE_TOKEN),)
+    latencies: list[float] = []
+    remaining = iter(range(calls))
+
+    async with grpc.aio.insecure_channel(target) as channel:
+        await channel.channel_ready()
+        stub = users_pb2_grpc.UsersExternalStub(channel)
+
+        async def worker() -> None:
+            for _ in remaining:
+                started = time.perf_counter()
+                await stub.GetUserExistence(
+                    users_pb2.UserRequest(user_id=str(uuid4())),
+                    timeout=30,
+                    metadata=metadata,
+                )
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - started, latencies
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--batch-window-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    servicer = UsersServicer(
+        existence_batcher=ExistenceBatcher(in_memory_loader, window_seconds=args.batch_window_ms / 1000),
+    )
+    server = grpc.aio.server()
+    users_pb2_grpc.add_UsersExternalServicer_to_server(servicer, server)
+
+    with tempfile.TemporaryDirectory() as socket_dir:
+        socket_path = os.path.join(socket_dir, "auth-grpc.sock")
+        tcp_port = server.add_insecure_port("127.0.0.1:0")
+        server.add_insecure_port(f"unix:{socket_path}")
+        await server.start()
+
+        try:
+            for name, target in (("tcp", f"127.0.0.1:{tcp_port}"), ("uds", f"unix:{socket_path}")):
+                await run_calls(target, min(args.calls, 1000), args.concurrency)
+                elapsed, latencies = await run_calls(target, args.calls, args.concurrency)
+                print(f"{name}: {args.calls / elapsed:.0f} calls/s")
+                report(f"{name} GetUserExistence", latencies)
+        finally:
+            await server.stop(None)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+"""Login rate-limit round-trip benchmark.
+
+Replays the Redis traffic of the login limiter against the configured Redis
+for three outcomes: a successful login, a failed login and a login that is
+already rate limited. The previous ``GET``/``TTL`` check plus ``EVAL``
+increment is compared with the single ``EVALSHA`` check-and-increment:
+
+    python -m auth_service.benchmarks.login_rate_limit --logins 2000
+
+Only limiter keys under ``limiter:bench:`` are touched.
+"""
+import argparse
+import asyncio
+import time
+
+from redis.asyncio import Redis
+
+from auth_service.benchmarks.login_storm import report
+from auth_service.src.infrastructure.config import settings
+from auth_service.src.infrastructure.repositories.rate_limiter import RateLimiter
+
+LIMIT = 5
+WINDOW_SECONDS = 300
+
+LEGACY_INCREMENT_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return {count, redis.call('TTL', KEYS[1])}
+"""
+
+
+class CountingRedis(Redis):
+    round_trips = 0
+
+    async def execute_command(self, *args, **options):
+        CountingRedis.round_trips += 1
+        return await super().execute_command(*args, **options)
+
+
+async def legacy_attempt(redis: Redis, key: str, outcome: str) -> None:
+    redis_key = f"limiter:{key}"
+    current = await redis.get(redis_key)
+    if current and int(current) >= LIMIT:
+        await redis.ttl(redis_key)
+        return
+    if outcome == "success":
+        await redis.delete(redis_key)
+    else:
+        await redis.eval(LEGACY_INCREMENT_SCRIPT, 1, redis_key, WINDOW_SECONDS)
+
+
+async def combined_attempt(limiter: RateLimiter, key: str, outcome: str) -> None:
+    attempt = await limiter.hit(key, LIMIT, WINDOW_SECONDS)
+    if attempt.allowed and outcome == "success":
+        await limiter.reset(key)
+
+
+async def prepare(redis: Redis, limiter: RateLimiter, key: str, outcome: str, name: str) -> None:
+    # Each implementation exhausts the budget its own way, so the blocked
+    # case starts from exactly LIMIT recorded attempts.
+    await redis.delete(f"limiter:{key}", f"limiter:gcra:{key}")
+    if outcome == "blocked":
+        for _ in range(LIMIT):
+            if name == "legacy":
+                await redis.eval(LEGACY_INCREMENT_SCRIPT, 1, f"limiter:{key}", WINDOW_SECONDS)
+            else:
+                await limiter.hit(key, LIMIT, WINDOW_SECONDS)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=2000)
+    parser.add_argument("--algorithm", choices=["fixed_window", "gcra"], default="fixed_window")
+    args = parser.parse_args()
+
+    redis = CountingRedis.from_url(settings.REDIS_URL, decode_responses=True)
+    limiter = RateLimiter(redis, args.algorithm)
+    try:
+        for outcome in ("success", "failure", "blocked"):
+            key = f"bench:{outcome}"
+            for name, attempt in (
+                ("legacy", lambda key=key, outcome=outcome: legacy_attempt(redis, key, outcome)),
+                ("evalsha", lambda key=key, outcome=outcome: combined_attempt(limiter, key, outcome)),
+            ):
+                await prepare(redis, limiter, key, outcome, name)
+                latencies = []
+                CountingRedis.round_trips = 0
+                for _ in range(args.logins):
+                    if outcome == "failure":
+                        await redis.delete(f"limiter:{key}", f"limiter:gcra:{key}")
+                        CountingRedis.round_trips -= 1
+                    started = time.perf_counter()
+                    await attempt()
+                    latencies.append(time.perf_counter() - started)
+                print(f"{outcome:>7} {name:>7}: {CountingRedis.round_trips / args.logins:.2f} round trips per login")
+                report(f"{outcome} {name}", latencies)
+    finally:
+        await redis.delete(*(f"limiter:bench:{outcome}" for outcome in ("success", "failure", "blocked")))
+        await redis.delete(*(f"limiter:gcra:bench:{outcome}" for outcome in ("success", "failure", "blocked")))
+        await redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+"""Login storm benchmark.
+
+Fires concurrent logins against a running auth_service while probing
+``UsersExternal.GetUserExistence`` on the same process, then prints latency
+percentiles for both. Run it before and after changing the password hashing
+executor to see how much bcrypt stalls the shared event loop:
+
+    python -m auth_service.benchmarks.login_storm \\
+        --email alice@example.com --password Strong_password-33 --logins 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from uuid import uuid4
+
+import grpc
+import httpx
+
+from auth_service.src.infrastructure.generated import users_pb2, users_pb2_grpc
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def report(name: str, samples: list[float]) -> None:
+    if not samples:
+        print(f"{name}: no samples")
+        return
+    print(
+        f"{name}: n={len(samples)} "
+        f"p50={percentile(samples, 50) * 1000:.1f}ms "
+        f"p95={percentile(samples, 95) * 1000:.1f}ms "
+        f"p99={percentile(samples, 99) * 1000:.1f}ms "
+        f"mean={statistics.fmean(samples) * 1000:.1f}ms"
+    )
+
+
+async def login_storm(args: argparse.Namespace, latencies: list[float], statuses: dict[int, int]) -> None:
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.http_url, timeout=30) as client:
+        async def login_once(index: int) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/auth/login",
+                    data={"username": args.email, "password": args.password},
+                    headers={"X-Client-Fingerprint": f"bench-{index}"},
+                )
+                latencies.append(time.perf_counter() - started)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        await asyncio.gather(*(login_once(index) for index in range(args.logins)))
+
+
+async def probe_existence(args: argparse.Namespace, latencies: list[float], stop: asyncio.Event) -> None:
+    metadata = (("x-service-token", args.service_token),)
+    async with grpc.aio.insecure_channel(args.grpc_target) as channel:
+        stub = users_pb2_grpc.UsersExternalStub(channel)
+        while not stop.is_set():
+            started = time.perf_counter()
+            await stub.GetUserExistence(
+                users_pb2.UserRequest(user_id=str(uuid4())),
+                timeout=30,
+                metadata=metadata,
+            )
+            latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(args.probe_interval)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--http-url", default="http://localhost:8000")
+    parser.add_argument("--grpc-target", default="localhost:50051")
+    parser.add_argument("--service-token", default=os.environ.get("GRPC_SERVICE_TOKEN", ""))
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    args = parser.parse_args()
+
+    login_latencies: list[float] = []
+    probe_latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    stop = asyncio.Event()
+
+    probe = asyncio.create_task(probe_existence(args, probe_latencies, stop))
+    started = time.perf_counter()
+    await login_storm(args, login_latencies, statuses)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+
+    print(f"logins: {args.logins} in {elapsed:.2f}s ({args.logins / elapsed:.1f}/s), statuses={statuses}")
+    report("login", login_latencies)
+    report("GetUserExistence during storm", probe_latencies)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+"""Profile read benchmark.
+
+Seeds one user with a configurable number of skills in the configured auth
+database, then times rendering the profile JSON through the ORM (``get_by_id``
+with eager-loaded skills plus pydantic serialization) and through the single
+JSON-aggregating query behind ``GET /users/{id}``:
+
+    DB_NAME=bench_db python -m auth_service.benchmarks.profile_read --skills 200
+
+Seeded rows use the ``@bench.local`` email domain and the ``bench-`` skill slug
+prefix and are removed with ``--cleanup``. The script refuses to run against
+databases whose name does not contain ``test`` or ``bench``.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+
+from auth_service.src.infrastructure.config import settings
+from auth_service.src.infrastructure.database import async_session_factory, engine
+from auth_service.src.infrastructure.repositories.user_repository import UserRepository
+from auth_service.src.presentation.serializers import to_user_read
+
+USER_EMAIL = "profile@bench.local"
+
+
+async def cleanup() -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("DELETE FROM users WHERE email LIKE '%@bench.local'"))
+        await conn.execute(text("DELETE FROM skills WHERE slug LIKE 'bench-%'"))
+
+
+async def seed(skills: int):
+    await cleanup()
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            text(
+                """
+                INSERT INTO users (id, email, username, hashed_password, is_verified, bio)
+                VALUES (gen_random_uuid(), :email, 'bench_profile', 'not-used', true, 'Benchmark profile')
+                RETURNING id
+                """
+            ),
+            {"email": USER_EMAIL},
+        )
+        user_id = result.scalar_one()
+        await conn.execute(
+            text(
+                """
+                INSERT INTO skills (id, name, slug, "group")
+                SELECT gen_random_uuid(), 'Bench skill ' || g, 'bench-' || g, 'bench-group-' || (g % 8)
+                FROM generate_series(1, :skills) AS g
+                """
+            ),
+            {"skills": skills},
+        )
+        await conn.execute(
+            text(
+                """
+                INSERT INTO user_skills (user_id, skill_id, level)
+                SELECT :user_id, id, 1 + (row_number() OVER () % 4) FROM skills WHERE slug LIKE 'bench-%'
+                """
+            ),
+            {"user_id": user_id},
+        )
+        await conn.execute(text("ANALYZE user_skills"))
+    return user_id
+
+
+async def time_orm_read(user_id) -> float:
+    async with async_session_factory() as session:
+        started = time.perf_counter()
+        user = await UserRepository(session).get_by_id(user_id)
+        to_user_read(user).model_dump_json().encode()
+        return time.perf_counter() - started
+
+
+async def time_json_read(user_id) -> float:
+    async with async_session_factory() as session:
+        started = time.perf_counter()
+        await UserRepository(session).get_profile_json(user_id)
+        return time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--skills", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    if not any(marker in settings.DB_NAME.lower() for marker in ("test", "bench")):
+        raise SystemExit(f"Refusing to seed non-benchmark database: {settings.DB_NAME}")
+
+    try:
+        user_id = await seed(args.skills)
+        for timer in (time_orm_read, time_json_read):
+            await timer(user_id)
+
+        orm_samples = [await time_orm_read(user_id) for _ in range(args.repeat)]
+        json_samples = [await time_json_read(user_id) for _ in range(args.repeat)]
+        for name, samples in (("orm + pydantic", orm_samples), ("json_agg", json_samples)):
+            print(
+                f"{name:>15}: median={statistics.median(samples) * 1000:7.2f}ms  "
+                f"p95={statistics.quantiles(samples, n=20)[-1] * 1000:7.2f}ms"
+            )
+
+        if args.cleanup:
+            await cleanup()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""Redis auto-pipelining throughput benchmark.
+
+Replays the Redis traffic of a successful login (rate-limit hit, limiter
+reset and refresh session save) at several concurrency levels, once through
+a plain client and once through ``AutoPipelineRedis``, and prints logins per
+second, latency percentiles and how many commands shared each write:
+
+    python -m auth_service.benchmarks.redis_auto_pipeline --logins 5000 --concurrency 1 50 500
+
+Only keys of generated benchmark users are touched.
+"""
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+from redis.asyncio import ConnectionPool, Redis
+
+from auth_service.benchmarks.login_storm import report
+from auth_service.src.infrastructure.auto_pipeline import AutoPipelineRedis
+from auth_service.src.infrastructure.config import settings
+from auth_service.src.infrastructure.repositories.rate_limiter import RateLimiter
+from auth_service.src.infrastructure.repositories.token_repository import TokenRepository
+from auth_service.src.infrastructure.security import create_refresh_token
+
+
+async def login_traffic(redis: Redis, user_id: str) -> None:
+    limiter = RateLimiter(redis)
+    repository = TokenRepository(redis)
+    key = f"bench:login:{user_id}"
+    await limiter.hit(key, 5, 300)
+    await limiter.reset(key)
+    await repository.save_token(user_id, create_refresh_token(user_id), "bench", 600)
+
+
+async def run(redis: Redis, logins: int, concurrency: int) -> tuple[float, list[float], list[str]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    user_ids = [str(uuid4()) for _ in range(logins)]
+
+    async def login(user_id: str) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await login_traffic(redis, user_id)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login(user_id) for user_id in user_ids))
+    return time.perf_counter() - started, latencies, user_ids
+
+
+async def cleanup(redis: Redis, user_ids: list[str]) -> None:
+    for start in range(0, len(user_ids), 1000):
+        await redis.unlink(*(
+            key
+            for user_id in user_ids[start:start + 1000]
+            for key in (TokenRepository._index_key(user_id), f"limiter:bench:login:{user_id}")
+        ))
+        for user_id in user_ids[start:start + 1000]:
+            keys = [key async for key in redis.scan_iter(match=TokenRepository._session_key(user_id, "*"))]
+            if keys:
+                await redis.unlink(*keys)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 50, 500])
+    args = parser.parse_args()
+
+    pool = ConnectionPool.from_url(settings.REDIS_URL, decode_responses=True)
+    plain = Redis(connection_pool=pool)
+    try:
+        for concurrency in args.concurrency:
+            for name in ("plain", "auto"):
+                redis = AutoPipelineRedis(connection_pool=pool) if name == "auto" else plain
+                elapsed, latencies, user_ids = await run(redis, args.logins, concurrency)
+                batching = ""
+                if isinstance(redis, AutoPipelineRedis):
+                    batching = f", {redis.batched_commands / max(redis.batches, 1):.1f} commands per write"
+                    await redis.aclose()
+                print(f"c={concurrency:<4} {name:>5}: {args.logins / elapsed:,.0f} logins/s{batching}")
+                report(f"c={concurrency} {name}", latencies)
+                await cleanup(plain, user_ids)
+    finally:
+        await plain.aclose()
+        await pool.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
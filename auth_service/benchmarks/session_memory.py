@@ -0,0 +1,106 @@
+"""Refresh-session memory benchmark.
+
+Writes the same set of refresh sessions into an empty Redis database twice,
+once in the legacy layout (JSON strings under 64-char hex digests plus a
+per-user ``SET``) and once in the compact layout (small hashes under short
+digests plus a per-user ``ZSET`` scored by expiry, tagged with the user id),
+and prints the ``used_memory`` growth of each:
+
+    python -m auth_service.benchmarks.session_memory --sessions 1000000 --db 15
+
+The target database must be empty and is flushed between and after runs.
+``used_memory`` is instance wide, so run it on an otherwise idle Redis.
+"""
+import argparse
+import asyncio
+import json
+import time
+from uuid import uuid4
+
+from redis.asyncio import Redis
+
+from auth_service.src.infrastructure.config import settings
+from auth_service.src.infrastructure.repositories.token_repository import TokenRepository
+from auth_service.src.infrastructure.security import create_refresh_token
+
+BATCH_SIZE = 10_000
+TTL_SECONDS = 30 * 24 * 60 * 60
+
+
+def write_legacy(pipe, user_id: str, refresh_token: str, fingerprint: str) -> None:
+    token_digest = TokenRepository._legacy_digest(refresh_token)
+    index_key = TokenRepository._legacy_index_key(user_id)
+    data = json.dumps({"user_id": user_id, "fingerprint": fingerprint})
+    pipe.setex(TokenRepository._legacy_session_key(token_digest), TTL_SECONDS, data)
+    pipe.sadd(index_key, token_digest)
+    pipe.expire(index_key, TTL_SECONDS + 3600)
+
+
+def write_compact(pipe, user_id: str, refresh_token: str, fingerprint: str) -> None:
+    # Same writes as TokenRepository.save_token, pipelined instead of one script call per session.
+    token_digest = TokenRepository._digest(refresh_token)
+    session_key = TokenRepository._session_key(user_id, token_digest)
+    index_key = TokenRepository._index_key(user_id)
+    pipe.hset(session_key, "f", fingerprint)
+    pipe.expire(session_key, TTL_SECONDS)
+    pipe.zadd(index_key, {token_digest: time.time() + TTL_SECONDS})
+    pipe.expire(index_key, TTL_SECONDS)
+
+
+async def used_memory(redis: Redis) -> int:
+    return (await redis.info("memory"))["used_memory"]
+
+
+async def measure(redis: Redis, sessions: list[tuple[str, str, str]], writer) -> int:
+    await redis.flushdb()
+    before = await used_memory(redis)
+    for start in range(0, len(sessions), BATCH_SIZE):
+        async with redis.pipeline(transaction=False) as pipe:
+            for user_id, refresh_token, fingerprint in sessions[start:start + BATCH_SIZE]:
+                writer(pipe, user_id, refresh_token, fingerprint)
+            await pipe.execute()
+    after = await used_memory(redis)
+    await redis.flushdb()
+    return after - before
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    parser.add_argument("--sessions-per-user", type=int, default=3)
+    parser.add_argument("--db", type=int, default=15)
+    args = parser.parse_args()
+
+    redis = Redis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        password=settings.REDIS_PASSWORD,
+        db=args.db,
+        decode_responses=True,
+    )
+    try:
+        if await redis.dbsize():
+            raise SystemExit(f"Redis database {args.db} is not empty, pick an unused one with --db")
+
+        user_ids = [str(uuid4()) for _ in range(max(1, args.sessions // args.sessions_per_user))]
+        owners = [user_ids[index % len(user_ids)] for index in range(args.sessions)]
+        sessions = [
+            (user_id, create_refresh_token(user_id), f"device-{index % 4}")
+            for index, user_id in enumerate(owners)
+        ]
+
+        results = {}
+        for name, writer in (("legacy", write_legacy), ("compact", write_compact)):
+            results[name] = await measure(redis, sessions, writer)
+            print(
+                f"{name:>7}: {results[name] / 1024 / 1024:.1f} MiB for {args.sessions} sessions, "
+                f"{results[name] / args.sessions:.0f} bytes per session"
+            )
+        if results["legacy"]:
+            print(f"compact layout uses {results['compact'] / results['legacy']:.0%} of the legacy footprint")
+    finally:
+        await redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
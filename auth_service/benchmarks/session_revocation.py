@@ -0,0 +1,119 @@
+"""Logout-all versus refresh rotation load test.
+
+Gives every user a set of refresh sessions, keeps rotating all of them and
+fires logout-all for each user halfway through, then counts orphaned
+session keys: keys that are still stored but no longer reachable from the
+user's session index, so logout-all can never revoke them. The previous
+read-then-delete revocation is compared with the single ``EVALSHA`` script:
+
+    python -m auth_service.benchmarks.session_revocation --users 200 --sessions 10
+
+Only keys of the generated users are touched.
+"""
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+from redis.asyncio import Redis
+
+from auth_service.benchmarks.login_storm import report
+from auth_service.src.infrastructure.config import settings
+from auth_service.src.infrastructure.repositories.token_repository import TokenRepository
+from auth_service.src.infrastructure.security import create_refresh_token
+
+TTL_SECONDS = 600
+
+
+async def legacy_revoke_all(repository: TokenRepository, user_id: str) -> None:
+    index_key = repository._index_key(user_id)
+    digests = await repository.redis.zrange(index_key, 0, -1)
+    if digests:
+        await repository.redis.delete(*(repository._session_key(user_id, digest) for digest in digests))
+    await repository.redis.delete(index_key)
+
+
+async def rotate_repeatedly(repository: TokenRepository, user_id: str, refresh_token: str, rotations: int,
+                            latencies: list[float]) -> None:
+    for _ in range(rotations):
+        new_token = create_refresh_token(user_id)
+        started = time.perf_counter()
+        rotated = await repository.rotate_token(user_id, refresh_token, new_token, "bench", TTL_SECONDS)
+        latencies.append(time.perf_counter() - started)
+        if not rotated:
+            return
+        refresh_token = new_token
+
+
+async def revoke_midway(revoke, repository: TokenRepository, user_id: str, delay: float,
+                        latencies: list[float]) -> None:
+    await asyncio.sleep(delay)
+    started = time.perf_counter()
+    await revoke(repository, user_id)
+    latencies.append(time.perf_counter() - started)
+
+
+async def count_orphans(redis: Redis, user_ids: list[str]) -> tuple[int, int]:
+    orphans = live = 0
+    for user_id in user_ids:
+        indexed = set(await redis.zrange(TokenRepository._index_key(user_id), 0, -1))
+        async for key in redis.scan_iter(match=TokenRepository._session_key(user_id, "*"), count=1000):
+            if key.rsplit(":", 1)[1] in indexed:
+                live += 1
+            else:
+                orphans += 1
+    return orphans, live
+
+
+async def run(redis: Redis, name: str, revoke, args: argparse.Namespace) -> None:
+    repository = TokenRepository(redis)
+    user_ids = [str(uuid4()) for _ in range(args.users)]
+    chains = []
+    for user_id in user_ids:
+        for _ in range(args.sessions):
+            refresh_token = create_refresh_token(user_id)
+            await repository.save_token(user_id, refresh_token, "bench", TTL_SECONDS)
+            chains.append((user_id, refresh_token))
+
+    rotation_latencies: list[float] = []
+    revoke_latencies: list[float] = []
+    try:
+        await asyncio.gather(
+            *(
+                rotate_repeatedly(repository, user_id, refresh_token, args.rotations, rotation_latencies)
+                for user_id, refresh_token in chains
+            ),
+            *(
+                revoke_midway(revoke, repository, user_id, args.revoke_after_ms / 1000, revoke_latencies)
+                for user_id in user_ids
+            ),
+        )
+        orphans, live = await count_orphans(redis, user_ids)
+        print(f"{name:>7}: {orphans} orphaned session keys, {live} sessions still indexed")
+        report(f"{name} rotation", rotation_latencies)
+        report(f"{name} logout-all", revoke_latencies)
+    finally:
+        for user_id in user_ids:
+            keys = [key async for key in redis.scan_iter(match=f"session*{{{user_id}}}*", count=1000)]
+            if keys:
+                await redis.unlink(*keys)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--rotations", type=int, default=20)
+    parser.add_argument("--revoke-after-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    redis = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    try:
+        await run(redis, "legacy", legacy_revoke_all, args)
+        await run(redis, "evalsha", TokenRepository.delete_all_user_tokens, args)
+    finally:
+        await redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
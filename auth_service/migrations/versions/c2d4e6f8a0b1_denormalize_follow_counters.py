@@ -0,0 +1,64 @@
+"""denormalize follow counters
+
+Revision ID: c2d4e6f8a0b1
+Revises: b8c0d2e4f6a8
+Create Date: 2026-07-01 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "c2d4e6f8a0b1"
+down_revision: Union[str, Sequence[str], None] = "b8c0d2e4f6a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    user_columns = {item["name"] for item in inspector.get_columns("users")}
+    for column_name in ("followers_count", "following_count"):
+        if column_name not in user_columns:
+            op.add_column(
+                "users",
+                sa.Column(column_name, sa.Integer(), nullable=False, server_default=sa.text("0")),
+            )
+
+    subscription_indexes = {
+        item["name"]
+        for item in inspector.get_indexes("subscriptions")
+    }
+    if "ix_subscriptions_author_id" not in subscription_indexes:
+        op.create_index(
+            "ix_subscriptions_author_id",
+            "subscriptions",
+            ["author_id", "subscriber_id"],
+            unique=False,
+        )
+
+    op.execute(
+        """
+        UPDATE users AS u
+        SET followers_count = counts.followers_count,
+            following_count = counts.following_count
+        FROM (
+            SELECT
+                users.id,
+                (SELECT count(*) FROM subscriptions WHERE subscriptions.author_id = users.id) AS followers_count,
+                (SELECT count(*) FROM subscriptions WHERE subscriptions.subscriber_id = users.id) AS following_count
+            FROM users
+        ) AS counts
+        WHERE u.id = counts.id
+          AND (u.followers_count <> counts.followers_count OR u.following_count <> counts.following_count)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_subscriptions_author_id", table_name="subscriptions")
+    op.drop_column("users", "following_count")
+    op.drop_column("users", "followers_count")
@@ -0,0 +1,61 @@
+"""add subscription follow time and keyset indexes
+
+Revision ID: d3e5f7a9b1c2
+Revises: c2d4e6f8a0b1
+Create Date: 2026-07-08 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "d3e5f7a9b1c2"
+down_revision: Union[str, Sequence[str], None] = "c2d4e6f8a0b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    subscription_columns = {item["name"] for item in inspector.get_columns("subscriptions")}
+    if "created_at" not in subscription_columns:
+        op.add_column(
+            "subscriptions",
+            sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.text("now()")),
+        )
+
+    subscription_indexes = {
+        item["name"]
+        for item in sa.inspect(bind).get_indexes("subscriptions")
+    }
+    if "ix_subscriptions_author_created" not in subscription_indexes:
+        op.create_index(
+            "ix_subscriptions_author_created",
+            "subscriptions",
+            ["author_id", "created_at", "subscriber_id"],
+            unique=False,
+        )
+    if "ix_subscriptions_subscriber_created" not in subscription_indexes:
+        op.create_index(
+            "ix_subscriptions_subscriber_created",
+            "subscriptions",
+            ["subscriber_id", "created_at", "author_id"],
+            unique=False,
+        )
+    if "ix_subscriptions_author_id" in subscription_indexes:
+        op.drop_index("ix_subscriptions_author_id", table_name="subscriptions")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_subscriptions_author_id",
+        "subscriptions",
+        ["author_id", "subscriber_id"],
+        unique=False,
+    )
+    op.drop_index("ix_subscriptions_subscriber_created", table_name="subscriptions")
+    op.drop_index("ix_subscriptions_author_created", table_name="subscriptions")
+    op.drop_column("subscriptions", "created_at")
@@ -1,18 +1,25 @@
-import json
 import logging
-import secrets
+import math
 from uuid import UUID
 
-from fastapi import BackgroundTasks, HTTPException, status
+from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
 
 from auth_service.src.infrastructure.config import settings
-from auth_service.src.infrastructure.email import send_verification_email
-from auth_service.src.infrastructure.exceptions import TokenExpiredError, TokenInvalidError, UserDoesNotExist
-from auth_service.src.infrastructure.repositories.rate_limiter import RateLimiter
+from auth_service.src.infrastructure.email import build_verification_email
+from auth_service.src.infrastructure.exceptions import (
+    PasswordHasherBusy,
+    TokenExpiredError,
+    TokenInvalidError,
+    UserDoesNotExist,
+)
+from auth_service.src.infrastructure.password_hasher import PasswordHasher, password_hasher
+from auth_service.src.infrastructure.repositories.email_outbox_repository import EmailOutboxRepository
+from auth_service.src.infrastructure.repositories.rate_limiter import RateLimiter, RateLimitResult
 from auth_service.src.infrastructure.repositories.token_repository import TokenRepository
+from auth_service.src.infrastructure.repositories.user_existence_events import UserExistenceEvents
 from auth_service.src.infrastructure.repositories.user_repository import UserRepository
-from auth_service.src.infrastructure.security import create_token, decode_access_token, hash_password, verify_password
+from auth_service.src.infrastructure.security import create_refresh_token, create_token, decode_access_token
 from auth_service.src.presentation.schemas import Token, UserCreate, UserRead
 from auth_service.src.presentation.serializers import to_user_read
 
@@ -27,13 +34,19 @@ class AuthService:
             self,
             user_repository: UserRepository,
             token_repository: TokenRepository,
-            rate_limiter: RateLimiter
+            rate_limiter: RateLimiter,
+            email_outbox: EmailOutboxRepository,
+            hasher: PasswordHasher | None = None,
+            existence_events: UserExistenceEvents | None = None,
     ):
         self.user_repository = user_repository
         self.token_repository = token_repository
         self.rate_limiter = rate_limiter
+        self.email_outbox = email_outbox
+        self.hasher = hasher or password_hasher
+        self.existence_events = existence_events
 
-    async def register_user(self, user_data: UserCreate, background_tasks: BackgroundTasks) -> UserRead:
+    async def register_user(self, user_data: UserCreate) -> UserRead:
 
         is_exist_email = await self.user_repository.get_by_email(user_data.email)
         if is_exist_email:
@@ -45,11 +58,16 @@ class AuthService:
             raise HTTPException(status_code=status.HTTP_409_CONFLICT,
                                 detail="Username already exists")
 
-        hashed_password = hash_password(user_data.password)
+        hashed_password = await self._hash_password(user_data.password)
         user = self.user_repository.create_instance(user_data=user_data,
                                                     hashed_password=hashed_password,
                                                     is_verified=False)
 
+        # The outbox shares the user's session, so the verification email is
+        # stored in the same commit as the user and sent by the email worker.
+        verification_token = create_token(user_id=user.id, token_type='verification')
+        self.email_outbox.enqueue(user.email, *build_verification_email(verification_token))
+
         try:
             await self.user_repository.add(user=user)
             await self.user_repository.commit()
@@ -61,52 +79,55 @@ class AuthService:
                 detail="Email or username already exists",
             ) from None
 
-        verification_token = create_token(user_id=user.id, token_type='verification')
-        background_tasks.add_task(send_verification_email, user.email, verification_token)
+        if self.existence_events is not None:
+            await self.existence_events.announce_created(user.id)
 
         return to_user_read(user)
 
     async def authenticate_user(self, email: str, password: str, fingerprint: str | None) -> dict:
         email = email.strip().lower()
         limiter_key = f"login:{email}"
-        await self.rate_limiter.check_limit(key=limiter_key, limit=self.LOGIN_ATTEMPT_LIMIT)
+        attempt = await self.rate_limiter.hit(
+            key=limiter_key,
+            limit=self.LOGIN_ATTEMPT_LIMIT,
+            window_seconds=self.LOGIN_ATTEMPT_WINDOW_SECONDS,
+        )
+        if not attempt.allowed:
+            self._raise_too_many_attempts(attempt)
 
         user = await self.user_repository.get_by_email(email)
         if not user:
-            await self._raise_invalid_credentials(limiter_key)
+            self._raise_invalid_credentials(attempt)
 
-        is_password_correct = verify_password(password, user.hashed_password)
+        is_password_correct = await self._verify_password(password, user.hashed_password)
         if not is_password_correct:
-            await self._raise_invalid_credentials(limiter_key)
+            self._raise_invalid_credentials(attempt)
+
+        # The budget guards against password guessing, so the right password
+        # clears it even when the account still waits for verification.
+        await self.rate_limiter.reset(key=limiter_key)
 
         if not user.is_verified:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                                 detail="Email not verified")
 
-        await self.rate_limiter.reset(key=limiter_key)
-
         access_token = create_token(user_id=user.id, token_type='auth')
-        refresh_token = secrets.token_urlsafe(48)
+        refresh_token = create_refresh_token(user.id)
 
-        session_data = json.dumps({
-            "user_id": str(user.id),
-            "fingerprint": fingerprint or "unknown"
-        })
         ttl = settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
 
-        await self.token_repository.save_token(str(user.id), refresh_token, session_data, ttl)
+        await self.token_repository.save_token(str(user.id), refresh_token, fingerprint or "unknown", ttl)
         logger.info("Saved refresh session for user %s", user.id)
 
         return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
 
     async def refresh_session(self, refresh_token: str, fingerprint: str | None) -> Token:
-        raw_data = await self.token_repository.get_token_data(refresh_token)
+        data = await self.token_repository.get_token_data(refresh_token)
 
-        if not raw_data:
+        if not data:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                                 detail="Invalid or expired refresh token")
 
-        data = json.loads(raw_data)
         user_id = data['user_id']
 
         stored_fingerprint = data.get('fingerprint')
@@ -116,16 +137,15 @@ class AuthService:
                                 detail="Wrong device")
 
         new_access_token = create_token(user_id=user_id, token_type='auth')
-        new_refresh_token = secrets.token_urlsafe(48)
+        new_refresh_token = create_refresh_token(user_id)
 
-        data['fingerprint'] = fingerprint or "unknown"
         ttl = settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
 
         rotated = await self.token_repository.rotate_token(
             user_id=user_id,
             old_refresh_token=refresh_token,
             new_refresh_token=new_refresh_token,
-            data=json.dumps(data),
+            fingerprint=fingerprint or "unknown",
             ttl=ttl,
         )
         if not rotated:
@@ -163,23 +183,18 @@ class AuthService:
         return {"msg": "Email successfully verified"}
 
     async def logout(self, refresh_token: str, user_id: UUID) -> dict:
-        raw_data = await self.token_repository.get_token_data(refresh_token)
-        if not raw_data:
+        result = await self.token_repository.revoke_token(str(user_id), refresh_token)
+        if result == "missing":
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token",
             )
-
-        data = json.loads(raw_data)
-        stored_user_id = data.get("user_id")
-        if stored_user_id != str(user_id):
+        if result == "foreign":
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Invalid token",
             )
 
-        await self.token_repository.delete_token(str(user_id), refresh_token)
-
         return {"msg": "Logged out successfully"}
 
     async def logout_all_sessions(self, user_id: UUID) -> dict:
@@ -187,17 +202,42 @@ class AuthService:
 
         return {"msg": "Logged out from all devices"}
 
-    async def _raise_invalid_credentials(self, limiter_key: str) -> None:
-        count, ttl = await self.rate_limiter.increment(
-            key=limiter_key,
-            window_seconds=self.LOGIN_ATTEMPT_WINDOW_SECONDS,
-        )
-        if count >= self.LOGIN_ATTEMPT_LIMIT:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Too many attempts. Try again in {ttl} seconds.",
-            )
+    async def _hash_password(self, password: str) -> str:
+        try:
+            return await self.hasher.hash(password)
+        except PasswordHasherBusy:
+            self._raise_hasher_busy()
+
+    async def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        try:
+            return await self.hasher.verify(plain_password, hashed_password)
+        except PasswordHasherBusy:
+            self._raise_hasher_busy()
+
+    @staticmethod
+    def _raise_hasher_busy() -> None:
+        logger.warning("Password hashing queue is saturated")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service is busy. Try again later.",
+            headers={"Retry-After": "1"},
+        ) from None
+
+    def _raise_invalid_credentials(self, attempt: RateLimitResult) -> None:
+        # Every attempt is counted up front and successful logins reset the
+        # counter, so a failure that used up the budget is already rejected.
+        if attempt.remaining <= 0:
+            self._raise_too_many_attempts(attempt)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
+
+    @staticmethod
+    def _raise_too_many_attempts(attempt: RateLimitResult) -> None:
+        retry_after = math.ceil(attempt.retry_after_ms / 1000)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Too many attempts. Try again in {retry_after} seconds.",
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -1,27 +1,38 @@
+from typing import Any, AsyncIterable, AsyncIterator, Iterable
 from uuid import UUID
 
 from fastapi import HTTPException, status
+from pydantic import ValidationError
 from sqlalchemy.exc import IntegrityError
 
-from auth_service.src.infrastructure.repositories.skill_repository import SkillRepository
+from auth_service.src.infrastructure.repositories.profile_cache import ProfileCache
+from auth_service.src.infrastructure.repositories.skill_repository import SkillImportRecord, SkillRepository
 from auth_service.src.infrastructure.repositories.user_repository import UserRepository
 from auth_service.src.presentation.schemas import (
+    MAX_USER_SKILLS,
     SkillCreate,
+    SkillImportReport,
     SkillRead,
     UserSkillInput,
     UserSkillRead,
     UserSkillsReplace,
 )
 
+SkillImportRow = tuple[int, Any]
+
+MAX_IMPORT_ERRORS = 100
+
 
 class SkillService:
     def __init__(
         self,
         skill_repository: SkillRepository,
         user_repository: UserRepository,
+        profile_cache: ProfileCache | None = None,
     ):
         self.skill_repository = skill_repository
         self.user_repository = user_repository
+        self.profile_cache = profile_cache
 
     async def create_skill(self, data: SkillCreate) -> SkillRead:
         skill = self.skill_repository.create_instance(data)
@@ -52,6 +63,50 @@ class SkillService:
         )
         return [SkillRead.model_validate(skill) for skill in skills]
 
+    async def import_skills(self, rows: Iterable[SkillImportRow] | AsyncIterable[SkillImportRow]) -> SkillImportReport:
+        valid = invalid = 0
+        errors: list[str] = []
+
+        async def records() -> AsyncIterator[SkillImportRecord]:
+            nonlocal valid, invalid
+            async for line, row in _aiter(rows):
+                try:
+                    skill = SkillCreate.model_validate(row)
+                except ValidationError as exc:
+                    invalid += 1
+                    if len(errors) < MAX_IMPORT_ERRORS:
+                        error = exc.errors()[0]
+                        errors.append(f"line {line}: {'.'.join(map(str, error['loc']))}: {error['msg']}")
+                    continue
+                valid += 1
+                yield line, skill.name, skill.slug, skill.group
+
+        try:
+            result = await self.skill_repository.import_skills(records())
+            affected_user_ids = await self.skill_repository.get_skill_user_ids(result.updated_ids)
+            await self.skill_repository.commit()
+        except Exception:
+            await self.skill_repository.rollback()
+            raise
+
+        # Profiles embed skill names and groups.
+        if self.profile_cache is not None and affected_user_ids:
+            await self.profile_cache.invalidate(*affected_user_ids)
+
+        return SkillImportReport(
+            received=valid + invalid,
+            invalid=invalid,
+            inserted=result.inserted,
+            updated=len(result.updated_ids),
+            unchanged=result.accepted - result.inserted - len(result.updated_ids),
+            conflicts=result.received - result.accepted,
+            errors=errors,
+        )
+
+    async def export_skills(self) -> AsyncIterator[SkillRead]:
+        async for row in self.skill_repository.stream_skills():
+            yield SkillRead.model_validate(row)
+
     async def get_user_skills(self, user_id: UUID) -> list[UserSkillRead]:
         await self._ensure_user_exists(user_id)
         return await self._read_user_skills(user_id)
@@ -59,6 +114,12 @@ class SkillService:
     async def add_user_skill(self, user_id: UUID, data: UserSkillInput) -> list[UserSkillRead]:
         await self._ensure_user_exists(user_id)
         await self._ensure_skill_exists(data.skill_id)
+        if await self.skill_repository.count_user_skills_for_update(user_id) >= MAX_USER_SKILLS:
+            await self.skill_repository.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"A user can have at most {MAX_USER_SKILLS} skills",
+            )
         try:
             await self.skill_repository.add_user_skill(user_id, data)
             await self.skill_repository.commit()
@@ -68,6 +129,7 @@ class SkillService:
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Skill is already attached to this user",
             ) from None
+        await self._invalidate_profile(user_id)
         return await self._read_user_skills(user_id)
 
     async def replace_user_skills(
@@ -88,6 +150,7 @@ class SkillService:
 
         await self.skill_repository.replace_user_skills(user_id, data.skills)
         await self.skill_repository.commit()
+        await self._invalidate_profile(user_id)
         return await self._read_user_skills(user_id)
 
     async def update_user_skill(
@@ -103,6 +166,7 @@ class SkillService:
                 detail="User skill not found",
             )
         await self.skill_repository.commit()
+        await self._invalidate_profile(user_id)
         return await self._read_user_skills(user_id)
 
     async def delete_user_skill(self, user_id: UUID, skill_id: UUID) -> None:
@@ -113,6 +177,11 @@ class SkillService:
                 detail="User skill not found",
             )
         await self.skill_repository.commit()
+        await self._invalidate_profile(user_id)
+
+    async def _invalidate_profile(self, user_id: UUID) -> None:
+        if self.profile_cache is not None:
+            await self.profile_cache.invalidate(user_id)
 
     async def _ensure_user_exists(self, user_id: UUID) -> None:
         if not await self.user_repository.exists(user_id):
@@ -131,3 +200,12 @@ class SkillService:
     async def _read_user_skills(self, user_id: UUID) -> list[UserSkillRead]:
         links = await self.skill_repository.get_user_skills(user_id)
         return [UserSkillRead.model_validate(link) for link in links]
+
+
+async def _aiter(rows: Iterable[SkillImportRow] | AsyncIterable[SkillImportRow]) -> AsyncIterator[SkillImportRow]:
+    if isinstance(rows, AsyncIterable):
+        async for row in rows:
+            yield row
+    else:
+        for row in rows:
+            yield row
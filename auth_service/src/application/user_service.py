@@ -1,15 +1,24 @@
 from enum import Enum
-from typing import List
+from typing import Awaitable, Callable
 from uuid import UUID
 
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
 
+from auth_service.src.infrastructure.config import settings
 from auth_service.src.infrastructure.exceptions import UserDoesNotExist
+from auth_service.src.infrastructure.repositories.profile_cache import ProfileCache
 from auth_service.src.infrastructure.repositories.token_repository import TokenRepository
+from auth_service.src.infrastructure.repositories.user_existence_events import UserExistenceEvents
+from auth_service.src.infrastructure.repositories.user_presence_cache import UserPresenceCache
 from auth_service.src.infrastructure.repositories.user_repository import UserRepository
-from auth_service.src.presentation.schemas import UserData, UserRead
-from auth_service.src.presentation.serializers import to_user_data, to_user_read
+from auth_service.src.presentation.schemas import UserData, UserPage, UserRead
+from auth_service.src.presentation.serializers import (
+    decode_follow_cursor,
+    encode_follow_cursor,
+    to_user_data,
+    to_user_read,
+)
 
 
 class AccessType(Enum):
@@ -20,10 +29,16 @@ class UserService:
     def __init__(
             self,
             user_repository: UserRepository,
-            token_repository: TokenRepository
+            token_repository: TokenRepository,
+            presence_cache: UserPresenceCache | None = None,
+            existence_events: UserExistenceEvents | None = None,
+            profile_cache: ProfileCache | None = None,
     ):
         self.user_repository = user_repository
         self.token_repository = token_repository
+        self.presence_cache = presence_cache
+        self.existence_events = existence_events
+        self.profile_cache = profile_cache
 
     async def get_user(self, user_id: UUID, access_type: Enum = AccessType.FREE) -> UserRead | UserData:
         try:
@@ -37,11 +52,57 @@ class UserService:
 
         return to_user_read(user)
 
+    async def get_user_json(self, user_id: UUID, access_type: Enum = AccessType.FREE) -> bytes:
+        private = access_type == AccessType.PRIVATE
+        if self.profile_cache is not None and not private:
+            payload = await self.profile_cache.get_or_load(user_id, lambda: self._render_profile(user_id, private))
+        else:
+            payload = await self._render_profile(user_id, private)
+
+        if payload is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                                detail="User not found")
+        return payload
+
+    async def get_users_batch(self, user_ids: list[UUID]) -> list[tuple[UUID, bytes | None]]:
+        unique_ids = list(dict.fromkeys(user_ids))
+        if self.profile_cache is not None:
+            profiles = await self.profile_cache.get_or_load_many(unique_ids, self._render_profiles)
+        else:
+            profiles = await self._render_profiles(unique_ids)
+
+        return [(user_id, profiles.get(user_id)) for user_id in user_ids]
+
+    async def _render_profiles(self, user_ids: list[UUID]) -> dict[UUID, bytes]:
+        if settings.PROFILE_JSON_AGGREGATION:
+            return await self.user_repository.get_profiles_json(user_ids)
+
+        users = await self.user_repository.get_many(user_ids)
+        return {user.id: to_user_read(user).model_dump_json().encode() for user in users}
+
+    async def _render_profile(self, user_id: UUID, private: bool) -> bytes | None:
+        if settings.PROFILE_JSON_AGGREGATION:
+            return await self.user_repository.get_profile_json(user_id, private=private)
+
+        try:
+            user = await self.user_repository.get_by_id(user_id)
+        except UserDoesNotExist:
+            return None
+        profile = to_user_data(user) if private else to_user_read(user)
+        return profile.model_dump_json().encode()
+
     async def delete_user(self, user_id: UUID) -> dict:
         await self.token_repository.delete_all_user_tokens(str(user_id))
-        await self.user_repository.delete(user_id)
+        neighbour_ids = await self.user_repository.delete(user_id)
 
         await self.user_repository.commit()
+        await self._invalidate_profiles(user_id)
+        if self.profile_cache is not None:
+            self.profile_cache.invalidate_in_background(*neighbour_ids)
+        if self.presence_cache is not None:
+            await self.presence_cache.forget(user_id)
+        if self.existence_events is not None:
+            await self.existence_events.announce_deleted(user_id)
 
         return {"msg": "Account deleted"}
 
@@ -50,6 +111,7 @@ class UserService:
             await self.user_repository.update_bio(user_id, bio)
 
             await self.user_repository.commit()
+            await self._invalidate_profiles(user_id)
             user = await self.user_repository.get_by_id(user_id)
 
             return to_user_data(user)
@@ -69,18 +131,56 @@ class UserService:
                                 detail="Error due to follow") from None
 
         await self.user_repository.commit()
+        await self._invalidate_profiles(user_id, follower_id)
 
         return {"msg": "Subscribed successfully"}
 
-    async def get_followers(self, user_id: UUID, page: int, limit: int) -> List[UserRead]:
-        offset = (page - 1) * limit
-
-        users = await self.user_repository.get_followers(user_id, limit, offset)
-        return [to_user_read(user) for user in users]
-
-
-    async def get_following(self, user_id: UUID, page: int, limit: int) -> List[UserRead]:
-        offset = (page - 1) * limit
+    async def unfollow_user(self, user_id: UUID, follower_id: UUID) -> dict:
+        unfollowed = await self.user_repository.unfollow(user_id=user_id, follower_id=follower_id)
+        if not unfollowed:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                                detail="Subscription not found")
 
-        users = await self.user_repository.get_following(user_id, limit, offset)
-        return [to_user_read(user) for user in users]
+        await self.user_repository.commit()
+        await self._invalidate_profiles(user_id, follower_id)
+
+        return {"msg": "Unsubscribed successfully"}
+
+    async def get_followers(self, user_id: UUID, page: int, limit: int, cursor: str | None = None) -> UserPage:
+        return await self._get_follow_page(self.user_repository.get_followers, user_id, page, limit, cursor)
+
+    async def get_following(self, user_id: UUID, page: int, limit: int, cursor: str | None = None) -> UserPage:
+        return await self._get_follow_page(self.user_repository.get_following, user_id, page, limit, cursor)
+
+    async def _invalidate_profiles(self, *user_ids: UUID) -> None:
+        if self.profile_cache is not None:
+            await self.profile_cache.invalidate(*user_ids)
+
+    @staticmethod
+    async def _get_follow_page(
+            fetch: Callable[..., Awaitable[list]],
+            user_id: UUID,
+            page: int,
+            limit: int,
+            cursor: str | None,
+    ) -> UserPage:
+        after = None
+        offset = 0
+        if cursor:
+            try:
+                after = decode_follow_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                    detail="Invalid cursor") from None
+        else:
+            offset = (page - 1) * limit
+
+        rows = await fetch(user_id, limit + 1, offset, after)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_user, followed_at = rows[-1]
+            next_cursor = encode_follow_cursor(followed_at, last_user.id)
+
+        return UserPage(items=[to_user_read(user) for user, _ in rows], next_cursor=next_cursor)
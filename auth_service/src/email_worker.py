@@ -0,0 +1,182 @@
+import argparse
+import asyncio
+import json
+import logging
+import signal
+from contextlib import AbstractAsyncContextManager
+from typing import Callable
+
+import aiosmtplib
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth_service.src.infrastructure.config import settings
+from auth_service.src.infrastructure.database import async_session_factory, engine
+from auth_service.src.infrastructure.email import SmtpMailer
+from auth_service.src.infrastructure.repositories.email_outbox_repository import EmailOutboxRepository
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+
+MAX_ERROR_LENGTH = 1000
+
+
+class EmailOutboxWorker:
+    def __init__(
+            self,
+            mailer: SmtpMailer,
+            session_factory: SessionFactory = async_session_factory,
+            batch_size: int = 50,
+            rate_per_second: float = 10.0,
+            max_attempts: int = 8,
+            retry_base_seconds: float = 30,
+            retry_max_seconds: float = 3600,
+            lease_seconds: float = 300,
+    ):
+        self.mailer = mailer
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.rate_per_second = rate_per_second
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.lease_seconds = lease_seconds
+        self._next_send_at = 0.0
+
+        self.batches = 0
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+
+    async def run_once(self) -> int:
+        async with self.session_factory() as session:
+            repository = EmailOutboxRepository(session)
+            messages = await repository.claim_batch(self.batch_size, self.lease_seconds)
+            await repository.commit()
+        if not messages:
+            return 0
+
+        sent_ids: list[int] = []
+        retries: list[tuple[int, str, float]] = []
+        failures: list[tuple[int, str]] = []
+        for message in messages:
+            await self._throttle()
+            try:
+                await self.mailer.send(message.recipient, message.subject, message.body)
+            except (aiosmtplib.SMTPException, OSError) as exc:
+                error = (str(exc) or type(exc).__name__)[:MAX_ERROR_LENGTH]
+                if self._is_permanent(exc) or message.attempts >= self.max_attempts:
+                    logger.error("Giving up on email %s after %s attempts: %s", message.id, message.attempts, error)
+                    failures.append((message.id, error))
+                else:
+                    retries.append((message.id, error, self._retry_delay(message.attempts)))
+            else:
+                sent_ids.append(message.id)
+
+        async with self.session_factory() as session:
+            repository = EmailOutboxRepository(session)
+            await repository.mark_sent(sent_ids)
+            for message_id, error, delay in retries:
+                await repository.schedule_retry(message_id, error, delay)
+            for message_id, error in failures:
+                await repository.mark_failed(message_id, error)
+            await repository.commit()
+
+        self.batches += 1
+        self.sent += len(sent_ids)
+        self.retried += len(retries)
+        self.failed += len(failures)
+        return len(messages)
+
+    async def run(self, poll_seconds: float = 1.0, stats_interval_seconds: float = 60) -> None:
+        loop = asyncio.get_running_loop()
+        next_stats_at = loop.time() + stats_interval_seconds
+        while True:
+            try:
+                claimed = await self.run_once()
+            except Exception:
+                logger.exception("Email outbox batch failed")
+                claimed = 0
+
+            if loop.time() >= next_stats_at:
+                next_stats_at = loop.time() + stats_interval_seconds
+                logger.info("Email outbox stats: %s", await self.stats())
+
+            if claimed < self.batch_size:
+                await asyncio.sleep(poll_seconds)
+
+    async def stats(self) -> dict[str, int | float]:
+        async with self.session_factory() as session:
+            depth, oldest_pending_seconds = await EmailOutboxRepository(session).queue_depth()
+        return {
+            "queue_depth": depth,
+            "oldest_pending_seconds": oldest_pending_seconds,
+            "batches": self.batches,
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            "smtp_connections": self.mailer.connections,
+        }
+
+    async def _throttle(self) -> None:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._next_send_at > now:
+            await asyncio.sleep(self._next_send_at - now)
+        self._next_send_at = max(now, self._next_send_at) + 1 / self.rate_per_second
+
+    def _retry_delay(self, attempts: int) -> float:
+        return min(self.retry_base_seconds * 2 ** (attempts - 1), self.retry_max_seconds)
+
+    @staticmethod
+    def _is_permanent(exc: Exception) -> bool:
+        # 5xx replies mean the server will never accept this message as is.
+        if isinstance(exc, aiosmtplib.SMTPRecipientsRefused):
+            return all(500 <= error.code < 600 for error in exc.recipients)
+        return isinstance(exc, aiosmtplib.SMTPResponseException) and 500 <= exc.code < 600
+
+
+def build_email_outbox_worker(mailer: SmtpMailer | None = None) -> EmailOutboxWorker:
+    return EmailOutboxWorker(
+        mailer or SmtpMailer(),
+        batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE,
+        rate_per_second=settings.EMAIL_OUTBOX_RATE_PER_SECOND,
+        max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        retry_base_seconds=settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS,
+        retry_max_seconds=settings.EMAIL_OUTBOX_RETRY_MAX_SECONDS,
+        lease_seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS,
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Send queued emails from the email_outbox table over SMTP")
+    parser.add_argument("--once", action="store_true", help="send one batch and exit")
+    parser.add_argument("--depth", action="store_true", help="print queue depth as JSON and exit")
+    args = parser.parse_args()
+
+    worker = build_email_outbox_worker()
+    try:
+        if args.depth:
+            print(json.dumps(await worker.stats()))
+        elif args.once:
+            await worker.run_once()
+        else:
+            task = asyncio.create_task(
+                worker.run(settings.EMAIL_OUTBOX_POLL_SECONDS, settings.EMAIL_OUTBOX_STATS_INTERVAL_SECONDS)
+            )
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                loop.add_signal_handler(sig, task.cancel)
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            logger.info("Email outbox stats: %s", await worker.stats())
+    finally:
+        await worker.mailer.aclose()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.LOG_LEVEL.upper())
+    asyncio.run(main())
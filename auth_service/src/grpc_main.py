@@ -1,34 +1,65 @@
 import asyncio
 import logging
+import os
+import stat
 
 import grpc
 
+from auth_service.src.infrastructure.config import settings
+from auth_service.src.infrastructure.database import async_session_factory
 from auth_service.src.infrastructure.generated import users_pb2_grpc
+from auth_service.src.infrastructure.redis import get_redis_client
 from auth_service.src.presentation.grpc_handler import UsersServicer
+from common.stats_log import periodic_stats_log
 
 logger = logging.getLogger(__name__)
 
 
-async def serve_grpc(port: int):
+async def serve_grpc(port: int, uds_path: str | None = settings.GRPC_UDS_PATH, grace: float = 5.0):
     server = grpc.aio.server(
         options=[
             ("grpc.max_receive_message_length", 64 * 1024),
-            ("grpc.max_send_message_length", 64 * 1024),
+            ("grpc.max_send_message_length", UsersServicer.MAX_SEND_MESSAGE_LENGTH),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.min_recv_ping_interval_without_data_ms", 10_000),
         ]
     )
 
+    servicer = UsersServicer()
+    if servicer.existence_index is not None:
+        servicer.existence_index.start(async_session_factory, get_redis_client())
     users_pb2_grpc.add_UsersExternalServicer_to_server(
-        UsersServicer(), server
+        servicer, server
     )
 
     listen_addr = f"[::]:{port}"
     server.add_insecure_port(listen_addr)
-
     logger.info("gRPC server started on %s", listen_addr)
 
+    if uds_path:
+        _remove_stale_socket(uds_path)
+        server.add_insecure_port(f"unix:{uds_path}")
+        logger.info("gRPC server started on unix:%s", uds_path)
+
     await server.start()
 
+    stats_sources = {"gRPC existence batching": servicer.existence_batcher.stats}
+    if servicer.existence_index is not None:
+        stats_sources["User existence index"] = servicer.existence_index.stats
+    async with periodic_stats_log(stats_sources, settings.STATS_LOG_INTERVAL_SECONDS):
+        try:
+            # Shielded so cancelling serve_grpc does not cancel the server's own
+            # shutdown future, which stop() below still has to await.
+            await asyncio.shield(server.wait_for_termination())
+        except asyncio.CancelledError:
+            await server.stop(grace)
+    if servicer.existence_index is not None:
+        await servicer.existence_index.stop()
+
+
+def _remove_stale_socket(path: str) -> None:
     try:
-        await server.wait_for_termination()
-    except asyncio.CancelledError:
-        await server.stop(5)
+        if stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,85 @@
+import asyncio
+from typing import Any
+
+from redis.asyncio import Redis
+
+# Commands that hold the connection or change its state cannot share a
+# pipeline with unrelated callers.
+UNBATCHED_COMMANDS = frozenset({
+    "BLPOP", "BRPOP", "BRPOPLPUSH", "BLMOVE", "BLMPOP", "BZPOPMIN", "BZPOPMAX", "BZMPOP",
+    "XREAD", "XREADGROUP", "WAIT", "WAITAOF", "MULTI", "EXEC", "DISCARD", "WATCH", "UNWATCH",
+    "SELECT", "CLIENT", "MONITOR", "SUBSCRIBE", "PSUBSCRIBE", "SSUBSCRIBE",
+})
+
+
+class AutoPipelineRedis(Redis):
+    # Commands issued by concurrent coroutines are queued and written as one
+    # non-transactional pipeline on the next event-loop tick. Each caller still
+    # awaits its own reply, and errors stay with the command that caused them.
+    def __init__(self, *args, max_batch_size: int = 512, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.batched_commands = 0
+        self._queue: list[tuple[tuple, dict, asyncio.Future]] = []
+        self._flush_handle: asyncio.Handle | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def execute_command(self, *args, **options) -> Any:
+        command = args[0].upper() if isinstance(args[0], str) else args[0].decode().upper()
+        if command in UNBATCHED_COMMANDS:
+            return await super().execute_command(*args, **options)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((args, options, future))
+        if len(self._queue) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_soon(self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        queue, self._queue = self._queue, []
+        if not queue:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._send(queue))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _send(self, queue: list[tuple[tuple, dict, asyncio.Future]]) -> None:
+        self.batches += 1
+        self.batched_commands += len(queue)
+        try:
+            async with self.pipeline(transaction=False) as pipe:
+                for args, options, _ in queue:
+                    pipe.execute_command(*args, **options)
+                results = await pipe.execute(raise_on_error=False)
+        except Exception as exc:
+            for _, _, future in queue:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        except BaseException:
+            for _, _, future in queue:
+                future.cancel()
+            raise
+
+        for (_, _, future), result in zip(queue, results, strict=True):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def aclose(self, close_connection_pool: bool | None = None) -> None:
+        if self._queue:
+            self._flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        await super().aclose(close_connection_pool)
@@ -1,9 +1,11 @@
 from typing import Literal
 from urllib.parse import quote_plus
 
-from pydantic import Field, field_validator
+from pydantic import AwareDatetime, Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from common.rate_limit import RateLimitRule
+
 
 class Settings(BaseSettings):
     DB_HOST: str
@@ -15,12 +17,24 @@ class Settings(BaseSettings):
     APP_HOST: str = "0.0.0.0"
     APP_PORT: int = 8000
     GRPC_PORT: int = 50051
+    GRPC_UDS_PATH: str | None = None
+    HTTP_WORKERS: int = Field(default=1, ge=1)
+    GRPC_WORKERS: int = Field(default=1, ge=1)
+    SHUTDOWN_GRACE_SECONDS: float = Field(default=10.0, ge=0)
     LOG_LEVEL: str = "info"
+    STATS_LOG_INTERVAL_SECONDS: float = Field(default=60, gt=0)
 
     REDIS_HOST: str
     REDIS_PORT: int
     REDIS_PASSWORD: str | None = None
     REDIS_DB: int = 0
+    REDIS_AUTO_PIPELINE: bool = False
+    REDIS_AUTO_PIPELINE_MAX_BATCH: int = Field(default=512, ge=1)
+    REDIS_SESSIONS_CLUSTER_URL: str | None = None
+    REDIS_NEAR_CACHE_ENABLED: bool = False
+    REDIS_NEAR_CACHE_PREFIXES: list[str] = ["profile:", "profile_version:"]
+    REDIS_NEAR_CACHE_MAX_KEYS: int = Field(default=10_000, ge=1)
+    REDIS_NEAR_CACHE_HEALTH_CHECK_SECONDS: float = Field(default=5, gt=0)
 
     JWT_SECRET: str = Field(min_length=32)
     JWT_ALGORITHM: Literal["HS256"] = "HS256"
@@ -29,6 +43,7 @@ class Settings(BaseSettings):
     AUTH_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     VERIFY_ACCESS_TOKEN_EXPIRE_HOURS: int = 12
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    LEGACY_SESSIONS_UNTIL: AwareDatetime | None = None
 
     MAIL_USERNAME: str
     MAIL_PASSWORD: str
@@ -37,10 +52,60 @@ class Settings(BaseSettings):
     MAIL_PORT: int = 587
     MAIL_STARTTLS: bool = True
     MAIL_SSL_TLS: bool = False
+    MAIL_TIMEOUT_SECONDS: float = Field(default=30, gt=0)
+
+    EMAIL_OUTBOX_BATCH_SIZE: int = Field(default=50, ge=1)
+    EMAIL_OUTBOX_POLL_SECONDS: float = Field(default=1.0, gt=0)
+    EMAIL_OUTBOX_RATE_PER_SECOND: float = Field(default=10.0, gt=0)
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = Field(default=8, ge=1)
+    EMAIL_OUTBOX_RETRY_BASE_SECONDS: float = Field(default=30, ge=0)
+    EMAIL_OUTBOX_RETRY_MAX_SECONDS: float = Field(default=3600, ge=0)
+    EMAIL_OUTBOX_LEASE_SECONDS: float = Field(default=300, gt=0)
+    EMAIL_OUTBOX_STATS_INTERVAL_SECONDS: float = Field(default=60, gt=0)
 
     PUBLIC_APP_URL: str = "http://localhost:8000"
     ALLOWED_ORIGINS: list[str] = ["http://localhost:3000"]
     GRPC_SERVICE_TOKEN: str = Field(min_length=32)
+    GRPC_EXISTENCE_BATCH_WINDOW_MS: float = Field(default=1.0, ge=0)
+    GRPC_EXISTENCE_BATCH_MAX_SIZE: int = Field(default=500, ge=1)
+
+    PROFILE_JSON_AGGREGATION: bool = True
+    PROFILE_CACHE_ENABLED: bool = True
+    PROFILE_CACHE_TTL_SECONDS: int = Field(default=300, ge=1)
+    PROFILE_CACHE_LOCK_TIMEOUT_MS: int = Field(default=2000, ge=1)
+    PROFILE_CACHE_WAIT_MS: int = Field(default=200, ge=0)
+
+    PRINCIPAL_EXISTENCE_CHECK: bool = False
+    PRINCIPAL_EXISTENCE_TTL_SECONDS: int = Field(default=30, ge=1)
+
+    USER_EXISTENCE_INDEX_ENABLED: bool = False
+    USER_EXISTENCE_INDEX_CAPACITY: int = Field(default=1_000_000, ge=1)
+    USER_EXISTENCE_INDEX_ERROR_RATE: float = Field(default=0.01, gt=0, lt=1)
+    USER_EXISTENCE_INDEX_REFRESH_SECONDS: int = Field(default=3600, ge=1)
+
+    LOGIN_RATE_LIMIT_ALGORITHM: Literal["fixed_window", "gcra"] = "fixed_window"
+
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMIT_RULES: list[RateLimitRule] = [
+        RateLimitRule(name="register", path="/auth/register", methods=["POST"], scope="ip", limit=20),
+        RateLimitRule(name="login", path="/auth/login", methods=["POST"], scope="ip", limit=60),
+        RateLimitRule(name="skills_search", path="/skills", methods=["GET"], scope="ip", limit=120),
+        RateLimitRule(name="users_batch", path="/users/batch", methods=["POST"], scope="ip", limit=60),
+        RateLimitRule(name="global_ip", path="/", scope="ip", limit=1200),
+        RateLimitRule(name="global_user", path="/", scope="user", limit=1200),
+    ]
+    RATE_LIMIT_EXEMPT_PATHS: list[str] = ["/health"]
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
+    RATE_LIMIT_TRUSTED_PROXIES: int = Field(default=1, ge=1)
+    RATE_LIMIT_LOCAL_SHARE: float = Field(default=0.5, ge=0, le=1)
+    RATE_LIMIT_LOCAL_SYNC_SECONDS: float = Field(default=1.0, gt=0)
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = Field(default=10_000, ge=1)
+    RATE_LIMIT_LOCAL_MIN_LIMIT: int = Field(default=100, ge=0)
+    RATE_LIMIT_REPLICAS: int = Field(default=1, ge=1)
+
+    PASSWORD_HASH_EXECUTOR: Literal["process", "thread", "inline"] = "process"
+    PASSWORD_HASH_WORKERS: int | None = Field(default=None, ge=1)
+    PASSWORD_HASH_MAX_PENDING: int = Field(default=64, ge=1)
 
     @field_validator("PUBLIC_APP_URL")
     @classmethod
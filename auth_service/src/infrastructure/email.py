@@ -1,31 +1,66 @@
-from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
+from email.message import EmailMessage
+
+import aiosmtplib
 
 from auth_service.src.infrastructure.config import settings
 
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.MAIL_USERNAME,
-    MAIL_PASSWORD=settings.MAIL_PASSWORD,
-    MAIL_FROM=settings.MAIL_FROM,
-    MAIL_PORT=settings.MAIL_PORT,
-    MAIL_SERVER=settings.MAIL_SERVER,
-    MAIL_STARTTLS=settings.MAIL_STARTTLS,
-    MAIL_SSL_TLS=settings.MAIL_SSL_TLS,
-    USE_CREDENTIALS=True,
-    VALIDATE_CERTS=True
-)
 
-fastmail = FastMail(conf)
+def build_verification_email(token: str) -> tuple[str, str]:
+    verify_url = f"{settings.PUBLIC_APP_URL}/auth/verify?token={token}"
+    subject = "Подтверждение регистрации"
+    body = (
+        f"Для подтверждения перейдите по ссылке: {verify_url}\nЕсли вы не регистрировались в сервисе MateForge – "
+        f"проигнорируйте это письмо"
+    )
+    return subject, body
+
 
+class SmtpMailer:
+    # One SMTP session is kept open and reused for every message; it is
+    # reopened on the next send after the server drops it.
+    def __init__(
+            self,
+            hostname: str = settings.MAIL_SERVER,
+            port: int = settings.MAIL_PORT,
+            username: str | None = settings.MAIL_USERNAME,
+            password: str | None = settings.MAIL_PASSWORD,
+            sender: str = settings.MAIL_FROM,
+            start_tls: bool = settings.MAIL_STARTTLS,
+            use_tls: bool = settings.MAIL_SSL_TLS,
+            timeout: float = settings.MAIL_TIMEOUT_SECONDS,
+    ):
+        self.sender = sender
+        self.connections = 0
+        self._smtp = aiosmtplib.SMTP(
+            hostname=hostname,
+            port=port,
+            username=username or None,
+            password=password or None,
+            start_tls=start_tls,
+            use_tls=use_tls,
+            timeout=timeout,
+        )
 
-async def send_verification_email(email: str, token: str):
-    verify_url = f"{settings.PUBLIC_APP_URL}/auth/verify?token={token}"
+    async def send(self, recipient: str, subject: str, body: str) -> None:
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = recipient
+        message["Subject"] = subject
+        message.set_content(body)
 
-    message = MessageSchema(
-        subject="Подтверждение регистрации",
-        recipients=[email],
-        body=f"Для подтверждения перейдите по ссылке: {verify_url}\nЕсли вы не регистрировались в сервисе MateForge – "
-             f"проигнорируйте это письмо",
-        subtype=MessageType.plain
-    )
+        if not self._smtp.is_connected:
+            await self._smtp.connect()
+            self.connections += 1
+        try:
+            await self._smtp.send_message(message)
+        except aiosmtplib.SMTPServerDisconnected:
+            self._smtp.close()
+            raise
 
-    await fastmail.send_message(message)
+    async def aclose(self) -> None:
+        if not self._smtp.is_connected:
+            return
+        try:
+            await self._smtp.quit()
+        except aiosmtplib.SMTPException:
+            self._smtp.close()
@@ -13,4 +13,8 @@ class UserError(Exception):
 
 
 class UserDoesNotExist(UserError):
-    pass
\ No newline at end of file
+    pass
+
+
+class PasswordHasherBusy(Exception):
+    pass
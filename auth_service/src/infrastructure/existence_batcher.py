@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+ExistenceLoader = Callable[[list[UUID]], Awaitable[set[UUID]]]
+
+
+class ExistenceBatcher:
+    def __init__(self, loader: ExistenceLoader, window_seconds: float = 0.001, max_batch_size: int = 500):
+        self.loader = loader
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._pending: dict[UUID, asyncio.Future[bool]] = {}
+        self._in_flight: dict[UUID, asyncio.Future[bool]] = {}
+        self._opened_at = 0.0
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+        self.requests = 0
+        self.batches = 0
+        self.loaded_ids = 0
+        self.max_seen_batch_size = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    async def load(self, user_id: UUID) -> bool:
+        loop = asyncio.get_running_loop()
+        self.requests += 1
+
+        future = self._pending.get(user_id) or self._in_flight.get(user_id)
+        if future is None:
+            if not self._pending:
+                self._opened_at = time.perf_counter()
+                self._flush_handle = loop.call_later(self.window_seconds, self._flush)
+            future = loop.create_future()
+            self._pending[user_id] = future
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+
+        return await asyncio.shield(future)
+
+    def stats(self) -> dict[str, float | int]:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "loaded_ids": self.loaded_ids,
+            "max_batch_size": self.max_seen_batch_size,
+            "mean_batch_size": self.loaded_ids / self.batches if self.batches else 0.0,
+            "mean_added_latency_ms": self.total_wait_seconds / self.batches * 1000 if self.batches else 0.0,
+            "max_added_latency_ms": self.max_wait_seconds * 1000,
+        }
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        self._in_flight.update(batch)
+        waited = time.perf_counter() - self._opened_at
+
+        self.batches += 1
+        self.loaded_ids += len(batch)
+        self.max_seen_batch_size = max(self.max_seen_batch_size, len(batch))
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        logger.debug("Resolving %s user ids after %.3fms", len(batch), waited * 1000)
+
+        task = asyncio.get_running_loop().create_task(self._resolve(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, batch: dict[UUID, asyncio.Future[bool]]) -> None:
+        try:
+            existing_ids = await self.loader(list(batch))
+        except Exception as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for user_id, future in batch.items():
+                if not future.done():
+                    future.set_result(user_id in existing_ids)
+        finally:
+            for user_id, future in batch.items():
+                if self._in_flight.get(user_id) is future:
+                    del self._in_flight[user_id]
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0busers.proto\x12\x05users\"\x1e\n\x0bUserRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\"#\n\x11\x45xistenceResponse\x12\x0e\n\x06\x65xists\x18\x01 \x01(\x08\x32Q\n\rUsersExternal\x12@\n\x10GetUserExistence\x12\x12.users.UserRequest\x1a\x18.users.ExistenceResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0busers.proto\x12\x05users\"\x1e\n\x0bUserRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\"#\n\x11\x45xistenceResponse\x12\x0e\n\x06\x65xists\x18\x01 \x01(\x08\" \n\x0cUsersRequest\x12\x10\n\x08user_ids\x18\x01 \x03(\t\"0\n\rUserExistence\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x0e\n\x06\x65xists\x18\x02 \x01(\x08\"=\n\x16UsersExistenceResponse\x12#\n\x05users\x18\x01 \x03(\x0b\x32\x14.users.UserExistence\"H\n\x0cSkillSummary\x12\x0c\n\x04slug\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\r\n\x05group\x18\x03 \x01(\t\x12\r\n\x05level\x18\x04 \x01(\x05\"\xb0\x01\n\x0bUserSummary\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\r\n\x05\x66ound\x18\x02 \x01(\x08\x12\x10\n\x08username\x18\x03 \x01(\t\x12\x10\n\x03\x62io\x18\x04 \x01(\tH\x00\x88\x01\x01\x12\x17\n\x0f\x66ollowers_count\x18\x05 \x01(\x05\x12\x17\n\x0f\x66ollowing_count\x18\x06 \x01(\x05\x12#\n\x06skills\x18\x07 \x03(\x0b\x32\x13.users.SkillSummaryB\x06\n\x04_bio\"9\n\x14UsersSummaryResponse\x12!\n\x05users\x18\x01 \x03(\x0b\x32\x12.users.UserSummary2\xaf\x02\n\rUsersExternal\x12@\n\x10GetUserExistence\x12\x12.users.UserRequest\x1a\x18.users.ExistenceResponse\x12G\n\x11GetUsersExistence\x12\x13.users.UsersRequest\x1a\x1d.users.UsersExistenceResponse\x12N\n\x14StreamUsersExistence\x12\x13.users.UsersRequest\x1a\x1d.users.UsersExistenceResponse(\x01\x30\x01\x12\x43\n\x0fGetUsersSummary\x12\x13.users.UsersRequest\x1a\x1b.users.UsersSummaryResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -35,6 +35,18 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_USERREQUEST']._serialized_end=52
   _globals['_EXISTENCERESPONSE']._serialized_start=54
   _globals['_EXISTENCERESPONSE']._serialized_end=89
-  _globals['_USERSEXTERNAL']._serialized_start=91
-  _globals['_USERSEXTERNAL']._serialized_end=172
+  _globals['_USERSREQUEST']._serialized_start=91
+  _globals['_USERSREQUEST']._serialized_end=123
+  _globals['_USEREXISTENCE']._serialized_start=125
+  _globals['_USEREXISTENCE']._serialized_end=173
+  _globals['_USERSEXISTENCERESPONSE']._serialized_start=175
+  _globals['_USERSEXISTENCERESPONSE']._serialized_end=236
+  _globals['_SKILLSUMMARY']._serialized_start=238
+  _globals['_SKILLSUMMARY']._serialized_end=310
+  _globals['_USERSUMMARY']._serialized_start=313
+  _globals['_USERSUMMARY']._serialized_end=489
+  _globals['_USERSSUMMARYRESPONSE']._serialized_start=491
+  _globals['_USERSSUMMARYRESPONSE']._serialized_end=548
+  _globals['_USERSEXTERNAL']._serialized_start=551
+  _globals['_USERSEXTERNAL']._serialized_end=854
 # @@protoc_insertion_point(module_scope)
@@ -39,6 +39,21 @@ class UsersExternalStub(object):
                 request_serializer=users__pb2.UserRequest.SerializeToString,
                 response_deserializer=users__pb2.ExistenceResponse.FromString,
                 _registered_method=True)
+        self.GetUsersExistence = channel.unary_unary(
+                '/users.UsersExternal/GetUsersExistence',
+                request_serializer=users__pb2.UsersRequest.SerializeToString,
+                response_deserializer=users__pb2.UsersExistenceResponse.FromString,
+                _registered_method=True)
+        self.StreamUsersExistence = channel.stream_stream(
+                '/users.UsersExternal/StreamUsersExistence',
+                request_serializer=users__pb2.UsersRequest.SerializeToString,
+                response_deserializer=users__pb2.UsersExistenceResponse.FromString,
+                _registered_method=True)
+        self.GetUsersSummary = channel.unary_unary(
+                '/users.UsersExternal/GetUsersSummary',
+                request_serializer=users__pb2.UsersRequest.SerializeToString,
+                response_deserializer=users__pb2.UsersSummaryResponse.FromString,
+                _registered_method=True)
 
 
 class UsersExternalServicer(object):
@@ -50,6 +65,24 @@ class UsersExternalServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetUsersExistence(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamUsersExistence(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetUsersSummary(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_UsersExternalServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -58,6 +91,21 @@ def add_UsersExternalServicer_to_server(servicer, server):
                     request_deserializer=users__pb2.UserRequest.FromString,
                     response_serializer=users__pb2.ExistenceResponse.SerializeToString,
             ),
+            'GetUsersExistence': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetUsersExistence,
+                    request_deserializer=users__pb2.UsersRequest.FromString,
+                    response_serializer=users__pb2.UsersExistenceResponse.SerializeToString,
+            ),
+            'StreamUsersExistence': grpc.stream_stream_rpc_method_handler(
+                    servicer.StreamUsersExistence,
+                    request_deserializer=users__pb2.UsersRequest.FromString,
+                    response_serializer=users__pb2.UsersExistenceResponse.SerializeToString,
+            ),
+            'GetUsersSummary': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetUsersSummary,
+                    request_deserializer=users__pb2.UsersRequest.FromString,
+                    response_serializer=users__pb2.UsersSummaryResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'users.UsersExternal', rpc_method_handlers)
@@ -95,3 +143,84 @@ class UsersExternal(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def GetUsersExistence(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/users.UsersExternal/GetUsersExistence',
+            users__pb2.UsersRequest.SerializeToString,
+            users__pb2.UsersExistenceResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamUsersExistence(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/users.UsersExternal/StreamUsersExistence',
+            users__pb2.UsersRequest.SerializeToString,
+            users__pb2.UsersExistenceResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetUsersSummary(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/users.UsersExternal/GetUsersSummary',
+            users__pb2.UsersRequest.SerializeToString,
+            users__pb2.UsersSummaryResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
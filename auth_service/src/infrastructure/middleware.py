@@ -1,3 +1,5 @@
+from functools import partial
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -5,6 +7,9 @@ from starlette.requests import Request
 from starlette.responses import Response
 
 from auth_service.src.infrastructure.config import settings
+from auth_service.src.infrastructure.redis import get_redis_client
+from auth_service.src.infrastructure.security import decode_access_token
+from common.rate_limit import RateLimitMiddleware, build_rate_limit_prefilter
 
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
@@ -18,7 +23,27 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         return response
 
 
+RATE_LIMIT_HEADERS = ["RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset", "RateLimit-Policy", "Retry-After"]
+
+
 def setup_middleware(app: FastAPI) -> None:
+    if settings.RATE_LIMIT_ENABLED:
+        app.add_middleware(
+            RateLimitMiddleware,
+            rules=settings.RATE_LIMIT_RULES,
+            redis_factory=get_redis_client,
+            user_id_decoder=partial(decode_access_token, token_type="auth"),
+            exempt_paths=settings.RATE_LIMIT_EXEMPT_PATHS,
+            prefilter=build_rate_limit_prefilter(
+                share=settings.RATE_LIMIT_LOCAL_SHARE,
+                sync_seconds=settings.RATE_LIMIT_LOCAL_SYNC_SECONDS,
+                max_keys=settings.RATE_LIMIT_LOCAL_MAX_KEYS,
+                min_limit=settings.RATE_LIMIT_LOCAL_MIN_LIMIT,
+                processes=settings.RATE_LIMIT_REPLICAS * settings.HTTP_WORKERS,
+            ),
+            trust_forwarded=settings.RATE_LIMIT_TRUST_FORWARDED,
+            trusted_proxies=settings.RATE_LIMIT_TRUSTED_PROXIES,
+        )
     app.add_middleware(SecurityHeadersMiddleware)
     app.add_middleware(
         CORSMiddleware,
@@ -26,4 +51,5 @@ def setup_middleware(app: FastAPI) -> None:
         allow_credentials=True,
         allow_methods=["GET", "POST", "PATCH", "DELETE", "OPTIONS"],
         allow_headers=["Authorization", "Content-Type", "X-Client-Fingerprint"],
+        expose_headers=["X-Next-Cursor", *RATE_LIMIT_HEADERS],
     )
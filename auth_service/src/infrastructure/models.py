@@ -2,8 +2,8 @@ import uuid
 from datetime import datetime
 from enum import IntEnum
 
-from sqlalchemy import CheckConstraint, ForeignKey, Integer, String, func, select
-from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
+from sqlalchemy import BigInteger, CheckConstraint, ForeignKey, Identity, Index, Integer, String, Text, func, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from auth_service.src.infrastructure.database import Base
 
@@ -18,6 +18,8 @@ class Subscription(Base):
     __tablename__ = "subscriptions"
     __table_args__ = (
         CheckConstraint("subscriber_id <> author_id", name="ck_subscriptions_not_self"),
+        Index("ix_subscriptions_author_created", "author_id", "created_at", "subscriber_id"),
+        Index("ix_subscriptions_subscriber_created", "subscriber_id", "created_at", "author_id"),
     )
 
     subscriber_id: Mapped[uuid.UUID] = mapped_column(
@@ -28,6 +30,8 @@ class Subscription(Base):
         ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
     )
 
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+
 class UserSkill(Base):
     __tablename__ = "user_skills"
     __table_args__ = (
@@ -92,22 +96,33 @@ class UserDB(Base):
         back_populates="following"
     )
 
-    followers_count: Mapped[int] = column_property(
-        select(func.count(Subscription.subscriber_id))
-        .where(Subscription.author_id == id)
-        .correlate_except(Subscription)
-        .scalar_subquery()
-    )
-
-    following_count: Mapped[int] = column_property(
-        select(func.count(Subscription.author_id))
-        .where(Subscription.subscriber_id == id)
-        .correlate_except(Subscription)
-        .scalar_subquery()
-    )
+    followers_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    following_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
 
     skill_links: Mapped[list["UserSkill"]] = relationship(
         back_populates="user",
         cascade="all, delete-orphan",
         order_by="UserSkill.skill_id",
     )
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index(
+            "ix_email_outbox_pending",
+            "available_at",
+            "id",
+            postgresql_where=text("sent_at IS NULL AND failed_at IS NULL"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    recipient: Mapped[str] = mapped_column(String(320), nullable=False)
+    subject: Mapped[str] = mapped_column(String(200), nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    available_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    sent_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    failed_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Sequence
+
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError, RedisError
+
+logger = logging.getLogger(__name__)
+
+
+class NearCache:
+    # Replies to reads of keys under the tracked prefixes are kept in process
+    # memory. A dedicated RESP3 connection runs CLIENT TRACKING in broadcast
+    # mode, and Redis pushes an invalidation for every write to those
+    # prefixes, which drops the key here. Entries are only served while that
+    # connection is up; losing it empties the cache.
+    def __init__(
+            self,
+            redis: Redis,
+            prefixes: Sequence[str],
+            max_keys: int = 10_000,
+            health_check_seconds: float = 5,
+            retry_seconds: float = 1,
+    ):
+        self.redis = redis
+        self.prefixes = tuple(prefixes)
+        self.max_keys = max_keys
+        self.health_check_seconds = health_check_seconds
+        self.retry_seconds = retry_seconds
+        self._entries: OrderedDict[str, dict[tuple, Any]] = OrderedDict()
+        self._fills: dict[str, object] = {}
+        self._tracking = False
+        self._listener: asyncio.Task | None = None
+        self._ready = asyncio.Event()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self.flushes = 0
+
+    @property
+    def tracking(self) -> bool:
+        return self._tracking
+
+    async def start(self, timeout: float | None = None) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+        if timeout:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Near cache is not tracking yet, reads go to Redis until it is")
+
+    async def aclose(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    async def get(self, key: str) -> str | None:
+        return await self._read(key, ("GET",), lambda: self.redis.get(key))
+
+    async def hmget(self, key: str, *fields: str) -> list[str | None]:
+        return await self._read(key, ("HMGET", *fields), lambda: self.redis.hmget(key, *fields))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._fills.clear()
+        self.flushes += 1
+
+    def stats(self) -> dict[str, int | float | bool]:
+        lookups = self.hits + self.misses
+        return {
+            "tracking": self._tracking,
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "flushes": self.flushes,
+        }
+
+    async def _read(self, key: str, command: tuple, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        if not self._tracking or not key.startswith(self.prefixes):
+            return await fetch()
+
+        replies = self._entries.get(key)
+        if replies is not None and command in replies:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return replies[command]
+
+        # An invalidation that arrives while the read is in flight removes
+        # the marker, so a reply that may predate the write is not stored.
+        self.misses += 1
+        fill = self._fills[key] = object()
+        try:
+            value = await fetch()
+        finally:
+            current = self._fills.get(key) is fill
+            if current:
+                del self._fills[key]
+        if current:
+            self._store(key, command, value)
+        return value
+
+    def _store(self, key: str, command: tuple, value: Any) -> None:
+        self._entries.setdefault(key, {})[command] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_keys:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def _on_invalidate(self, message: list) -> bool:
+        keys = message[1]
+        if keys is None:
+            # FLUSHDB / FLUSHALL invalidate everything at once.
+            self.clear()
+            return True
+        for key in keys:
+            if isinstance(key, bytes):
+                key = key.decode()
+            self._fills.pop(key, None)
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+        return True
+
+    async def _listen(self) -> None:
+        pool = self.redis.connection_pool
+        while True:
+            connection = pool.connection_class(**{**pool.connection_kwargs, "protocol": 3})
+            try:
+                await connection.connect()
+                # The asyncio client only exposes invalidation pushes on its parser.
+                connection._parser.set_invalidation_push_handler(self._on_invalidate)
+                prefixes = [argument for prefix in self.prefixes for argument in ("PREFIX", prefix)]
+                await connection.send_command("CLIENT", "TRACKING", "ON", "BCAST", *prefixes)
+                await connection.read_response()
+                self._tracking = True
+                self._ready.set()
+                await self._consume(connection)
+            except (RedisError, OSError) as exc:
+                logger.warning("Near cache lost its tracking connection, retrying: %s", exc)
+            finally:
+                self._tracking = False
+                self._ready.clear()
+                self.clear()
+                await connection.disconnect()
+            await asyncio.sleep(self.retry_seconds)
+
+    async def _consume(self, connection) -> None:
+        # A silent connection gets a PING; missing invalidations on a dead
+        # socket would otherwise leave stale entries in place.
+        awaiting_pong = False
+        while True:
+            response = await connection.read_response(timeout=self.health_check_seconds, push_request=True)
+            if response is not None:
+                awaiting_pong = False
+                continue
+            if awaiting_pong:
+                raise ConnectionError("Near cache tracking connection stopped answering")
+            await connection.send_command("PING")
+            awaiting_pong = True
@@ -0,0 +1,92 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Literal, TypeVar
+
+from auth_service.src.infrastructure.config import settings
+from auth_service.src.infrastructure.exceptions import PasswordHasherBusy
+from auth_service.src.infrastructure.security import hash_password, verify_password
+
+T = TypeVar("T")
+
+ExecutorKind = Literal["process", "thread", "inline"]
+
+
+class PasswordHasher:
+    def __init__(
+        self,
+        executor_kind: ExecutorKind = "process",
+        max_workers: int | None = None,
+        max_pending: int = 64,
+    ):
+        self.executor_kind = executor_kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self._executor: Executor | None = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        if self._pending >= self.max_pending:
+            raise PasswordHasherBusy("Password hashing queue is full")
+
+        self._pending += 1
+        try:
+            if self.executor_kind == "inline":
+                return func(*args)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                # The pool starts lazily inside a process that may already run
+                # the grpc.aio server, and grpcio is not fork-safe.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password-hasher",
+                )
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    executor_kind=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
+def size_password_hasher(max_workers: int) -> None:
+    # Called by a supervised worker before it serves requests; the pool is
+    # created lazily, so the new size applies to its first hash.
+    password_hasher.max_workers = max_workers
+
+
+def get_password_hasher() -> PasswordHasher:
+    return password_hasher
+
+
+def close_password_hasher() -> None:
+    password_hasher.shutdown()
@@ -1,16 +1,59 @@
-from redis.asyncio import ConnectionPool, Redis
+from redis.asyncio import ConnectionPool, Redis, RedisCluster
 
+from auth_service.src.infrastructure.auto_pipeline import AutoPipelineRedis
 from auth_service.src.infrastructure.config import settings
+from auth_service.src.infrastructure.near_cache import NearCache
 
 pool = ConnectionPool.from_url(
     settings.REDIS_URL,
     decode_responses=True
 )
 
+# One shared client, so concurrent requests land in the same pipelines.
+auto_pipeline_client = (
+    AutoPipelineRedis(connection_pool=pool, max_batch_size=settings.REDIS_AUTO_PIPELINE_MAX_BATCH)
+    if settings.REDIS_AUTO_PIPELINE
+    else None
+)
+
+session_cluster = (
+    RedisCluster.from_url(settings.REDIS_SESSIONS_CLUSTER_URL, decode_responses=True)
+    if settings.REDIS_SESSIONS_CLUSTER_URL
+    else None
+)
+
 
 def get_redis_client() -> Redis:
+    if auto_pipeline_client is not None:
+        return auto_pipeline_client
     return Redis(connection_pool=pool)
 
 
+near_cache = (
+    NearCache(
+        get_redis_client(),
+        prefixes=settings.REDIS_NEAR_CACHE_PREFIXES,
+        max_keys=settings.REDIS_NEAR_CACHE_MAX_KEYS,
+        health_check_seconds=settings.REDIS_NEAR_CACHE_HEALTH_CHECK_SECONDS,
+    )
+    if settings.REDIS_NEAR_CACHE_ENABLED
+    else None
+)
+
+
+def get_near_cache() -> NearCache | None:
+    return near_cache
+
+
+def get_session_cluster_client() -> RedisCluster | None:
+    return session_cluster
+
+
 async def close_redis_pool() -> None:
+    if near_cache is not None:
+        await near_cache.aclose()
+    if auto_pipeline_client is not None:
+        await auto_pipeline_client.aclose()
     await pool.disconnect()
+    if session_cluster is not None:
+        await session_cluster.aclose()
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth_service.src.infrastructure.models import EmailOutbox
+
+
+class EmailOutboxRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def enqueue(self, recipient: str, subject: str, body: str) -> EmailOutbox:
+        # Only added to the session: the message is committed together with
+        # whatever the caller is writing.
+        message = EmailOutbox(recipient=recipient, subject=subject, body=body)
+        self.session.add(message)
+        return message
+
+    async def claim_batch(self, limit: int, lease_seconds: float) -> list[EmailOutbox]:
+        # Claimed rows are hidden from other workers for the lease, so a
+        # worker that dies mid-batch only delays those messages.
+        pending = (
+            select(EmailOutbox.id)
+            .where(
+                EmailOutbox.sent_at.is_(None),
+                EmailOutbox.failed_at.is_(None),
+                EmailOutbox.available_at <= func.now(),
+            )
+            .order_by(EmailOutbox.available_at, EmailOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(pending))
+            .values(
+                attempts=EmailOutbox.attempts + 1,
+                available_at=func.now() + timedelta(seconds=lease_seconds),
+            )
+            .returning(EmailOutbox)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        return sorted(result.scalars().all(), key=lambda message: message.id)
+
+    async def mark_sent(self, message_ids: list[int]) -> None:
+        if not message_ids:
+            return
+        await self.session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(message_ids))
+            .values(sent_at=func.now(), last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def schedule_retry(self, message_id: int, error: str, delay_seconds: float) -> None:
+        await self.session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id == message_id)
+            .values(available_at=func.now() + timedelta(seconds=delay_seconds), last_error=error)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def mark_failed(self, message_id: int, error: str) -> None:
+        await self.session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id == message_id)
+            .values(failed_at=func.now(), last_error=error)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def queue_depth(self) -> tuple[int, float]:
+        result = await self.session.execute(
+            select(
+                func.count(),
+                func.coalesce(func.extract("epoch", func.now() - func.min(EmailOutbox.created_at)), 0),
+            )
+            .where(EmailOutbox.sent_at.is_(None), EmailOutbox.failed_at.is_(None))
+        )
+        depth, oldest_age = result.one()
+        return depth, float(oldest_age)
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
@@ -0,0 +1,309 @@
+import asyncio
+import logging
+import secrets
+import time
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from auth_service.src.infrastructure.config import settings
+from auth_service.src.infrastructure.near_cache import NearCache
+from auth_service.src.infrastructure.redis import get_near_cache
+
+logger = logging.getLogger(__name__)
+
+ProfileLoader = Callable[[], Awaitable[bytes | None]]
+ProfilesLoader = Callable[[list[UUID]], Awaitable[dict[UUID, bytes]]]
+
+INVALIDATION_BATCH_SIZE = 1000
+
+_background_invalidations: set[asyncio.Task] = set()
+
+
+class ProfileCacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.fills = 0
+        self.stale_fills = 0
+        self.invalidations = 0
+        self.errors = 0
+        self.hit_seconds = 0.0
+        self.miss_seconds = 0.0
+        self.max_hit_seconds = 0.0
+        self.max_miss_seconds = 0.0
+
+    def record_hit(self, elapsed: float) -> None:
+        self.hits += 1
+        self.hit_seconds += elapsed
+        self.max_hit_seconds = max(self.max_hit_seconds, elapsed)
+
+    def record_miss(self, elapsed: float) -> None:
+        self.misses += 1
+        self.miss_seconds += elapsed
+        self.max_miss_seconds = max(self.max_miss_seconds, elapsed)
+
+    def snapshot(self) -> dict[str, float | int]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "coalesced": self.coalesced,
+            "fills": self.fills,
+            "stale_fills": self.stale_fills,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+            "mean_hit_ms": self.hit_seconds / self.hits * 1000 if self.hits else 0.0,
+            "mean_miss_ms": self.miss_seconds / self.misses * 1000 if self.misses else 0.0,
+            "max_hit_ms": self.max_hit_seconds * 1000,
+            "max_miss_ms": self.max_miss_seconds * 1000,
+        }
+
+
+profile_cache_stats = ProfileCacheStats()
+
+
+class ProfileCache:
+    # A cached profile is only served while it was stored under the current
+    # version of the user, and writers bump that version after committing.
+    _READ_SCRIPT = """
+    local version = redis.call('GET', KEYS[1]) or '0'
+    local cached = redis.call('HMGET', KEYS[2], 'version', 'payload')
+    if cached[1] == version then
+        return {version, cached[2]}
+    end
+    return {version, false}
+    """
+
+    # Fills computed from a snapshot taken before a concurrent write are
+    # dropped, because the writer has already moved the version on.
+    _FILL_SCRIPT = """
+    local filled = 0
+    local version = redis.call('GET', KEYS[1]) or '0'
+    if ARGV[2] ~= '' and version == ARGV[1] then
+        redis.call('HSET', KEYS[2], 'version', version, 'payload', ARGV[2])
+        redis.call('EXPIRE', KEYS[2], ARGV[3])
+        if version ~= '0' then
+            redis.call('EXPIRE', KEYS[1], ARGV[4])
+        end
+        filled = 1
+    end
+    if ARGV[5] ~= '' and redis.call('GET', KEYS[3]) == ARGV[5] then
+        redis.call('DEL', KEYS[3])
+    end
+    return filled
+    """
+
+    def __init__(
+            self,
+            redis: Redis,
+            ttl_seconds: int = 300,
+            lock_timeout_ms: int = 2000,
+            wait_ms: int = 200,
+            stats: ProfileCacheStats = profile_cache_stats,
+            near_cache: NearCache | None = None,
+    ):
+        self.redis = redis
+        self.near_cache = near_cache
+        self._read_script = redis.register_script(self._READ_SCRIPT)
+        self._fill_script = redis.register_script(self._FILL_SCRIPT)
+        self.ttl_seconds = ttl_seconds
+        self.lock_timeout_ms = lock_timeout_ms
+        self.wait_ms = wait_ms
+        self.stats = stats
+
+    @property
+    def version_ttl_seconds(self) -> int:
+        # Versions must outlive every profile stored under them, otherwise a
+        # reset counter could match an old entry again.
+        return self.ttl_seconds * 2
+
+    @staticmethod
+    def _version_key(user_id: UUID) -> str:
+        return f"profile_version:{user_id}"
+
+    @staticmethod
+    def _profile_key(user_id: UUID) -> str:
+        return f"profile:{user_id}"
+
+    @staticmethod
+    def _lock_key(user_id: UUID) -> str:
+        return f"profile_lock:{user_id}"
+
+    async def get_or_load(self, user_id: UUID, loader: ProfileLoader) -> bytes | None:
+        started = time.perf_counter()
+        try:
+            version, payload = await self._read(user_id)
+        except RedisError:
+            self.stats.errors += 1
+            logger.warning("Profile cache read failed for %s", user_id, exc_info=True)
+            return await loader()
+
+        if payload is not None:
+            self.stats.record_hit(time.perf_counter() - started)
+            return payload
+
+        lock_token = await self._acquire_fill_lock(user_id)
+        if not lock_token:
+            payload = await self._wait_for_fill(user_id)
+            if payload is not None:
+                self.stats.coalesced += 1
+                self.stats.record_hit(time.perf_counter() - started)
+                return payload
+
+        payload = await loader()
+        await self._fill(user_id, version, payload, lock_token)
+        self.stats.record_miss(time.perf_counter() - started)
+        return payload
+
+    async def get_or_load_many(self, user_ids: list[UUID], loader: ProfilesLoader) -> dict[UUID, bytes]:
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for user_id in user_ids:
+                    await self._read_script(
+                        keys=[self._version_key(user_id), self._profile_key(user_id)],
+                        client=pipe,
+                    )
+                replies = await pipe.execute()
+        except RedisError:
+            self.stats.errors += 1
+            logger.warning("Profile cache batch read failed", exc_info=True)
+            return await loader(user_ids)
+
+        profiles: dict[UUID, bytes] = {}
+        missed_versions: dict[UUID, str] = {}
+        for user_id, (version, payload) in zip(user_ids, replies, strict=True):
+            if payload is None:
+                missed_versions[user_id] = version
+            else:
+                profiles[user_id] = payload.encode() if isinstance(payload, str) else payload
+
+        self.stats.hits += len(profiles)
+        self.stats.misses += len(missed_versions)
+        if not missed_versions:
+            return profiles
+
+        loaded = await loader(list(missed_versions))
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for user_id, payload in loaded.items():
+                    await self._fill_script(
+                        keys=[self._version_key(user_id), self._profile_key(user_id), self._lock_key(user_id)],
+                        args=[missed_versions[user_id], payload, self.ttl_seconds, self.version_ttl_seconds, ""],
+                        client=pipe,
+                    )
+                filled = await pipe.execute()
+        except RedisError:
+            self.stats.errors += 1
+            logger.warning("Profile cache batch fill failed", exc_info=True)
+        else:
+            self.stats.fills += sum(filled)
+            self.stats.stale_fills += len(filled) - sum(filled)
+
+        profiles.update(loaded)
+        return profiles
+
+    async def invalidate(self, *user_ids: UUID) -> None:
+        if not user_ids:
+            return
+
+        try:
+            for start in range(0, len(user_ids), INVALIDATION_BATCH_SIZE):
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for user_id in user_ids[start:start + INVALIDATION_BATCH_SIZE]:
+                        pipe.incr(self._version_key(user_id))
+                        pipe.expire(self._version_key(user_id), self.version_ttl_seconds)
+                        pipe.delete(self._profile_key(user_id))
+                    await pipe.execute()
+        except RedisError:
+            # Entries stored under the old version expire after the TTL.
+            self.stats.errors += 1
+            logger.exception("Failed to invalidate cached profiles of %s", user_ids)
+            return
+
+        self.stats.invalidations += len(user_ids)
+
+    def invalidate_in_background(self, *user_ids: UUID) -> None:
+        # For fan-outs such as every neighbour of a deleted account: the
+        # response does not wait, and until the task runs those profiles only
+        # show stale follower counters.
+        if not user_ids:
+            return
+        task = asyncio.create_task(self.invalidate(*user_ids))
+        _background_invalidations.add(task)
+        task.add_done_callback(_background_invalidations.discard)
+
+    async def _read(self, user_id: UUID) -> tuple[str, bytes | None]:
+        if self.near_cache is not None and self.near_cache.tracking:
+            return await self._read_near(user_id)
+
+        version, payload = await self._read_script(keys=[self._version_key(user_id), self._profile_key(user_id)])
+        if payload is None:
+            return version, None
+        return version, payload.encode() if isinstance(payload, str) else payload
+
+    async def _read_near(self, user_id: UUID) -> tuple[str, bytes | None]:
+        # Writers bump the version before deleting the profile, so reading
+        # the version first can at worst turn a hit into a miss.
+        version = await self.near_cache.get(self._version_key(user_id)) or "0"
+        cached_version, payload = await self.near_cache.hmget(self._profile_key(user_id), "version", "payload")
+        if cached_version != version or payload is None:
+            return version, None
+        return version, payload.encode() if isinstance(payload, str) else payload
+
+    async def _acquire_fill_lock(self, user_id: UUID) -> str:
+        token = secrets.token_hex(8)
+        try:
+            acquired = await self.redis.set(self._lock_key(user_id), token, nx=True, px=self.lock_timeout_ms)
+        except RedisError:
+            self.stats.errors += 1
+            return ""
+        return token if acquired else ""
+
+    async def _wait_for_fill(self, user_id: UUID) -> bytes | None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.wait_ms / 1000
+        delay = 0.005
+        while loop.time() < deadline:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+            try:
+                _, payload = await self._read(user_id)
+            except RedisError:
+                self.stats.errors += 1
+                return None
+            if payload is not None:
+                return payload
+        return None
+
+    async def _fill(self, user_id: UUID, version: str, payload: bytes | None, lock_token: str) -> None:
+        try:
+            filled = await self._fill_script(
+                keys=[self._version_key(user_id), self._profile_key(user_id), self._lock_key(user_id)],
+                args=[version, payload or b"", self.ttl_seconds, self.version_ttl_seconds, lock_token],
+            )
+        except RedisError:
+            self.stats.errors += 1
+            logger.warning("Profile cache fill failed for %s", user_id, exc_info=True)
+            return
+
+        if filled:
+            self.stats.fills += 1
+        elif payload is not None:
+            self.stats.stale_fills += 1
+
+
+def build_profile_cache(redis: Redis) -> ProfileCache | None:
+    if not settings.PROFILE_CACHE_ENABLED:
+        return None
+    return ProfileCache(
+        redis,
+        ttl_seconds=settings.PROFILE_CACHE_TTL_SECONDS,
+        lock_timeout_ms=settings.PROFILE_CACHE_LOCK_TIMEOUT_MS,
+        wait_ms=settings.PROFILE_CACHE_WAIT_MS,
+        near_cache=get_near_cache(),
+    )
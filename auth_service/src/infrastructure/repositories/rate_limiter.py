@@ -1,41 +1,88 @@
-from fastapi import HTTPException, status
+from typing import Literal, NamedTuple
+
 from redis.asyncio import Redis
 
+RateLimitAlgorithm = Literal["fixed_window", "gcra"]
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after_ms: int
+    reset_after_ms: int
+
 
 class RateLimiter:
-    _INCREMENT_SCRIPT = """
-    local count = redis.call('INCR', KEYS[1])
-    if count == 1 then
-        redis.call('EXPIRE', KEYS[1], ARGV[1])
+    # Both scripts check, consume and report the budget in one round trip and
+    # reply with {allowed, remaining, retry_after_ms, reset_after_ms}, where
+    # retry_after_ms is how long until the next request would be admitted.
+    _FIXED_WINDOW_SCRIPT = """
+    local limit = tonumber(ARGV[1])
+    local window_ms = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local count = tonumber(redis.call('GET', KEYS[1]) or '0')
+    local ttl = redis.call('PTTL', KEYS[1])
+    if ttl < 0 then
+        ttl = window_ms
+    end
+    if count + cost > limit then
+        return {0, math.max(limit - count, 0), ttl, ttl}
+    end
+    count = redis.call('INCRBY', KEYS[1], cost)
+    if count == cost then
+        redis.call('PEXPIRE', KEYS[1], window_ms)
+    end
+    local retry_after = 0
+    if count >= limit then
+        retry_after = ttl
     end
-    return {count, redis.call('TTL', KEYS[1])}
+    return {1, limit - count, retry_after, ttl}
     """
 
-    def __init__(self, redis: Redis):
+    _GCRA_SCRIPT = """
+    local limit = tonumber(ARGV[1])
+    local period_ms = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local interval = period_ms / limit
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) * 1000 + tonumber(clock[2]) / 1000
+    local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+    if tat < now then
+        tat = now
+    end
+    local new_tat = tat + interval * cost
+    local allow_at = new_tat - period_ms
+    if allow_at > now then
+        return {0, 0, math.ceil(allow_at - now), math.ceil(tat - now)}
+    end
+    redis.call('SET', KEYS[1], string.format('%.3f', new_tat), 'PX', math.ceil(new_tat - now))
+    local remaining = math.floor((now - allow_at) / interval)
+    local retry_after = 0
+    if remaining < 1 then
+        retry_after = math.ceil(allow_at + interval - now)
+    end
+    return {1, remaining, retry_after, math.ceil(new_tat - now)}
+    """
+
+    def __init__(self, redis: Redis, algorithm: RateLimitAlgorithm = "fixed_window"):
         self.redis = redis
+        self.algorithm = algorithm
+        script = self._GCRA_SCRIPT if algorithm == "gcra" else self._FIXED_WINDOW_SCRIPT
+        self._hit_script = redis.register_script(script)
+
+    def _key(self, key: str) -> str:
+        # The algorithms store different state, so they never share a key.
+        if self.algorithm == "gcra":
+            return f"limiter:gcra:{key}"
+        return f"limiter:{key}"
 
-    async def check_limit(self, key: str, limit: int):
-        redis_key = f"limiter:{key}"
-
-        current_count = await self.redis.get(redis_key)
-
-        if current_count and int(current_count) >= limit:
-            ttl = await self.redis.ttl(redis_key)
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Too many attempts. Try again in {ttl} seconds."
-            )
-
-    async def increment(self, key: str, window_seconds: int) -> tuple[int, int]:
-        redis_key = f"limiter:{key}"
-        count, ttl = await self.redis.eval(
-            self._INCREMENT_SCRIPT,
-            1,
-            redis_key,
-            window_seconds,
+    async def hit(self, key: str, limit: int, window_seconds: float, cost: int = 1) -> RateLimitResult:
+        allowed, remaining, retry_after_ms, reset_after_ms = await self._hit_script(
+            keys=[self._key(key)],
+            args=[limit, int(window_seconds * 1000), cost],
         )
-        return int(count), int(ttl)
+        return RateLimitResult(bool(allowed), limit, int(remaining), int(retry_after_ms), int(reset_after_ms))
 
     async def reset(self, key: str):
-        redis_key = f"limiter:{key}"
-        await self.redis.delete(redis_key)
+        await self.redis.delete(self._key(key))
@@ -1,14 +1,59 @@
+from typing import AsyncIterable, AsyncIterator, NamedTuple
 from uuid import UUID
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import Row, Uuid, any_, delete, func, literal, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from auth_service.src.infrastructure.models import Skill, UserSkill
+from auth_service.src.infrastructure.models import Skill, UserDB, UserSkill
 from auth_service.src.presentation.schemas import SkillCreate, UserSkillInput
 
+SkillImportRecord = tuple[int, str, str, str]
+
+
+class SkillImportResult(NamedTuple):
+    received: int
+    accepted: int
+    inserted: int
+    updated_ids: list[UUID]
+
 
 class SkillRepository:
+    # Rows are copied into a per-transaction staging table and merged in one
+    # statement. The last row of a slug wins, and rows whose name belongs to
+    # another slug are left out instead of failing the whole import.
+    _MERGE_IMPORT = text("""
+    WITH latest AS (
+        SELECT DISTINCT ON (slug) line, name, slug, "group"
+        FROM skill_import
+        ORDER BY slug, line DESC
+    ),
+    accepted AS (
+        SELECT latest.*
+        FROM latest
+        WHERE NOT EXISTS (
+            SELECT 1 FROM skills WHERE skills.name = latest.name AND skills.slug <> latest.slug
+        )
+        AND NOT EXISTS (
+            SELECT 1 FROM latest AS other WHERE other.name = latest.name AND other.slug <> latest.slug
+        )
+    ),
+    merged AS (
+        INSERT INTO skills (id, name, slug, "group")
+        SELECT gen_random_uuid(), name, slug, "group" FROM accepted
+        ON CONFLICT (slug) DO UPDATE
+        SET name = EXCLUDED.name, "group" = EXCLUDED."group"
+        WHERE (skills.name, skills."group") IS DISTINCT FROM (EXCLUDED.name, EXCLUDED."group")
+        RETURNING id, xmax = 0 AS inserted
+    )
+    SELECT
+        (SELECT count(*) FROM latest) AS received,
+        (SELECT count(*) FROM accepted) AS accepted,
+        (SELECT count(*) FROM merged WHERE inserted) AS inserted,
+        coalesce((SELECT array_agg(id) FROM merged WHERE NOT inserted), '{}') AS updated_ids
+    """)
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
@@ -63,6 +108,17 @@ class SkillRepository:
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def count_user_skills_for_update(self, user_id: UUID) -> int:
+        # Locking the owner row serializes concurrent additions, so the count
+        # stays valid until the transaction commits.
+        await self.session.execute(
+            select(UserDB.id).where(UserDB.id == user_id).with_for_update(key_share=True)
+        )
+        result = await self.session.execute(
+            select(func.count()).select_from(UserSkill).where(UserSkill.user_id == user_id)
+        )
+        return result.scalar_one()
+
     async def add_user_skill(self, user_id: UUID, data: UserSkillInput) -> None:
         self.session.add(
             UserSkill(
@@ -105,6 +161,38 @@ class SkillRepository:
         )
         return bool(result.rowcount)
 
+    async def import_skills(self, records: AsyncIterable[SkillImportRecord]) -> SkillImportResult:
+        await self.session.execute(text(
+            'CREATE TEMP TABLE skill_import (line bigint, name text, slug text, "group" text) ON COMMIT DROP'
+        ))
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            "skill_import",
+            records=records,
+            columns=["line", "name", "slug", "group"],
+        )
+        row = (await self.session.execute(self._MERGE_IMPORT)).one()
+        await self.session.execute(text("DROP TABLE skill_import"))
+        return SkillImportResult(row.received, row.accepted, row.inserted, list(row.updated_ids))
+
+    async def get_skill_user_ids(self, skill_ids: list[UUID]) -> list[UUID]:
+        if not skill_ids:
+            return []
+        result = await self.session.execute(
+            select(UserSkill.user_id).distinct().where(UserSkill.skill_id == any_(literal(skill_ids, ARRAY(Uuid))))
+        )
+        return list(result.scalars().all())
+
+    async def stream_skills(self, batch_size: int = 1000) -> AsyncIterator[Row]:
+        result = await self.session.stream(
+            select(Skill.id, Skill.name, Skill.slug, Skill.group)
+            .order_by(Skill.slug)
+            .execution_options(yield_per=batch_size)
+        )
+        async for row in result:
+            yield row
+
     async def commit(self) -> None:
         await self.session.commit()
 
@@ -1,81 +1,219 @@
+import base64
 import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Literal
 
-from redis.asyncio import Redis
+from redis.asyncio import Redis, RedisCluster
+
+from auth_service.src.infrastructure.config import settings
+from auth_service.src.infrastructure.security import refresh_token_owner
+
+SESSION_DELETE_BATCH_SIZE = 1000
+
+TokenRevokeResult = Literal["revoked", "missing", "foreign"]
 
 
 class TokenRepository:
+    # Sessions live in small hashes indexed per user in a sorted set scored by
+    # expiry, so expired entries can be pruned whenever a session is written.
+    # Every key of one user carries the {user_id} hash tag, which keeps these
+    # scripts on a single Redis Cluster slot.
+    _STORE_SESSION = """
+    local now = tonumber(redis.call('TIME')[1])
+    local ttl = tonumber(ARGV[3])
+    redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+    redis.call('HSET', KEYS[1], 'f', ARGV[2])
+    redis.call('EXPIRE', KEYS[1], ttl)
+    redis.call('ZADD', KEYS[2], now + ttl, ARGV[1])
+    local last = redis.call('ZRANGE', KEYS[2], -1, -1, 'WITHSCORES')
+    redis.call('EXPIREAT', KEYS[2], tonumber(last[2]))
+    """
+
+    _SAVE_SCRIPT = _STORE_SESSION + """
+    return 1
+    """
+
     _ROTATE_SCRIPT = """
-    local data = redis.call('GET', KEYS[1])
-    if not data then
-        return nil
+    if redis.call('DEL', KEYS[3]) == 0 then
+        return 0
+    end
+    redis.call('ZREM', KEYS[2], ARGV[4])
+    """ + _STORE_SESSION + """
+    return 1
+    """
+
+    _REVOKE_SCRIPT = """
+    redis.call('ZREM', KEYS[2], ARGV[1])
+    return redis.call('UNLINK', KEYS[1])
+    """
+
+    # Session keys are derived from the index key itself ('sessions:{uid}'
+    # -> 'session:{uid}:'), so every key touched stays in the slot of KEYS[1]
+    # and a rotation can only land entirely before the revocation (and be
+    # revoked) or after it (and find its old session gone).
+    _REVOKE_ALL_SCRIPT = """
+    local prefix = 'session:' .. string.sub(KEYS[1], 10) .. ':'
+    local digests = redis.call('ZRANGE', KEYS[1], 0, -1)
+    local batch_size = tonumber(ARGV[1])
+    for first = 1, #digests, batch_size do
+        local keys = {}
+        for i = first, math.min(first + batch_size - 1, #digests) do
+            keys[#keys + 1] = prefix .. digests[i]
+        end
+        redis.call('UNLINK', unpack(keys))
     end
-    redis.call('DEL', KEYS[1])
-    redis.call('SREM', KEYS[3], ARGV[1])
-    redis.call('SETEX', KEYS[2], ARGV[3], ARGV[2])
-    redis.call('SADD', KEYS[3], ARGV[4])
-    redis.call('EXPIRE', KEYS[3], ARGV[3] + 3600)
-    return data
+    redis.call('UNLINK', KEYS[1])
+    return #digests
     """
 
-    def __init__(self, redis: Redis):
+    def __init__(self, redis: Redis | RedisCluster):
         self.redis = redis
+        self._save_script = redis.register_script(self._SAVE_SCRIPT)
+        self._rotate_script = redis.register_script(self._ROTATE_SCRIPT)
+        self._revoke_script = redis.register_script(self._REVOKE_SCRIPT)
+        self._revoke_all_script = redis.register_script(self._REVOKE_ALL_SCRIPT)
 
     @staticmethod
     def _digest(refresh_token: str) -> str:
+        digest = hashlib.sha256(refresh_token.encode("utf-8")).digest()
+        return base64.urlsafe_b64encode(digest[:18]).decode("ascii")
+
+    @staticmethod
+    def _legacy_digest(refresh_token: str) -> str:
         return hashlib.sha256(refresh_token.encode("utf-8")).hexdigest()
 
-    async def save_token(self, user_id: str, refresh_token: str, data: str, ttl: int):
+    @staticmethod
+    def _session_key(user_id: str, token_digest: str) -> str:
+        return f"session:{{{user_id}}}:{token_digest}"
+
+    @staticmethod
+    def _index_key(user_id: str) -> str:
+        return f"sessions:{{{user_id}}}"
+
+    # Refresh tokens issued before the owner prefix live in the original
+    # JSON layout on arbitrary slots. They are honoured, and moved to the
+    # tagged layout on their next refresh, only until LEGACY_SESSIONS_UNTIL.
+    @staticmethod
+    def _legacy_session_key(token_digest: str) -> str:
+        return f"refresh_token:{token_digest}"
+
+    @staticmethod
+    def _legacy_index_key(user_id: str) -> str:
+        return f"user_sessions:{user_id}"
+
+    @staticmethod
+    def _legacy_sessions_enabled() -> bool:
+        until = settings.LEGACY_SESSIONS_UNTIL
+        return until is not None and datetime.now(timezone.utc) < until
+
+    async def save_token(self, user_id: str, refresh_token: str, fingerprint: str, ttl: int):
         token_digest = self._digest(refresh_token)
-        session_key = f"user_sessions:{user_id}"
-        async with self.redis.pipeline(transaction=True) as pipe:
-            pipe.setex(f"refresh_token:{token_digest}", ttl, data)
-            pipe.sadd(session_key, token_digest)
-            pipe.expire(session_key, ttl + 3600)
-            await pipe.execute()
+        await self._save_script(
+            keys=[self._session_key(user_id, token_digest), self._index_key(user_id)],
+            args=[token_digest, fingerprint, ttl],
+        )
 
     async def delete_token(self, user_id: str, refresh_token: str):
+        if refresh_token_owner(refresh_token) is None:
+            await self._consume_legacy_session(user_id, refresh_token)
+            return
+
         token_digest = self._digest(refresh_token)
-        async with self.redis.pipeline(transaction=True) as pipe:
-            pipe.delete(f"refresh_token:{token_digest}")
-            pipe.srem(f"user_sessions:{user_id}", token_digest)
-            await pipe.execute()
+        await self._revoke_script(
+            keys=[self._session_key(user_id, token_digest), self._index_key(user_id)],
+            args=[token_digest],
+        )
 
-    async def delete_all_user_tokens(self, user_id: str):
-        session_key = f"user_sessions:{user_id}"
-        tokens = await self.redis.smembers(session_key)
+    async def revoke_token(self, user_id: str, refresh_token: str) -> TokenRevokeResult:
+        owner = refresh_token_owner(refresh_token)
+        if owner is None:
+            return await self._revoke_legacy_token(user_id, refresh_token)
 
-        if tokens:
-            keys_to_delete = [
-                f"refresh_token:{token.decode() if isinstance(token, bytes) else token}"
-                for token in tokens
-            ]
-            await self.redis.delete(*keys_to_delete)
+        token_digest = self._digest(refresh_token)
+        if owner != user_id:
+            exists = await self.redis.exists(self._session_key(owner, token_digest))
+            return "foreign" if exists else "missing"
 
-        await self.redis.delete(session_key)
+        revoked = await self._revoke_script(
+            keys=[self._session_key(user_id, token_digest), self._index_key(user_id)],
+            args=[token_digest],
+        )
+        return "revoked" if revoked else "missing"
 
-    async def get_token_data(self, refresh_token: str):
-        token_digest = self._digest(refresh_token)
-        return await self.redis.get(f"refresh_token:{token_digest}")
+    async def delete_all_user_tokens(self, user_id: str):
+        await self._revoke_all_script(keys=[self._index_key(user_id)], args=[SESSION_DELETE_BATCH_SIZE])
+        if self._legacy_sessions_enabled():
+            await self._revoke_all_legacy(user_id)
+
+    async def get_token_data(self, refresh_token: str) -> dict[str, str] | None:
+        owner = refresh_token_owner(refresh_token)
+        if owner is None:
+            return await self._get_legacy_token_data(refresh_token)
+
+        fingerprint = await self.redis.hget(self._session_key(owner, self._digest(refresh_token)), "f")
+        if fingerprint is None:
+            return None
+        return {"user_id": owner, "fingerprint": fingerprint}
 
     async def rotate_token(
         self,
         user_id: str,
         old_refresh_token: str,
         new_refresh_token: str,
-        data: str,
+        fingerprint: str,
         ttl: int,
     ) -> bool:
+        if refresh_token_owner(old_refresh_token) is None:
+            if not await self._consume_legacy_session(user_id, old_refresh_token):
+                return False
+            await self.save_token(user_id, new_refresh_token, fingerprint, ttl)
+            return True
+
         old_digest = self._digest(old_refresh_token)
         new_digest = self._digest(new_refresh_token)
-        result = await self.redis.eval(
-            self._ROTATE_SCRIPT,
-            3,
-            f"refresh_token:{old_digest}",
-            f"refresh_token:{new_digest}",
-            f"user_sessions:{user_id}",
-            old_digest,
-            data,
-            ttl,
-            new_digest,
+        rotated = await self._rotate_script(
+            keys=[
+                self._session_key(user_id, new_digest),
+                self._index_key(user_id),
+                self._session_key(user_id, old_digest),
+            ],
+            args=[new_digest, fingerprint, ttl, old_digest],
         )
-        return result is not None
+        return bool(rotated)
+
+    async def _get_legacy_token_data(self, refresh_token: str) -> dict[str, str] | None:
+        if not self._legacy_sessions_enabled():
+            return None
+        legacy_session = await self.redis.get(self._legacy_session_key(self._legacy_digest(refresh_token)))
+        return json.loads(legacy_session) if legacy_session else None
+
+    async def _revoke_legacy_token(self, user_id: str, refresh_token: str) -> TokenRevokeResult:
+        data = await self._get_legacy_token_data(refresh_token)
+        if not data:
+            return "missing"
+        if data.get("user_id") != user_id:
+            return "foreign"
+        return "revoked" if await self._consume_legacy_session(user_id, refresh_token) else "missing"
+
+    async def _revoke_all_legacy(self, user_id: str) -> None:
+        index_key = self._legacy_index_key(user_id)
+        legacy_digests = list(await self.redis.smembers(index_key))
+        if not legacy_digests:
+            return
+        for start in range(0, len(legacy_digests), SESSION_DELETE_BATCH_SIZE):
+            batch = legacy_digests[start:start + SESSION_DELETE_BATCH_SIZE]
+            await self.redis.unlink(*(self._legacy_session_key(token_digest) for token_digest in batch))
+        await self.redis.unlink(index_key)
+
+    async def _consume_legacy_session(self, user_id: str, refresh_token: str) -> bool:
+        if not self._legacy_sessions_enabled():
+            return False
+        # The keys may sit on different cluster slots, so single-use relies on
+        # DEL reporting the removal to exactly one caller.
+        legacy_digest = self._legacy_digest(refresh_token)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.delete(self._legacy_session_key(legacy_digest))
+            pipe.srem(self._legacy_index_key(user_id), legacy_digest)
+            deleted, _ = await pipe.execute()
+        return bool(deleted)
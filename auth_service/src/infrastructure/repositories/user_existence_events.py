@@ -0,0 +1,31 @@
+import logging
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from auth_service.src.infrastructure.user_existence_index import USER_EXISTENCE_CHANNEL, UserExistenceIndex
+
+logger = logging.getLogger(__name__)
+
+
+class UserExistenceEvents:
+    def __init__(self, redis: Redis, index: UserExistenceIndex | None = None):
+        self.redis = redis
+        self.index = index
+
+    async def announce_created(self, user_id: UUID) -> None:
+        if self.index is not None:
+            self.index.add(user_id)
+        await self._publish(f"created:{user_id}")
+
+    async def announce_deleted(self, user_id: UUID) -> None:
+        await self._publish(f"deleted:{user_id}")
+
+    async def _publish(self, message: str) -> None:
+        try:
+            await self.redis.publish(USER_EXISTENCE_CHANNEL, message)
+        except RedisError:
+            # Existence answers always come from the database and subscribers
+            # rebuild on every refresh, so a lost event only skews index stats.
+            logger.exception("Failed to publish user existence event %s", message)
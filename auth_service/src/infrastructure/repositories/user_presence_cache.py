@@ -0,0 +1,21 @@
+from uuid import UUID
+
+from redis.asyncio import Redis
+
+
+class UserPresenceCache:
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    @staticmethod
+    def _key(user_id: UUID) -> str:
+        return f"user_exists:{user_id}"
+
+    async def is_known(self, user_id: UUID) -> bool:
+        return bool(await self.redis.exists(self._key(user_id)))
+
+    async def remember(self, user_id: UUID, ttl: int) -> None:
+        await self.redis.set(self._key(user_id), 1, ex=ttl)
+
+    async def forget(self, user_id: UUID) -> None:
+        await self.redis.delete(self._key(user_id))
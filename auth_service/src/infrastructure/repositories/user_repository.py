@@ -1,12 +1,14 @@
-from typing import List
+from datetime import datetime
+from typing import AsyncIterator, Iterable, List
 from uuid import UUID, uuid4
 
-from sqlalchemy import delete, select
+from sqlalchemy import Text, Uuid, any_, case, cast, delete, func, literal, literal_column, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload
 
 from auth_service.src.infrastructure.exceptions import UserDoesNotExist
-from auth_service.src.infrastructure.models import Subscription, UserDB, UserSkill
+from auth_service.src.infrastructure.models import Skill, Subscription, UserDB, UserSkill
 from auth_service.src.presentation.schemas import UserCreate
 
 
@@ -36,14 +38,88 @@ class UserRepository:
 
         return user
 
+    async def get_many(self, user_ids: Iterable[UUID]) -> list[UserDB]:
+        result = await self.session.execute(
+            select(UserDB)
+            .options(selectinload(UserDB.skill_links).joinedload(UserSkill.skill))
+            .where(UserDB.id.in_(list(user_ids)))
+        )
+        return list(result.scalars().all())
+
+    async def get_profile_json(self, user_id: UUID, private: bool = False) -> bytes | None:
+        result = await self.session.execute(self._profile_json_query(private).where(UserDB.id == user_id))
+        row = result.one_or_none()
+        return row.profile.encode() if row is not None else None
+
+    async def get_profiles_json(self, user_ids: Iterable[UUID]) -> dict[UUID, bytes]:
+        result = await self.session.execute(self._profile_json_query().where(UserDB.id.in_(list(user_ids))))
+        return {row.id: row.profile.encode() for row in result}
+
+    @staticmethod
+    def _profile_json_query(private: bool = False):
+        skill_object = _json_object(
+            skill=_json_object(id=Skill.id, name=Skill.name, slug=Skill.slug, group=Skill.group),
+            level=UserSkill.level,
+        )
+        skills = (
+            select(
+                func.coalesce(
+                    func.json_agg(aggregate_order_by(skill_object, Skill.group, Skill.name, Skill.id)),
+                    literal_column("'[]'::json"),
+                )
+            )
+            .select_from(UserSkill)
+            .join(Skill, Skill.id == UserSkill.skill_id)
+            .where(UserSkill.user_id == UserDB.id)
+            .correlate(UserDB)
+            .scalar_subquery()
+        )
+
+        fields = {
+            "id": UserDB.id,
+            "username": UserDB.username,
+            "bio": UserDB.bio,
+            "followers_count": UserDB.followers_count,
+            "following_count": UserDB.following_count,
+            "skills": skills,
+        }
+        if private:
+            fields = {"email": UserDB.email, **fields, "created_at": UserDB.created_at}
+
+        return select(UserDB.id, cast(_json_object(**fields), Text).label("profile"))
+
     async def exists(self, user_id: UUID) -> bool:
         result = await self.session.execute(
             select(UserDB.id).where(UserDB.id == user_id).limit(1)
         )
         return result.scalar_one_or_none() is not None
 
+    async def get_existing_ids(self, user_ids: Iterable[UUID]) -> set[UUID]:
+        ids = list(set(user_ids))
+        if not ids:
+            return set()
+        result = await self.session.execute(
+            select(UserDB.id).where(UserDB.id == any_(literal(ids, ARRAY(Uuid))))
+        )
+        return set(result.scalars().all())
+
+    async def count(self) -> int:
+        result = await self.session.execute(select(func.count()).select_from(UserDB))
+        return result.scalar_one()
+
+    async def stream_ids(self, batch_size: int = 10_000) -> AsyncIterator[UUID]:
+        result = await self.session.stream_scalars(
+            select(UserDB.id).execution_options(yield_per=batch_size)
+        )
+        async for user_id in result:
+            yield user_id
+
     async def get_by_email(self, email: str) -> UserDB | None:
-        query = select(UserDB).where(UserDB.email == email)
+        query = (
+            select(UserDB)
+            .options(load_only(UserDB.id, UserDB.email, UserDB.hashed_password, UserDB.is_verified, raiseload=True))
+            .where(UserDB.email == email)
+        )
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
@@ -66,17 +142,51 @@ class UserRepository:
     async def refresh(self, user: UserDB) -> None:
         await self.session.refresh(user)
 
-    async def delete(self, user_id: UUID) -> None:
+    async def delete(self, user_id: UUID) -> list[UUID]:
+        followed_authors = select(Subscription.author_id).where(Subscription.subscriber_id == user_id)
+        subscribers = select(Subscription.subscriber_id).where(Subscription.author_id == user_id)
+        # The account row is locked first, so follows that already passed their
+        # foreign key check on it finish before the delete goes on. Neighbours
+        # are then locked in primary key order like in _shift_follow_counters,
+        # so the bulk counter updates below cannot deadlock with a follow.
+        await self.session.execute(select(UserDB.id).where(UserDB.id == user_id).with_for_update())
+        await self.session.execute(
+            select(UserDB.id)
+            .where(or_(UserDB.id.in_(followed_authors), UserDB.id.in_(subscribers)))
+            .order_by(UserDB.id)
+            .with_for_update(key_share=True)
+        )
+
+        authors = await self.session.execute(
+            update(UserDB)
+            .where(UserDB.id.in_(followed_authors))
+            .values(followers_count=UserDB.followers_count - 1)
+            .returning(UserDB.id)
+            .execution_options(synchronize_session=False)
+        )
+
+        followers = await self.session.execute(
+            update(UserDB)
+            .where(UserDB.id.in_(subscribers))
+            .values(following_count=UserDB.following_count - 1)
+            .returning(UserDB.id)
+            .execution_options(synchronize_session=False)
+        )
+
         query = delete(UserDB).where(UserDB.id == user_id)
         await self.session.execute(query)
+        return [*authors.scalars(), *followers.scalars()]
 
     async def mark_as_verified(self, user_id: UUID) -> None:
-        user = await self.session.get(UserDB, user_id)
-        if not user:
+        result = await self.session.execute(
+            update(UserDB)
+            .where(UserDB.id == user_id)
+            .values(is_verified=True)
+            .execution_options(synchronize_session=False)
+        )
+        if not result.rowcount:
             raise UserDoesNotExist
 
-        user.is_verified = True
-
     async def update_bio(self, user_id: UUID, bio: str) -> UserDB:
         user = await self.session.get(UserDB, user_id)
         if not user:
@@ -95,30 +205,135 @@ class UserRepository:
         self.session.add(new_sub)
 
         await self.session.flush()
+        await self._shift_follow_counters(author_id=user_id, subscriber_id=follower_id, delta=1)
 
+    async def unfollow(self, user_id: UUID, follower_id: UUID) -> bool:
+        result = await self.session.execute(
+            delete(Subscription).where(
+                Subscription.author_id == user_id,
+                Subscription.subscriber_id == follower_id,
+            )
+        )
+        if not result.rowcount:
+            return False
 
-    async def get_followers(self, user_id: UUID, limit: int, offset: int) -> List[UserDB]:
-        stmt = (
-            select(UserDB)
-            .options(selectinload(UserDB.skill_links).selectinload(UserSkill.skill))
-            .join(Subscription, UserDB.id == Subscription.subscriber_id)
-            .where(Subscription.author_id == user_id)
-            .order_by(UserDB.created_at.desc(), UserDB.id)
-            .limit(limit)
-            .offset(offset)
+        await self._shift_follow_counters(author_id=user_id, subscriber_id=follower_id, delta=-1)
+        return True
+
+    async def _shift_follow_counters(self, author_id: UUID, subscriber_id: UUID, delta: int) -> None:
+        # An UPDATE locks rows in whatever order its plan visits them, so both
+        # rows are locked in primary key order first; opposite follows of the
+        # same pair then cannot deadlock. NO KEY UPDATE still lets concurrent
+        # foreign key checks on subscriptions through.
+        await self.session.execute(
+            select(UserDB.id)
+            .where(UserDB.id.in_((author_id, subscriber_id)))
+            .order_by(UserDB.id)
+            .with_for_update(key_share=True)
         )
-        result = await self.session.execute(stmt)
-        return result.scalars().all()
+        await self.session.execute(
+            update(UserDB)
+            .where(UserDB.id.in_((author_id, subscriber_id)))
+            .values(
+                followers_count=UserDB.followers_count + case((UserDB.id == author_id, delta), else_=0),
+                following_count=UserDB.following_count + case((UserDB.id == subscriber_id, delta), else_=0),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def reconcile_follow_counters(self, after_id: UUID | None, batch_size: int) -> tuple[int, UUID | None]:
+        ids_query = select(UserDB.id).order_by(UserDB.id).limit(batch_size)
+        if after_id is not None:
+            ids_query = ids_query.where(UserDB.id > after_id)
+        user_ids = list((await self.session.execute(ids_query)).scalars().all())
+        if not user_ids:
+            return 0, None
 
-    async def get_following(self, user_id: UUID, limit: int, offset: int) -> List[UserDB]:
+        followers_total = (
+            select(func.count())
+            .where(Subscription.author_id == UserDB.id)
+            .correlate(UserDB)
+            .scalar_subquery()
+        )
+        following_total = (
+            select(func.count())
+            .where(Subscription.subscriber_id == UserDB.id)
+            .correlate(UserDB)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            update(UserDB)
+            .where(
+                UserDB.id.in_(user_ids),
+                (UserDB.followers_count != followers_total) | (UserDB.following_count != following_total),
+            )
+            .values(followers_count=followers_total, following_count=following_total)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount, user_ids[-1]
+
+
+    async def get_followers(
+        self,
+        user_id: UUID,
+        limit: int,
+        offset: int = 0,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> List[tuple[UserDB, datetime]]:
+        return await self._get_follow_page(
+            listed_column=Subscription.subscriber_id,
+            owner_column=Subscription.author_id,
+            user_id=user_id,
+            limit=limit,
+            offset=offset,
+            after=after,
+        )
+
+    async def get_following(
+        self,
+        user_id: UUID,
+        limit: int,
+        offset: int = 0,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> List[tuple[UserDB, datetime]]:
+        return await self._get_follow_page(
+            listed_column=Subscription.author_id,
+            owner_column=Subscription.subscriber_id,
+            user_id=user_id,
+            limit=limit,
+            offset=offset,
+            after=after,
+        )
+
+    async def _get_follow_page(
+        self,
+        *,
+        listed_column,
+        owner_column,
+        user_id: UUID,
+        limit: int,
+        offset: int,
+        after: tuple[datetime, UUID] | None,
+    ) -> List[tuple[UserDB, datetime]]:
         stmt = (
-            select(UserDB)
+            select(UserDB, Subscription.created_at)
             .options(selectinload(UserDB.skill_links).selectinload(UserSkill.skill))
-            .join(Subscription, UserDB.id == Subscription.author_id)
-            .where(Subscription.subscriber_id == user_id)
-            .order_by(UserDB.created_at.desc(), UserDB.id)
+            .join(Subscription, UserDB.id == listed_column)
+            .where(owner_column == user_id)
+            .order_by(Subscription.created_at.desc(), listed_column.desc())
             .limit(limit)
-            .offset(offset)
         )
+        if after is not None:
+            stmt = stmt.where(tuple_(Subscription.created_at, listed_column) < after)
+        elif offset:
+            stmt = stmt.offset(offset)
+
         result = await self.session.execute(stmt)
-        return result.scalars().all()
+        return [(user, followed_at) for user, followed_at in result.all()]
+
+
+def _json_object(**fields):
+    arguments = []
+    for key, value in fields.items():
+        arguments.extend((literal_column(f"'{key}'"), value))
+    return func.json_build_object(*arguments)
@@ -1,3 +1,4 @@
+import secrets
 from datetime import datetime, timedelta, timezone
 from uuid import UUID, uuid4
 
@@ -45,6 +46,21 @@ def create_token(user_id: UUID | str, token_type: str) -> str:
     return encoded_jwt
 
 
+def create_refresh_token(user_id: UUID | str) -> str:
+    # The owner prefix tells session storage which user's hash slot to read.
+    return f"{UUID(str(user_id)).hex}.{secrets.token_urlsafe(48)}"
+
+
+def refresh_token_owner(refresh_token: str) -> str | None:
+    owner, separator, _ = refresh_token.partition(".")
+    if not separator or len(owner) != 32:
+        return None
+    try:
+        return str(UUID(hex=owner))
+    except ValueError:
+        return None
+
+
 def decode_access_token(token: str, token_type: str) -> UUID:
     try:
         payload = jwt.decode(
@@ -0,0 +1,194 @@
+import asyncio
+import hashlib
+import logging
+import math
+from typing import Callable, Iterable
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth_service.src.infrastructure.config import settings
+from auth_service.src.infrastructure.repositories.user_repository import UserRepository
+
+logger = logging.getLogger(__name__)
+
+USER_EXISTENCE_CHANNEL = "user_existence"
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.size_bits = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size_bits / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size_bits + 7) // 8)
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._bits)
+
+    def add(self, user_id: UUID) -> None:
+        for position in self._positions(user_id):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, user_id: UUID) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(user_id))
+
+    def _positions(self, user_id: UUID):
+        digest = hashlib.blake2b(user_id.bytes, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + index * second) % self.size_bits for index in range(self.hash_count))
+
+
+class UserExistenceIndex:
+    def __init__(self, capacity: int, error_rate: float, refresh_seconds: float = 3600):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_seconds = refresh_seconds
+        self.ready = False
+        self._filter = BloomFilter(capacity, error_rate)
+        self._building: BloomFilter | None = None
+        self._task: asyncio.Task | None = None
+
+        self.lookups = 0
+        self.memory_negatives = 0
+        self.false_positives = 0
+        self.stale_negatives = 0
+        self.bypassed = 0
+        self.deleted_since_warm = 0
+
+    def might_exist(self, user_id: UUID) -> bool:
+        if not self.ready:
+            self.bypassed += 1
+            return True
+
+        self.lookups += 1
+        if user_id in self._filter:
+            return True
+
+        self.memory_negatives += 1
+        return False
+
+    def record_confirmed(self, candidates: int, found: int) -> None:
+        if self.ready:
+            self.false_positives += candidates - found
+
+    def record_stale(self, user_ids: Iterable[UUID]) -> None:
+        # The database found users the filter missed: their created event has
+        # not arrived yet or was never published, so learn them now.
+        for user_id in user_ids:
+            self.stale_negatives += 1
+            self.add(user_id)
+
+    def add(self, user_id: UUID) -> None:
+        self._filter.add(user_id)
+        if self._building is not None:
+            self._building.add(user_id)
+
+    def discard(self, user_id: UUID) -> None:
+        # Bloom filters cannot forget; deleted ids stay filter-positive and are
+        # answered by the database until the next warm-up rebuilds the filter.
+        self.deleted_since_warm += 1
+
+    def stats(self) -> dict[str, float | int | bool]:
+        answered = self.lookups or 1
+        return {
+            "ready": self.ready,
+            "users": self._filter.count,
+            "memory_bytes": self._filter.memory_bytes,
+            "hash_count": self._filter.hash_count,
+            "lookups": self.lookups,
+            "negative_rate": self.memory_negatives / answered,
+            "false_positive_rate": self.false_positives / answered,
+            "stale_negatives": self.stale_negatives,
+            "bypassed": self.bypassed,
+            "deleted_since_warm": self.deleted_since_warm,
+        }
+
+    async def warm(self, session_factory: Callable[[], AsyncSession]) -> None:
+        async with session_factory() as session:
+            repository = UserRepository(session)
+            total = await repository.count()
+            self._building = BloomFilter(max(self.capacity, total * 2), self.error_rate)
+            try:
+                async for user_id in repository.stream_ids():
+                    self._building.add(user_id)
+                self._filter = self._building
+            finally:
+                self._building = None
+
+        self.deleted_since_warm = 0
+        self.ready = True
+        logger.info("User existence index warmed: %s", self.stats())
+
+    def apply_event(self, message: str) -> None:
+        action, _, raw_id = message.partition(":")
+        try:
+            user_id = UUID(raw_id)
+        except ValueError:
+            logger.warning("Ignoring malformed user existence event %r", message)
+            return
+
+        if action == "created":
+            self.add(user_id)
+        elif action == "deleted":
+            self.discard(user_id)
+
+    def start(self, session_factory: Callable[[], AsyncSession], redis: Redis) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._follow(session_factory, redis))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.ready = False
+
+    async def _follow(self, session_factory: Callable[[], AsyncSession], redis: Redis) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                async with redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    # Subscribe before warming so no registration falls between
+                    # the snapshot and the first event.
+                    await pubsub.subscribe(USER_EXISTENCE_CHANNEL)
+                    await self.warm(session_factory)
+                    refresh_at = loop.time() + self.refresh_seconds
+
+                    while True:
+                        timeout = max(0.0, refresh_at - loop.time())
+                        message = await pubsub.get_message(timeout=timeout)
+                        if message is not None:
+                            self.apply_event(message["data"])
+                        if loop.time() >= refresh_at:
+                            await self.warm(session_factory)
+                            refresh_at = loop.time() + self.refresh_seconds
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Events may have been missed, so stop trusting negatives until
+                # the index is rebuilt from the database.
+                self.ready = False
+                logger.exception("User existence index lost sync, retrying")
+                await asyncio.sleep(1)
+
+
+user_existence_index = UserExistenceIndex(
+    capacity=settings.USER_EXISTENCE_INDEX_CAPACITY,
+    error_rate=settings.USER_EXISTENCE_INDEX_ERROR_RATE,
+    refresh_seconds=settings.USER_EXISTENCE_INDEX_REFRESH_SECONDS,
+)
+
+
+def get_user_existence_index() -> UserExistenceIndex | None:
+    if not settings.USER_EXISTENCE_INDEX_ENABLED:
+        return None
+    return user_existence_index
@@ -2,17 +2,29 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from auth_service.src.infrastructure.config import settings
 from auth_service.src.infrastructure.database import engine
 from auth_service.src.infrastructure.middleware import setup_middleware
-from auth_service.src.infrastructure.redis import close_redis_pool
+from auth_service.src.infrastructure.password_hasher import close_password_hasher
+from auth_service.src.infrastructure.redis import close_redis_pool, get_near_cache
+from auth_service.src.infrastructure.repositories.profile_cache import profile_cache_stats
 from auth_service.src.presentation.auth_routes import router as auth_router
 from auth_service.src.presentation.skill_routes import router as skill_router
 from auth_service.src.presentation.user_routes import router as user_router
+from common.stats_log import periodic_stats_log
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    yield
+    near_cache = get_near_cache()
+    if near_cache is not None:
+        await near_cache.start()
+    stats_sources = {"Profile cache": profile_cache_stats.snapshot}
+    if near_cache is not None:
+        stats_sources["Redis near cache"] = near_cache.stats
+    async with periodic_stats_log(stats_sources, settings.STATS_LOG_INTERVAL_SECONDS):
+        yield
+    close_password_hasher()
     await close_redis_pool()
     await engine.dispose()
 
@@ -1,14 +1,14 @@
-from fastapi import APIRouter, BackgroundTasks, Depends, Header
+from fastapi import APIRouter, Depends, Header
 from fastapi.security import OAuth2PasswordRequestForm
 
 from auth_service.src.application.login_service import AuthService
-from auth_service.src.presentation.dependencies import get_current_user, get_service
+from auth_service.src.presentation.dependencies import get_current_principal, get_service
 from auth_service.src.presentation.schemas import (
     LogoutRequest,
+    Principal,
     RefreshTokenRequest,
     Token,
     UserCreate,
-    UserData,
     UserRead,
 )
 
@@ -18,10 +18,9 @@ router = APIRouter()
 @router.post("/register", response_model=UserRead, status_code=201)
 async def register(
     user_in: UserCreate,
-    background_tasks: BackgroundTasks,
     auth_service: AuthService = Depends(get_service('auth'))
 ):
-    return await auth_service.register_user(user_in, background_tasks)
+    return await auth_service.register_user(user_in)
 
 
 @router.post("/login", response_model=Token)
@@ -62,14 +61,14 @@ async def verify(
 @router.delete("/logout")
 async def logout(
     payload: LogoutRequest,
-    current_user: UserData = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     auth_service: AuthService = Depends(get_service('auth'))
 ):
-    return await auth_service.logout(payload.refresh_token, current_user.id)
+    return await auth_service.logout(payload.refresh_token, principal.id)
 
 @router.delete("/logout-all")
 async def logout_all(
-    current_user: UserData = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     auth_service: AuthService = Depends(get_service('auth'))
 ):
-    return await auth_service.logout_all_sessions(current_user.id)
+    return await auth_service.logout_all_sessions(principal.id)
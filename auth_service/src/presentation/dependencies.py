@@ -1,39 +1,65 @@
 from typing import Annotated
+from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth_service.src.application.login_service import AuthService
 from auth_service.src.application.skill_service import SkillService
-from auth_service.src.application.user_service import AccessType, UserService
+from auth_service.src.application.user_service import UserService
+from auth_service.src.infrastructure.config import settings
 from auth_service.src.infrastructure.database import get_async_session
 from auth_service.src.infrastructure.exceptions import TokenExpiredError, TokenInvalidError
-from auth_service.src.infrastructure.redis import get_redis_client
+from auth_service.src.infrastructure.password_hasher import PasswordHasher, get_password_hasher
+from auth_service.src.infrastructure.redis import get_redis_client, get_session_cluster_client
+from auth_service.src.infrastructure.repositories.email_outbox_repository import EmailOutboxRepository
+from auth_service.src.infrastructure.repositories.profile_cache import ProfileCache, build_profile_cache
 from auth_service.src.infrastructure.repositories.rate_limiter import RateLimiter
 from auth_service.src.infrastructure.repositories.skill_repository import SkillRepository
 from auth_service.src.infrastructure.repositories.token_repository import TokenRepository
+from auth_service.src.infrastructure.repositories.user_existence_events import UserExistenceEvents
+from auth_service.src.infrastructure.repositories.user_presence_cache import UserPresenceCache
 from auth_service.src.infrastructure.repositories.user_repository import UserRepository
 from auth_service.src.infrastructure.security import decode_access_token
-from auth_service.src.presentation.schemas import UserData
+from auth_service.src.infrastructure.user_existence_index import get_user_existence_index
+from auth_service.src.presentation.schemas import Principal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
 
 
 async def get_rate_limiter(redis: Redis = Depends(get_redis_client)) -> RateLimiter:
-    return RateLimiter(redis)
+    return RateLimiter(redis, settings.LOGIN_RATE_LIMIT_ALGORITHM)
 
 def get_user_repository(session: AsyncSession = Depends(get_async_session)) -> UserRepository:
     return UserRepository(session)
 
 
+def get_email_outbox_repository(session: AsyncSession = Depends(get_async_session)) -> EmailOutboxRepository:
+    return EmailOutboxRepository(session)
+
+
 def get_skill_repository(session: AsyncSession = Depends(get_async_session)) -> SkillRepository:
     return SkillRepository(session)
 
 
 async def get_token_repository(redis: Redis = Depends(get_redis_client)) -> TokenRepository:
-    return TokenRepository(redis)
+    return TokenRepository(get_session_cluster_client() or redis)
+
+
+async def get_user_presence_cache(redis: Redis = Depends(get_redis_client)) -> UserPresenceCache:
+    return UserPresenceCache(redis)
+
+
+async def get_user_existence_events(redis: Redis = Depends(get_redis_client)) -> UserExistenceEvents | None:
+    if not settings.USER_EXISTENCE_INDEX_ENABLED:
+        return None
+    return UserExistenceEvents(redis, get_user_existence_index())
+
+
+async def get_profile_cache(redis: Redis = Depends(get_redis_client)) -> ProfileCache | None:
+    return build_profile_cache(redis)
 
 
 def get_service(service_type: str):
@@ -41,12 +67,17 @@ def get_service(service_type: str):
     async def service_dependency(
             user_repository: UserRepository = Depends(get_user_repository),
             token_repository: TokenRepository = Depends(get_token_repository),
-            rate_limiter: RateLimiter = Depends(get_rate_limiter)
+            rate_limiter: RateLimiter = Depends(get_rate_limiter),
+            hasher: PasswordHasher = Depends(get_password_hasher),
+            presence_cache: UserPresenceCache = Depends(get_user_presence_cache),
+            existence_events: UserExistenceEvents | None = Depends(get_user_existence_events),
+            profile_cache: ProfileCache | None = Depends(get_profile_cache),
+            email_outbox: EmailOutboxRepository = Depends(get_email_outbox_repository),
     ):
         if service_type == 'user':
-            return UserService(user_repository, token_repository)
+            return UserService(user_repository, token_repository, presence_cache, existence_events, profile_cache)
         elif service_type == 'auth':
-            return AuthService(user_repository, token_repository, rate_limiter)
+            return AuthService(user_repository, token_repository, rate_limiter, email_outbox, hasher, existence_events)
         else:
             raise ValueError(f"Unknown service type: {service_type}")
 
@@ -56,14 +87,12 @@ def get_service(service_type: str):
 def get_skill_service(
     skill_repository: SkillRepository = Depends(get_skill_repository),
     user_repository: UserRepository = Depends(get_user_repository),
+    profile_cache: ProfileCache | None = Depends(get_profile_cache),
 ) -> SkillService:
-    return SkillService(skill_repository, user_repository)
+    return SkillService(skill_repository, user_repository, profile_cache)
 
 
-async def get_current_user(
-        token: Annotated[str | None, Depends(oauth2_scheme)],
-        user_service: Annotated[UserService, Depends(get_service('user'))]
-) -> UserData:
+def _decode_user_id(token: str | None) -> UUID:
     if not token:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -71,7 +100,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     try:
-        user_id = decode_access_token(token, token_type="auth")
+        return decode_access_token(token, token_type="auth")
     except TokenExpiredError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -85,4 +114,34 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         ) from None
 
-    return await user_service.get_user(user_id, access_type=AccessType.PRIVATE)
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+async def get_current_principal(
+        request: Request,
+        token: Annotated[str | None, Depends(oauth2_scheme)],
+        user_repository: Annotated[UserRepository, Depends(get_user_repository)],
+        presence_cache: Annotated[UserPresenceCache, Depends(get_user_presence_cache)],
+) -> Principal:
+    user_id = _decode_user_id(token)
+
+    # Access tokens outlive account deletion, so writes always confirm the
+    # user; reads only do when PRINCIPAL_EXISTENCE_CHECK is set.
+    must_exist = request.method not in SAFE_METHODS or settings.PRINCIPAL_EXISTENCE_CHECK
+    if must_exist and not await presence_cache.is_known(user_id):
+        if not await user_repository.exists(user_id):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        await presence_cache.remember(user_id, settings.PRINCIPAL_EXISTENCE_TTL_SECONDS)
+
+    return Principal(id=user_id)
+
+
+async def get_current_user_id(token: Annotated[str | None, Depends(oauth2_scheme)]) -> UUID:
+    return _decode_user_id(token)
+
+
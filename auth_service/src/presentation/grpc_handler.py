@@ -1,46 +1,198 @@
 import hmac
+import json
 import logging
+from typing import AsyncIterator, Iterable
 from uuid import UUID
 
 import grpc
-from sqlalchemy import select
+from redis.asyncio import Redis
 from sqlalchemy.exc import SQLAlchemyError
 
+from auth_service.src.application.user_service import UserService
 from auth_service.src.infrastructure.config import settings
 from auth_service.src.infrastructure.database import async_session_factory
+from auth_service.src.infrastructure.existence_batcher import ExistenceBatcher
 from auth_service.src.infrastructure.generated import users_pb2, users_pb2_grpc
-from auth_service.src.infrastructure.models import UserDB
+from auth_service.src.infrastructure.redis import get_redis_client
+from auth_service.src.infrastructure.repositories.profile_cache import ProfileCache, build_profile_cache
+from auth_service.src.infrastructure.repositories.token_repository import TokenRepository
+from auth_service.src.infrastructure.repositories.user_repository import UserRepository
+from auth_service.src.infrastructure.user_existence_index import UserExistenceIndex, get_user_existence_index
 
 logger = logging.getLogger(__name__)
 
 
 class UsersServicer(users_pb2_grpc.UsersExternalServicer):
+    MAX_BATCH_SIZE = 500
+    MAX_SUMMARY_BATCH_SIZE = 300
+    # A summary carries at most a 1000-character bio and MAX_USER_SKILLS (50)
+    # skills, which stays under 20 KB even if every character takes four bytes
+    # in UTF-8.
+    MAX_SUMMARY_BYTES = 20 * 1024
+    MAX_SEND_MESSAGE_LENGTH = MAX_SUMMARY_BATCH_SIZE * MAX_SUMMARY_BYTES
+
+    def __init__(
+            self,
+            existence_batcher: ExistenceBatcher | None = None,
+            existence_index: UserExistenceIndex | None = None,
+            redis: Redis | None = None,
+            profile_cache: ProfileCache | None = None,
+    ):
+        self.redis = redis or get_redis_client()
+        self.profile_cache = profile_cache or build_profile_cache(self.redis)
+        self.existence_index = existence_index or get_user_existence_index()
+        self.existence_batcher = existence_batcher or ExistenceBatcher(
+            self._load_existing_ids,
+            window_seconds=settings.GRPC_EXISTENCE_BATCH_WINDOW_MS / 1000,
+            max_batch_size=settings.GRPC_EXISTENCE_BATCH_MAX_SIZE,
+        )
+
     async def GetUserExistence(
             self,
             request: users_pb2.UserRequest,
             context: grpc.aio.ServicerContext
     ) -> users_pb2.ExistenceResponse:
-        metadata = dict(context.invocation_metadata())
-        provided_token = metadata.get("x-service-token", "")
-        if not hmac.compare_digest(provided_token, settings.GRPC_SERVICE_TOKEN):
-            await context.abort(grpc.StatusCode.UNAUTHENTICATED, "Service authentication failed")
+        await self._authenticate(context)
 
         try:
             user_id = UUID(request.user_id)
         except ValueError:
             await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Invalid user id")
 
-        async with async_session_factory() as session:
-            try:
-                query = select(UserDB).where(UserDB.id == user_id)
-                result = await session.execute(query)
-                user = result.scalar_one_or_none()
+        try:
+            exists = await self.existence_batcher.load(user_id)
+        except SQLAlchemyError:
+            logger.exception("Database failure while checking user existence")
+            await context.abort(grpc.StatusCode.INTERNAL, "Internal service error")
+
+        self._audit_index([user_id], {user_id} if exists else set())
+        return users_pb2.ExistenceResponse(exists=exists)
+
+    async def GetUsersExistence(
+            self,
+            request: users_pb2.UsersRequest,
+            context: grpc.aio.ServicerContext
+    ) -> users_pb2.UsersExistenceResponse:
+        await self._authenticate(context)
+        return await self._resolve_batch(request, context)
+
+    async def StreamUsersExistence(
+            self,
+            request_iterator: AsyncIterator[users_pb2.UsersRequest],
+            context: grpc.aio.ServicerContext
+    ) -> AsyncIterator[users_pb2.UsersExistenceResponse]:
+        await self._authenticate(context)
+        async for request in request_iterator:
+            yield await self._resolve_batch(request, context)
+
+    async def GetUsersSummary(
+            self,
+            request: users_pb2.UsersRequest,
+            context: grpc.aio.ServicerContext
+    ) -> users_pb2.UsersSummaryResponse:
+        await self._authenticate(context)
+        user_ids = await self._parse_user_ids(request.user_ids, context, self.MAX_SUMMARY_BATCH_SIZE)
+
+        try:
+            async with async_session_factory() as session:
+                user_service = UserService(
+                    UserRepository(session),
+                    TokenRepository(self.redis),
+                    profile_cache=self.profile_cache,
+                )
+                profiles = await user_service.get_users_batch(user_ids)
+        except SQLAlchemyError:
+            logger.exception("Database failure while loading user summaries")
+            await context.abort(grpc.StatusCode.INTERNAL, "Internal service error")
+
+        return users_pb2.UsersSummaryResponse(
+            users=[
+                self._to_summary(raw_id, profile)
+                for raw_id, (_, profile) in zip(request.user_ids, profiles, strict=True)
+            ]
+        )
+
+    @staticmethod
+    def _to_summary(raw_id: str, profile: bytes | None) -> users_pb2.UserSummary:
+        if profile is None:
+            return users_pb2.UserSummary(user_id=raw_id, found=False)
+
+        user = json.loads(profile)
+        return users_pb2.UserSummary(
+            user_id=raw_id,
+            found=True,
+            username=user["username"],
+            bio=user["bio"],
+            followers_count=user["followers_count"],
+            following_count=user["following_count"],
+            skills=[
+                users_pb2.SkillSummary(
+                    slug=item["skill"]["slug"],
+                    name=item["skill"]["name"],
+                    group=item["skill"]["group"],
+                    level=item["level"],
+                )
+                for item in user["skills"]
+            ],
+        )
+
+    async def _resolve_batch(
+            self,
+            request: users_pb2.UsersRequest,
+            context: grpc.aio.ServicerContext
+    ) -> users_pb2.UsersExistenceResponse:
+        user_ids = await self._parse_user_ids(request.user_ids, context)
+
+        try:
+            existing_ids = await self._load_existing_ids(user_ids) if user_ids else set()
+        except SQLAlchemyError:
+            logger.exception("Database failure while checking users existence")
+            await context.abort(grpc.StatusCode.INTERNAL, "Internal service error")
+
+        self._audit_index(user_ids, existing_ids)
+        return users_pb2.UsersExistenceResponse(
+            users=[
+                users_pb2.UserExistence(user_id=raw_id, exists=user_id in existing_ids)
+                for raw_id, user_id in zip(request.user_ids, user_ids, strict=True)
+            ]
+        )
 
-                if user:
-                    return users_pb2.ExistenceResponse(exists=True)
+    def _audit_index(self, user_ids: list[UUID], existing_ids: set[UUID]) -> None:
+        # The index only learns about registrations through pub/sub, so it can
+        # lag the database; its answers are measured here but never returned.
+        if self.existence_index is None:
+            return
+        unique_ids = set(user_ids)
+        candidates = {user_id for user_id in unique_ids if self.existence_index.might_exist(user_id)}
+        self.existence_index.record_confirmed(len(candidates), len(candidates & existing_ids))
+        self.existence_index.record_stale(existing_ids - candidates)
 
-                return users_pb2.ExistenceResponse(exists=False)
+    @staticmethod
+    async def _load_existing_ids(user_ids: list[UUID]) -> set[UUID]:
+        async with async_session_factory() as session:
+            return await UserRepository(session).get_existing_ids(user_ids)
+
+    async def _parse_user_ids(
+            self,
+            raw_ids: Iterable[str],
+            context: grpc.aio.ServicerContext,
+            max_size: int | None = None,
+    ) -> list[UUID]:
+        raw_ids = list(raw_ids)
+        max_size = max_size or self.MAX_BATCH_SIZE
+        if len(raw_ids) > max_size:
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                f"At most {max_size} user ids are allowed per request",
+            )
+        try:
+            return [UUID(raw_id) for raw_id in raw_ids]
+        except ValueError:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Invalid user id")
 
-            except SQLAlchemyError:
-                logger.exception("Database failure while checking user existence")
-                await context.abort(grpc.StatusCode.INTERNAL, "Internal service error")
+    @staticmethod
+    async def _authenticate(context: grpc.aio.ServicerContext) -> None:
+        metadata = dict(context.invocation_metadata())
+        provided_token = metadata.get("x-service-token", "")
+        if not hmac.compare_digest(provided_token, settings.GRPC_SERVICE_TOKEN):
+            await context.abort(grpc.StatusCode.UNAUTHENTICATED, "Service authentication failed")
@@ -7,6 +7,7 @@ from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator, mo
 
 from auth_service.src.infrastructure.models import SkillLevel
 
+MAX_USER_SKILLS = 50
 
 class UserAuthBase(BaseModel):
     email: EmailStr
@@ -73,6 +74,16 @@ class SkillCreate(BaseModel):
         return value.strip().lower()
 
 
+class SkillImportReport(BaseModel):
+    received: int
+    invalid: int
+    inserted: int
+    updated: int
+    unchanged: int
+    conflicts: int
+    errors: list[str]
+
+
 class UserSkillRead(BaseModel):
     skill: SkillRead
     level: SkillLevel
@@ -86,7 +97,7 @@ class UserSkillInput(BaseModel):
 
 
 class UserSkillsReplace(BaseModel):
-    skills: list[UserSkillInput] = Field(default_factory=list, max_length=50)
+    skills: list[UserSkillInput] = Field(default_factory=list, max_length=MAX_USER_SKILLS)
 
     @model_validator(mode="after")
     def validate_unique_skills(self):
@@ -114,6 +125,29 @@ class UserData(UserRead, UserAuthBase):
     created_at: datetime
 
 
+class UserPage(BaseModel):
+    items: list[UserRead]
+    next_cursor: str | None = None
+
+
+class UserBatchRequest(BaseModel):
+    ids: list[UUID] = Field(min_length=1, max_length=300)
+
+
+class UserBatchItem(BaseModel):
+    id: UUID
+    found: bool
+    user: UserRead | None = None
+
+
+class UserBatchResponse(BaseModel):
+    items: list[UserBatchItem]
+
+
+class Principal(BaseModel):
+    id: UUID
+
+
 class Token(BaseModel):
     access_token: str
     refresh_token: str
@@ -1,4 +1,8 @@
+import base64
+import json
+from datetime import datetime
 from typing import Any
+from uuid import UUID
 
 from sqlalchemy import inspect
 from sqlalchemy.exc import NoInspectionAvailable
@@ -49,3 +53,32 @@ def _is_unloaded(obj: Any, attribute_name: str) -> bool:
         return attribute_name in inspect(obj).unloaded
     except NoInspectionAvailable:
         return False
+
+
+def encode_user_batch(results: list[tuple[UUID, bytes | None]]) -> bytes:
+    # Profiles are already rendered JSON, so they are spliced in verbatim.
+    items = [
+        b'{"id":"%s","found":true,"user":%s}' % (str(user_id).encode(), profile)
+        if profile is not None
+        else b'{"id":"%s","found":false,"user":null}' % str(user_id).encode()
+        for user_id, profile in results
+    ]
+    return b'{"items":[' + b",".join(items) + b"]}"
+
+
+def encode_follow_cursor(followed_at: datetime, user_id: UUID) -> str:
+    payload = json.dumps({"t": followed_at.isoformat(), "id": str(user_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_follow_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        followed_at = datetime.fromisoformat(payload["t"])
+        # subscriptions.created_at is naive, so only a tampered cursor has an offset.
+        if followed_at.tzinfo is not None:
+            raise ValueError("Cursor timestamp must be naive")
+        return followed_at, UUID(payload["id"])
+    except (ValueError, TypeError, KeyError) as exc:
+        raise ValueError("Invalid cursor") from exc
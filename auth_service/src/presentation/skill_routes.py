@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 
 from auth_service.src.application.skill_service import SkillService
-from auth_service.src.presentation.dependencies import get_current_user, get_skill_service
-from auth_service.src.presentation.schemas import SkillCreate, SkillRead, UserData
+from auth_service.src.presentation.dependencies import get_current_principal, get_skill_service
+from auth_service.src.presentation.schemas import Principal, SkillCreate, SkillRead
 
 router = APIRouter()
 
+EXPORT_CHUNK_LINES = 500
+
 
 @router.get("/", response_model=list[SkillRead])
 async def list_skills(
@@ -23,10 +26,25 @@ async def list_skills(
     )
 
 
+@router.get("/export", response_class=StreamingResponse)
+async def export_skills(service: SkillService = Depends(get_skill_service)):
+    async def lines():
+        chunk = []
+        async for skill in service.export_skills():
+            chunk.append(skill.model_dump_json() + "\n")
+            if len(chunk) == EXPORT_CHUNK_LINES:
+                yield "".join(chunk)
+                chunk.clear()
+        if chunk:
+            yield "".join(chunk)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.post("/", response_model=SkillRead, status_code=status.HTTP_201_CREATED)
 async def create_skill(
     payload: SkillCreate,
-    _: UserData = Depends(get_current_user),
+    _: Principal = Depends(get_current_principal),
     service: SkillService = Depends(get_skill_service),
 ):
     return await service.create_skill(payload)
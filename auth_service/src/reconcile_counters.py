@@ -0,0 +1,42 @@
+import argparse
+import asyncio
+import logging
+
+from auth_service.src.infrastructure.database import async_session_factory, engine
+from auth_service.src.infrastructure.repositories.user_repository import UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def reconcile_follow_counters(batch_size: int = 1000) -> int:
+    fixed_total = 0
+    after_id = None
+
+    while True:
+        async with async_session_factory() as session:
+            repository = UserRepository(session)
+            fixed, after_id = await repository.reconcile_follow_counters(after_id, batch_size)
+            await repository.commit()
+
+        fixed_total += fixed
+        if after_id is None:
+            break
+
+    logger.info("Reconciled follow counters for %s users", fixed_total)
+    return fixed_total
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Backfill and reconcile users.followers_count/following_count")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    try:
+        await reconcile_follow_counters(args.batch_size)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
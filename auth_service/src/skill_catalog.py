@@ -0,0 +1,102 @@
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import sys
+from typing import IO, Iterator
+
+from auth_service.src.application.skill_service import SkillImportRow, SkillService
+from auth_service.src.infrastructure.database import async_session_factory, engine
+from auth_service.src.infrastructure.redis import close_redis_pool, get_redis_client
+from auth_service.src.infrastructure.repositories.profile_cache import build_profile_cache
+from auth_service.src.infrastructure.repositories.skill_repository import SkillRepository
+from auth_service.src.infrastructure.repositories.user_repository import UserRepository
+from auth_service.src.presentation.schemas import SkillImportReport
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ["id", "name", "slug", "group"]
+
+
+def read_rows(file: IO[str], file_format: str) -> Iterator[SkillImportRow]:
+    # Rows are yielded one at a time so the file is never held in memory;
+    # undecodable lines are passed through and reported as invalid rows.
+    if file_format == "csv":
+        reader = csv.DictReader(file)
+        for row in reader:
+            # Empty cells fall back to the schema defaults.
+            yield reader.line_num, {key: value for key, value in row.items() if key and value}
+        return
+
+    for line, raw in enumerate(file, start=1):
+        if not raw.strip():
+            continue
+        try:
+            yield line, json.loads(raw)
+        except json.JSONDecodeError:
+            yield line, raw.strip()
+
+
+async def import_catalog(file: IO[str], file_format: str) -> SkillImportReport:
+    async with async_session_factory() as session:
+        service = SkillService(
+            SkillRepository(session),
+            UserRepository(session),
+            build_profile_cache(get_redis_client()),
+        )
+        report = await service.import_skills(read_rows(file, file_format))
+
+    logger.info(
+        "Imported skills: %s inserted, %s updated, %s unchanged, %s conflicts, %s invalid",
+        report.inserted, report.updated, report.unchanged, report.conflicts, report.invalid,
+    )
+    return report
+
+
+async def export_catalog(file: IO[str], file_format: str) -> int:
+    writer = csv.DictWriter(file, FIELDS) if file_format == "csv" else None
+    if writer is not None:
+        writer.writeheader()
+
+    exported = 0
+    async with async_session_factory() as session:
+        service = SkillService(SkillRepository(session), UserRepository(session))
+        async for skill in service.export_skills():
+            if writer is not None:
+                writer.writerow(skill.model_dump(mode="json"))
+            else:
+                file.write(skill.model_dump_json() + "\n")
+            exported += 1
+
+    logger.info("Exported %s skills", exported)
+    return exported
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Bulk import and export of the skills catalog")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="merge skills from a file by slug")
+    import_parser.add_argument("path", help="CSV or NDJSON file with name, slug and group; '-' for stdin")
+    export_parser = commands.add_parser("export", help="write the whole catalog ordered by slug")
+    export_parser.add_argument("path", nargs="?", default="-", help="output file; '-' for stdout")
+    for command_parser in (import_parser, export_parser):
+        command_parser.add_argument("--format", choices=["csv", "ndjson"], default="ndjson")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "import":
+            with sys.stdin if args.path == "-" else open(args.path, newline="", encoding="utf-8") as file:
+                report = await import_catalog(file, args.format)
+            print(report.model_dump_json(indent=2))
+        else:
+            with sys.stdout if args.path == "-" else open(args.path, "w", newline="", encoding="utf-8") as file:
+                await export_catalog(file, args.format)
+    finally:
+        await close_redis_pool()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
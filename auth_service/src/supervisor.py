@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+from multiprocessing.process import BaseProcess
+from typing import Callable
+
+import uvicorn
+
+from auth_service.src.grpc_main import serve_grpc
+from auth_service.src.infrastructure.config import settings
+from auth_service.src.infrastructure.database import engine
+from auth_service.src.infrastructure.password_hasher import size_password_hasher
+from auth_service.src.infrastructure.redis import close_redis_pool
+from auth_service.src.main import app
+
+logger = logging.getLogger(__name__)
+
+REUSE_PORT_SUPPORTED = hasattr(socket, "SO_REUSEPORT")
+MIN_WORKER_UPTIME_SECONDS = 1.0
+
+
+def bind_http_socket(host: str, port: int, reuse_port: bool) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    return sock
+
+
+def _detach_from_terminal() -> None:
+    # Ctrl+C reaches only the supervisor, which then stops every worker once;
+    # a second signal would make uvicorn skip draining.
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+
+
+def run_http_worker(shared_socket: socket.socket | None, hash_workers: int) -> None:
+    _detach_from_terminal()
+    size_password_hasher(hash_workers)
+    sock = shared_socket or bind_http_socket(settings.APP_HOST, settings.APP_PORT, reuse_port=True)
+    config = uvicorn.Config(
+        app,
+        reload=False,
+        log_level=settings.LOG_LEVEL,
+        timeout_graceful_shutdown=settings.SHUTDOWN_GRACE_SECONDS,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def run_grpc_worker(uds_path: str | None) -> None:
+    _detach_from_terminal()
+    logging.basicConfig(level=settings.LOG_LEVEL.upper())
+    asyncio.run(_serve_grpc_until_stopped(uds_path))
+
+
+async def _serve_grpc_until_stopped(uds_path: str | None) -> None:
+    loop = asyncio.get_running_loop()
+    task = asyncio.create_task(serve_grpc(settings.GRPC_PORT, uds_path=uds_path, grace=settings.SHUTDOWN_GRACE_SECONDS))
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, task.cancel)
+
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await close_redis_pool()
+        await engine.dispose()
+
+
+class Supervisor:
+    def __init__(self, http_workers: int, grpc_workers: int, grace_seconds: float):
+        self.http_workers = http_workers
+        self.grpc_workers = grpc_workers if REUSE_PORT_SUPPORTED else 1
+        self.grace_seconds = grace_seconds
+        # Every HTTP worker owns a bcrypt pool, so the cores are split between
+        # them unless PASSWORD_HASH_WORKERS sets the per-worker size.
+        self.hash_workers = settings.PASSWORD_HASH_WORKERS or max(1, (os.cpu_count() or 1) // http_workers)
+        self.context = multiprocessing.get_context("spawn")
+        self.workers: dict[str, tuple[BaseProcess, Callable, tuple, float]] = {}
+        self.stopping = False
+        self.exit_code = 0
+        self._http_socket: socket.socket | None = None
+
+    def run(self) -> int:
+        if not REUSE_PORT_SUPPORTED:
+            self._http_socket = bind_http_socket(settings.APP_HOST, settings.APP_PORT, reuse_port=False)
+
+        for index in range(self.http_workers):
+            self._spawn(f"http-{index}", run_http_worker, (self._http_socket, self.hash_workers))
+        for index in range(self.grpc_workers):
+            # Only one process can own the Unix socket path.
+            self._spawn(f"grpc-{index}", run_grpc_worker, (settings.GRPC_UDS_PATH if index == 0 else None,))
+
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        logger.info(
+            "Supervising %s HTTP workers with %s password hashing processes each and %s gRPC workers",
+            self.http_workers,
+            self.hash_workers,
+            self.grpc_workers,
+        )
+
+        while not self.stopping:
+            self._restart_exited_workers()
+            time.sleep(0.5)
+
+        self._shutdown()
+        return self.exit_code
+
+    def _spawn(self, name: str, target: Callable, args: tuple) -> None:
+        process = self.context.Process(target=target, args=args, name=name)
+        process.start()
+        self.workers[name] = (process, target, args, time.monotonic())
+
+    def _restart_exited_workers(self) -> None:
+        for name, (process, target, args, started_at) in list(self.workers.items()):
+            if process.is_alive() or self.stopping:
+                continue
+            if time.monotonic() - started_at < MIN_WORKER_UPTIME_SECONDS:
+                logger.error("Worker %s exited with %s right after start, shutting down", name, process.exitcode)
+                self.exit_code = 1
+                self.stopping = True
+                return
+            logger.warning("Worker %s exited with %s, restarting", name, process.exitcode)
+            self._spawn(name, target, args)
+
+    def _request_stop(self, signum, frame) -> None:
+        logger.info("Received %s, draining workers", signal.Signals(signum).name)
+        self.stopping = True
+
+    def _shutdown(self) -> None:
+        processes = [process for process, *_ in self.workers.values()]
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+        deadline = time.monotonic() + self.grace_seconds + 5
+        for process in processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning("Worker %s did not stop in time, killing it", process.name)
+                process.kill()
+                process.join()
+
+        if self._http_socket is not None:
+            self._http_socket.close()
+
+
+def main() -> None:
+    logging.basicConfig(level=settings.LOG_LEVEL.upper())
+    supervisor = Supervisor(settings.HTTP_WORKERS, settings.GRPC_WORKERS, settings.SHUTDOWN_GRACE_SECONDS)
+    sys.exit(supervisor.run())
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,7 @@ import asyncio
 import os
 from pathlib import Path
 from typing import AsyncGenerator
-from unittest.mock import AsyncMock
 
-import pytest
 import pytest_asyncio
 from alembic import command
 from alembic.config import Config
@@ -111,11 +109,6 @@ async def client(db_session: AsyncSession, redis_client: Redis) -> AsyncGenerato
     app.dependency_overrides.clear()
 
 
-@pytest.fixture(autouse=True)
-def mock_email_client(monkeypatch):
-    monkeypatch.setattr("auth_service.src.application.login_service.send_verification_email", AsyncMock())
-
-
 @pytest_asyncio.fixture
 async def verified_user(client: AsyncClient, db_session: AsyncSession):
     payload = {
@@ -1,4 +1,8 @@
+from contextlib import asynccontextmanager
+
 from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 async def login_user(client: AsyncClient, email: str, password: str, fingerprint: str = "test-device") -> dict:
@@ -9,3 +13,18 @@ async def login_user(client: AsyncClient, email: str, password: str, fingerprint
     )
     assert response.status_code == 200, response.text
     return response.json()
+
+
+@asynccontextmanager
+async def capture_sql(session: AsyncSession):
+    statements: list[str] = []
+    sync_engine = (await session.connection()).sync_engine
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
@@ -1,13 +1,23 @@
 import asyncio
 import json
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
 
 import pytest
+from redis.cluster import key_slot
 from sqlalchemy import inspect, select
 
+from auth_service.src.infrastructure.config import settings
 from auth_service.src.infrastructure.exceptions import TokenInvalidError
-from auth_service.src.infrastructure.models import UserDB
+from auth_service.src.infrastructure.models import EmailOutbox, UserDB
+from auth_service.src.infrastructure.repositories.rate_limiter import RateLimiter
 from auth_service.src.infrastructure.repositories.token_repository import TokenRepository
-from auth_service.src.infrastructure.security import create_token, decode_access_token
+from auth_service.src.infrastructure.security import (
+    create_refresh_token,
+    create_token,
+    decode_access_token,
+    refresh_token_owner,
+)
 from auth_service.tests.helpers import login_user
 
 
@@ -26,15 +36,30 @@ async def test_auth_migrations_create_expected_schema(db_session):
             "user_skills_indexes": {
                 item["name"] for item in inspector.get_indexes("user_skills")
             },
+            "subscriptions_indexes": {
+                item["name"] for item in inspector.get_indexes("subscriptions")
+            },
+            "users_columns": {
+                item["name"] for item in inspector.get_columns("users")
+            },
+            "email_outbox_indexes": {
+                item["name"] for item in inspector.get_indexes("email_outbox")
+            },
         }
 
     connection = await db_session.connection()
     schema = await connection.run_sync(inspect_schema)
 
-    assert {"users", "subscriptions", "skills", "user_skills", "alembic_version"} <= schema["tables"]
+    assert {"users", "subscriptions", "skills", "user_skills", "email_outbox", "alembic_version"} <= schema["tables"]
     assert "ck_subscriptions_not_self" in schema["subscriptions_checks"]
     assert "ck_user_skills_level" in schema["user_skills_checks"]
     assert "ix_user_skills_skill_id" in schema["user_skills_indexes"]
+    assert {
+        "ix_subscriptions_author_created",
+        "ix_subscriptions_subscriber_created",
+    } <= schema["subscriptions_indexes"]
+    assert {"followers_count", "following_count"} <= schema["users_columns"]
+    assert "ix_email_outbox_pending" in schema["email_outbox_indexes"]
 
 
 @pytest.mark.asyncio
@@ -52,8 +77,12 @@ async def test_register_normalizes_user_and_requires_unique_identity(client, db_
     assert user.email == "mixedcase@test.com"
     assert not user.is_verified
 
+    queued = (await db_session.execute(select(EmailOutbox))).scalars().all()
+    assert [(message.recipient, message.sent_at) for message in queued] == [("mixedcase@test.com", None)]
+
     duplicate = await client.post("/auth/register", json={**payload, "email": "mixedcase@test.com"})
     assert duplicate.status_code == 409
+    assert len((await db_session.execute(select(EmailOutbox))).scalars().all()) == 1
 
 
 @pytest.mark.asyncio
@@ -78,12 +107,15 @@ async def test_login_requires_verified_email(client):
         json={"email": "verify@test.com", "username": "verify_user", "password": "Strong_password-33"},
     )
 
-    response = await client.post(
-        "/auth/login",
-        data={"username": "verify@test.com", "password": "Strong_password-33"},
-    )
-    assert response.status_code == 401
-    assert response.json()["detail"] == "Email not verified"
+    # The correct password clears the attempt budget, so waiting for the
+    # verification email never locks the account out.
+    for _ in range(6):
+        response = await client.post(
+            "/auth/login",
+            data={"username": "verify@test.com", "password": "Strong_password-33"},
+        )
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Email not verified"
 
 
 @pytest.mark.asyncio
@@ -95,8 +127,10 @@ async def test_refresh_rotation_rejects_replay_and_stores_only_token_hash(client
     raw_refresh = tokens["refresh_token"]
     digest = repository._digest(raw_refresh)
 
-    assert await redis_client.get(f"refresh_token:{raw_refresh}") is None
-    assert json.loads(await redis_client.get(f"refresh_token:{digest}"))["user_id"] == str(user.id)
+    assert raw_refresh.startswith(f"{user.id.hex}.")
+    assert not await redis_client.exists(f"session:{{{user.id}}}:{raw_refresh}", f"refresh_token:{raw_refresh}")
+    assert await redis_client.hgetall(f"session:{{{user.id}}}:{digest}") == {"f": "laptop"}
+    assert await redis_client.zscore(f"sessions:{{{user.id}}}", digest) is not None
 
     refreshed = await client.post(
         "/auth/refresh",
@@ -201,6 +235,146 @@ async def test_logout_all_revokes_every_refresh_session(client, verified_user):
         assert refresh.status_code == 401
 
 
+@pytest.mark.asyncio
+async def test_session_index_prunes_expired_sessions_on_write(redis_client):
+    repository = TokenRepository(redis_client)
+    user_id = str(uuid4())
+    first, second = create_refresh_token(user_id), create_refresh_token(user_id)
+    await redis_client.zadd(f"sessions:{{{user_id}}}", {"expired-digest": 1})
+
+    await repository.save_token(user_id, first, "phone", ttl=60)
+    assert await repository.rotate_token(user_id, first, second, "phone", ttl=120)
+
+    second_digest = repository._digest(second)
+    assert await redis_client.zrange(f"sessions:{{{user_id}}}", 0, -1) == [second_digest]
+    assert not await redis_client.exists(f"session:{{{user_id}}}:{repository._digest(first)}")
+    assert 60 < await redis_client.ttl(f"sessions:{{{user_id}}}") <= 120
+    assert len(second_digest) == 24
+
+
+def test_session_keys_of_one_user_share_a_cluster_slot():
+    user_id = str(uuid4())
+    refresh_token = create_refresh_token(user_id)
+    token_digest = TokenRepository._digest(refresh_token)
+
+    assert refresh_token_owner(refresh_token) == user_id
+    assert refresh_token_owner("legacy-refresh-token") is None
+    assert refresh_token_owner(f"{'z' * 32}.secret") is None
+    assert key_slot(TokenRepository._session_key(user_id, token_digest).encode()) == key_slot(
+        TokenRepository._index_key(user_id).encode()
+    )
+
+
+@pytest.mark.asyncio
+async def test_revoke_token_only_deletes_sessions_of_the_caller(redis_client):
+    repository = TokenRepository(redis_client)
+    owner_id, other_id = str(uuid4()), str(uuid4())
+    refresh_token = create_refresh_token(owner_id)
+    await repository.save_token(owner_id, refresh_token, "phone", ttl=600)
+
+    assert await repository.revoke_token(other_id, refresh_token) == "foreign"
+    assert await repository.revoke_token(owner_id, create_refresh_token(owner_id)) == "missing"
+    assert await repository.revoke_token(owner_id, refresh_token) == "revoked"
+    assert await repository.revoke_token(owner_id, refresh_token) == "missing"
+    assert not await redis_client.exists(f"sessions:{{{owner_id}}}")
+
+
+@pytest.mark.asyncio
+async def test_logout_all_racing_with_rotations_leaves_no_sessions_behind(redis_client):
+    repository = TokenRepository(redis_client)
+    user_id = str(uuid4())
+    tokens = [create_refresh_token(user_id) for _ in range(20)]
+    for refresh_token in tokens:
+        await repository.save_token(user_id, refresh_token, "phone", ttl=600)
+
+    async def rotate_repeatedly(refresh_token):
+        for _ in range(10):
+            new_token = create_refresh_token(user_id)
+            if not await repository.rotate_token(user_id, refresh_token, new_token, "phone", ttl=600):
+                return
+            refresh_token = new_token
+            await asyncio.sleep(0)
+
+    async def revoke_midway():
+        await asyncio.sleep(0)
+        await repository.delete_all_user_tokens(user_id)
+
+    await asyncio.gather(*(rotate_repeatedly(refresh_token) for refresh_token in tokens), revoke_midway())
+
+    assert await redis_client.keys(f"session:{{{user_id}}}:*") == []
+    assert not await redis_client.exists(f"sessions:{{{user_id}}}")
+
+
+@pytest.mark.asyncio
+async def test_sessions_issued_before_owner_prefix_are_migrated_on_refresh(
+        client, redis_client, verified_user, monkeypatch
+):
+    _, user = verified_user
+    monkeypatch.setattr(settings, "LEGACY_SESSIONS_UNTIL", datetime.now(timezone.utc) + timedelta(days=1))
+    repository = TokenRepository(redis_client)
+    legacy_digest = repository._legacy_digest("legacy-refresh-token")
+    await redis_client.setex(
+        f"refresh_token:{legacy_digest}",
+        600,
+        json.dumps({"user_id": str(user.id), "fingerprint": "tablet"}),
+    )
+    await redis_client.sadd(f"user_sessions:{user.id}", legacy_digest)
+    await repository.save_token(str(user.id), create_refresh_token(user.id), "desktop", ttl=600)
+
+    assert (await repository.get_token_data("legacy-refresh-token"))["user_id"] == str(user.id)
+
+    refreshed = await client.post(
+        "/auth/refresh",
+        json={"refresh_token": "legacy-refresh-token"},
+        headers={"X-Client-Fingerprint": "tablet"},
+    )
+    assert refreshed.status_code == 200
+    assert not await redis_client.exists(f"refresh_token:{legacy_digest}")
+    assert not await redis_client.sismember(f"user_sessions:{user.id}", legacy_digest)
+
+    new_digest = repository._digest(refreshed.json()["refresh_token"])
+    assert await redis_client.hget(f"session:{{{user.id}}}:{new_digest}", "f") == "tablet"
+
+    replay = await client.post(
+        "/auth/refresh",
+        json={"refresh_token": "legacy-refresh-token"},
+        headers={"X-Client-Fingerprint": "tablet"},
+    )
+    assert replay.status_code == 401
+
+    await redis_client.setex(f"refresh_token:{legacy_digest}", 600, json.dumps({"user_id": str(user.id)}))
+    await redis_client.sadd(f"user_sessions:{user.id}", legacy_digest)
+    await repository.delete_all_user_tokens(str(user.id))
+
+    assert await redis_client.keys("session*") == []
+    assert await redis_client.keys("*refresh_token*") == []
+    assert not await redis_client.exists(f"user_sessions:{user.id}")
+
+
+@pytest.mark.asyncio
+async def test_sessions_issued_before_owner_prefix_are_ignored_after_the_migration(
+        client, redis_client, verified_user, monkeypatch
+):
+    _, user = verified_user
+    monkeypatch.setattr(settings, "LEGACY_SESSIONS_UNTIL", datetime.now(timezone.utc) - timedelta(seconds=1))
+    repository = TokenRepository(redis_client)
+    legacy_digest = repository._legacy_digest("legacy-refresh-token")
+    await redis_client.setex(
+        f"refresh_token:{legacy_digest}",
+        600,
+        json.dumps({"user_id": str(user.id), "fingerprint": "tablet"}),
+    )
+
+    assert await repository.get_token_data("legacy-refresh-token") is None
+    assert await repository.revoke_token(str(user.id), "legacy-refresh-token") == "missing"
+    refreshed = await client.post(
+        "/auth/refresh",
+        json={"refresh_token": "legacy-refresh-token"},
+        headers={"X-Client-Fingerprint": "tablet"},
+    )
+    assert refreshed.status_code == 401
+
+
 @pytest.mark.asyncio
 async def test_rate_limiter_returns_429_on_fifth_failed_login(client):
     for attempt in range(1, 6):
@@ -217,3 +391,33 @@ async def test_access_token_rejects_wrong_token_type():
     verification_token = create_token("00000000-0000-0000-0000-000000000001", "verification")
     with pytest.raises(TokenInvalidError):
         decode_access_token(verification_token, token_type="auth")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("algorithm", ["fixed_window", "gcra"])
+async def test_rate_limiter_hit_checks_and_consumes_budget_atomically(redis_client, algorithm):
+    limiter = RateLimiter(redis_client, algorithm)
+
+    results = await asyncio.gather(*(limiter.hit("burst", limit=5, window_seconds=60) for _ in range(8)))
+
+    assert sum(result.allowed for result in results) == 5
+    assert sorted(result.remaining for result in results if result.allowed) == [0, 1, 2, 3, 4]
+    rejected = [result for result in results if not result.allowed]
+    assert all(0 < result.retry_after_ms <= 60_000 for result in rejected)
+
+    await limiter.reset("burst")
+    assert (await limiter.hit("burst", limit=5, window_seconds=60)).remaining == 4
+
+
+@pytest.mark.asyncio
+async def test_gcra_rate_limiter_refills_gradually(redis_client):
+    limiter = RateLimiter(redis_client, "gcra")
+
+    for _ in range(2):
+        assert (await limiter.hit("smooth", limit=2, window_seconds=0.2)).allowed
+    assert not (await limiter.hit("smooth", limit=2, window_seconds=0.2)).allowed
+
+    await asyncio.sleep(0.12)
+    refilled = await limiter.hit("smooth", limit=2, window_seconds=0.2)
+    assert refilled.allowed
+    assert refilled.remaining == 0
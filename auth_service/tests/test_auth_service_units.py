@@ -1,11 +1,14 @@
+from types import SimpleNamespace
 from uuid import uuid4
 
 import pytest
-from fastapi import BackgroundTasks, HTTPException
+from fastapi import HTTPException
 from sqlalchemy.exc import IntegrityError
 
 from auth_service.src.application.login_service import AuthService
-from auth_service.src.infrastructure.exceptions import UserDoesNotExist
+from auth_service.src.infrastructure.exceptions import PasswordHasherBusy, UserDoesNotExist
+from auth_service.src.infrastructure.password_hasher import PasswordHasher
+from auth_service.src.infrastructure.repositories.rate_limiter import RateLimitResult
 from auth_service.src.presentation.schemas import UserCreate
 
 
@@ -17,12 +20,17 @@ class NoopTokenRepository:
         return None
 
 
-class NoopRateLimiter:
-    async def check_limit(self, key, limit):
+class NoopEmailOutbox:
+    def enqueue(self, recipient, subject, body):
         return None
 
-    async def increment(self, key, window_seconds):
-        return 1, window_seconds
+
+class NoopRateLimiter:
+    async def hit(self, key, limit, window_seconds, cost=1):
+        return RateLimitResult(True, limit, limit - cost, 0, int(window_seconds * 1000))
+
+    async def reset(self, key):
+        return None
 
 
 @pytest.mark.asyncio
@@ -37,7 +45,7 @@ async def test_register_rolls_back_on_database_race():
             return None
 
         def create_instance(self, user_data, hashed_password, is_verified):
-            return object()
+            return SimpleNamespace(id=uuid4(), email=user_data.email)
 
         async def add(self, user):
             return None
@@ -52,18 +60,63 @@ async def test_register_rolls_back_on_database_race():
             self.rolled_back = True
 
     repository = RacingUserRepository()
-    service = AuthService(repository, NoopTokenRepository(), NoopRateLimiter())
+    service = AuthService(repository, NoopTokenRepository(), NoopRateLimiter(), NoopEmailOutbox())
 
     with pytest.raises(HTTPException) as conflict:
         await service.register_user(
             UserCreate(email="race@test.com", username="race_user", password="Strong_password-33"),
-            BackgroundTasks(),
         )
 
     assert conflict.value.status_code == 409
     assert repository.rolled_back is True
 
 
+@pytest.mark.asyncio
+async def test_register_queues_verification_email_before_the_user_commit():
+    events = []
+
+    class UserRepository:
+        async def get_by_email(self, email):
+            return None
+
+        async def get_by_username(self, username):
+            return None
+
+        def create_instance(self, user_data, hashed_password, is_verified):
+            return SimpleNamespace(
+                id=uuid4(),
+                email=user_data.email,
+                username=user_data.username,
+                bio=None,
+                followers_count=0,
+                following_count=0,
+                skill_links=[],
+            )
+
+        async def add(self, user):
+            events.append("add")
+
+        async def commit(self):
+            events.append("commit")
+
+        async def refresh(self, user):
+            return None
+
+    class EmailOutbox:
+        def enqueue(self, recipient, subject, body):
+            events.append(("enqueue", recipient, "/auth/verify?token=" in body))
+
+    class Hasher:
+        async def hash(self, password):
+            return "hash"
+
+    service = AuthService(UserRepository(), NoopTokenRepository(), NoopRateLimiter(), EmailOutbox(), Hasher())
+
+    await service.register_user(UserCreate(email="queued@test.com", username="queued_user", password="Strong_password-33"))
+
+    assert events == [("enqueue", "queued@test.com", True), "add", "commit"]
+
+
 @pytest.mark.asyncio
 async def test_verify_user_maps_invalid_missing_and_success_cases():
     class UserRepository:
@@ -83,7 +136,7 @@ async def test_verify_user_maps_invalid_missing_and_success_cases():
     from auth_service.src.infrastructure.security import create_token
 
     repository = UserRepository()
-    service = AuthService(repository, NoopTokenRepository(), NoopRateLimiter())
+    service = AuthService(repository, NoopTokenRepository(), NoopRateLimiter(), NoopEmailOutbox())
     user_id = uuid4()
 
     with pytest.raises(HTTPException) as invalid:
@@ -106,24 +159,150 @@ async def test_verify_user_maps_invalid_missing_and_success_cases():
 @pytest.mark.asyncio
 async def test_logout_rejects_missing_and_foreign_refresh_tokens():
     class TokenRepository:
-        def __init__(self, raw_data):
-            self.raw_data = raw_data
-            self.deleted = False
-
-        async def get_token_data(self, refresh_token):
-            return self.raw_data
+        def __init__(self, result):
+            self.result = result
+            self.calls = []
 
-        async def delete_token(self, user_id, refresh_token):
-            self.deleted = True
+        async def revoke_token(self, user_id, refresh_token):
+            self.calls.append((user_id, refresh_token))
+            return self.result
 
     user_id = uuid4()
 
-    missing_service = AuthService(object(), TokenRepository(None), NoopRateLimiter())
+    missing_service = AuthService(object(), TokenRepository("missing"), NoopRateLimiter(), NoopEmailOutbox())
     with pytest.raises(HTTPException) as missing:
         await missing_service.logout("refresh", user_id)
     assert missing.value.status_code == 401
 
-    foreign_service = AuthService(object(), TokenRepository(f'{{"user_id": "{uuid4()}"}}'), NoopRateLimiter())
+    foreign_service = AuthService(object(), TokenRepository("foreign"), NoopRateLimiter(), NoopEmailOutbox())
     with pytest.raises(HTTPException) as foreign:
         await foreign_service.logout("refresh", user_id)
     assert foreign.value.status_code == 409
+
+    owner_repository = TokenRepository("revoked")
+    owner_service = AuthService(object(), owner_repository, NoopRateLimiter(), NoopEmailOutbox())
+    assert await owner_service.logout("refresh", user_id) == {"msg": "Logged out successfully"}
+    assert owner_repository.calls == [(str(user_id), "refresh")]
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_round_trip_runs_in_process_pool():
+    hasher = PasswordHasher(executor_kind="process", max_workers=1)
+    try:
+        hashed = await hasher.hash("Strong_password-33")
+
+        assert await hasher.verify("Strong_password-33", hashed) is True
+        assert await hasher.verify("Wrong_password-33", hashed) is False
+        assert hasher.pending == 0
+        assert hasher._get_executor()._mp_context.get_start_method() == "spawn"
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_inline_password_hasher_honours_max_pending():
+    hasher = PasswordHasher(executor_kind="inline", max_pending=1)
+    hasher._pending = 1
+
+    with pytest.raises(PasswordHasherBusy):
+        await hasher.hash("Strong_password-33")
+
+    hasher._pending = 0
+    assert await hasher.verify("Strong_password-33", await hasher.hash("Strong_password-33")) is True
+    assert hasher.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_saturated_password_hasher_maps_to_service_unavailable():
+    class BusyHasher:
+        async def hash(self, password):
+            raise PasswordHasherBusy
+
+        async def verify(self, plain_password, hashed_password):
+            raise PasswordHasherBusy
+
+    class UserRepository:
+        async def get_by_email(self, email):
+            if email == "known@test.com":
+                return SimpleNamespace(id=uuid4(), hashed_password="hash", is_verified=True)
+            return None
+
+        async def get_by_username(self, username):
+            return None
+
+    service = AuthService(UserRepository(), NoopTokenRepository(), NoopRateLimiter(), NoopEmailOutbox(), BusyHasher())
+
+    with pytest.raises(HTTPException) as login:
+        await service.authenticate_user("known@test.com", "Strong_password-33", None)
+    assert login.value.status_code == 503
+    assert login.value.headers == {"Retry-After": "1"}
+
+    with pytest.raises(HTTPException) as register:
+        await service.register_user(
+            UserCreate(email="new@test.com", username="new_user", password="Strong_password-33"),
+        )
+    assert register.value.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_login_spends_one_rate_limit_call_per_failed_attempt():
+    class CountingRateLimiter:
+        def __init__(self, remaining):
+            self.remaining = remaining
+            self.calls = []
+
+        async def hit(self, key, limit, window_seconds, cost=1):
+            self.calls.append(("hit", key))
+            self.remaining -= cost
+            return RateLimitResult(self.remaining >= 0, limit, max(self.remaining, 0), 0 if self.remaining > 0 else 42_000, 0)
+
+        async def reset(self, key):
+            self.calls.append(("reset", key))
+
+    class MissingUserRepository:
+        async def get_by_email(self, email):
+            return None
+
+    limiter = CountingRateLimiter(remaining=2)
+    service = AuthService(MissingUserRepository(), NoopTokenRepository(), limiter, NoopEmailOutbox())
+
+    with pytest.raises(HTTPException) as first_failure:
+        await service.authenticate_user(" User@Test.com ", "Strong_password-33", None)
+    assert first_failure.value.status_code == 401
+
+    with pytest.raises(HTTPException) as budget_spent:
+        await service.authenticate_user("user@test.com", "Strong_password-33", None)
+    assert budget_spent.value.status_code == 429
+    assert budget_spent.value.headers == {"Retry-After": "42"}
+
+    with pytest.raises(HTTPException) as rejected:
+        await service.authenticate_user("user@test.com", "Strong_password-33", None)
+    assert rejected.value.status_code == 429
+    assert limiter.calls == [("hit", "login:user@test.com")] * 3
+
+
+@pytest.mark.asyncio
+async def test_unverified_login_with_correct_password_clears_failed_attempts():
+    class RecordingRateLimiter(NoopRateLimiter):
+        def __init__(self):
+            self.resets = []
+
+        async def reset(self, key):
+            self.resets.append(key)
+
+    class UserRepository:
+        async def get_by_email(self, email):
+            return SimpleNamespace(id=uuid4(), hashed_password="hash", is_verified=False)
+
+    class Hasher:
+        async def verify(self, plain_password, hashed_password):
+            return True
+
+    limiter = RecordingRateLimiter()
+    service = AuthService(UserRepository(), NoopTokenRepository(), limiter, NoopEmailOutbox(), Hasher())
+
+    with pytest.raises(HTTPException) as unverified:
+        await service.authenticate_user("pending@test.com", "Strong_password-33", None)
+
+    assert unverified.value.detail == "Email not verified"
+    assert limiter.resets == ["login:pending@test.com"]
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from redis.exceptions import ResponseError
+
+from auth_service.src.infrastructure.auto_pipeline import AutoPipelineRedis
+from auth_service.src.infrastructure.repositories.rate_limiter import RateLimiter
+from auth_service.src.infrastructure.repositories.token_repository import TokenRepository
+from auth_service.src.infrastructure.security import create_refresh_token
+
+
+@pytest_asyncio.fixture
+async def auto_redis(redis_client):
+    client = AutoPipelineRedis(connection_pool=redis_client.connection_pool)
+    yield client
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_commands_share_one_pipeline(auto_redis):
+    results = await asyncio.gather(*(auto_redis.incr("auto:counter") for _ in range(50)))
+
+    assert sorted(results) == list(range(1, 51))
+    assert auto_redis.batches == 1
+    assert auto_redis.batched_commands == 50
+
+    assert await auto_redis.get("auto:counter") == "50"
+    assert auto_redis.batches == 2
+
+
+@pytest.mark.asyncio
+async def test_auto_pipeline_splits_batches_at_max_size(redis_client):
+    client = AutoPipelineRedis(connection_pool=redis_client.connection_pool, max_batch_size=8)
+
+    await asyncio.gather(*(client.set(f"auto:key:{index}", index) for index in range(20)))
+
+    assert client.batches == 3
+    assert await redis_client.get("auto:key:19") == "19"
+
+
+@pytest.mark.asyncio
+async def test_auto_pipeline_keeps_errors_with_their_command(auto_redis, redis_client):
+    await redis_client.set("auto:string", "value")
+
+    results = await asyncio.gather(
+        auto_redis.set("auto:ok", 1),
+        auto_redis.lpush("auto:string", "item"),
+        auto_redis.get("auto:string"),
+        return_exceptions=True,
+    )
+
+    assert results[0] is True
+    assert isinstance(results[1], ResponseError)
+    assert results[2] == "value"
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_and_token_repository_run_unchanged_on_auto_pipeline(auto_redis, redis_client):
+    await redis_client.script_flush()
+    limiter = RateLimiter(auto_redis)
+    repository = TokenRepository(auto_redis)
+    user_id = "00000000-0000-0000-0000-000000000001"
+    tokens = [create_refresh_token(user_id) for _ in range(10)]
+
+    attempts = await asyncio.gather(*(limiter.hit("auto:login", 5, 60) for _ in range(10)))
+    await asyncio.gather(*(repository.save_token(user_id, token, "phone", 600) for token in tokens))
+
+    assert [attempt.allowed for attempt in attempts].count(True) == 5
+    assert [await repository.get_token_data(token) for token in tokens] == [
+        {"user_id": user_id, "fingerprint": "phone"}
+    ] * 10
+    assert auto_redis.batches < 10 + len(tokens)
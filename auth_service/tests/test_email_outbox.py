@@ -0,0 +1,174 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from auth_service.src.email_worker import EmailOutboxWorker
+from auth_service.src.infrastructure.email import SmtpMailer
+from auth_service.src.infrastructure.models import EmailOutbox
+from auth_service.src.infrastructure.repositories.email_outbox_repository import EmailOutboxRepository
+
+
+class SmtpSink:
+    # Minimal SMTP server that records every message; recipients listed in
+    # `rejections` are refused with the given reply code.
+    def __init__(self, rejections: dict[str, int] | None = None):
+        self.rejections = rejections or {}
+        self.connections = 0
+        self.messages: list[tuple[str, list[str], str]] = []
+        self._server: asyncio.Server | None = None
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        sender, recipients = "", []
+
+        async def reply(line: str) -> None:
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        await reply("220 sink ESMTP")
+        while line := (await reader.readline()).decode().strip():
+            command = line.split(" ", 1)[0].upper()
+            if command == "EHLO":
+                await reply("250-sink\r\n250 8BITMIME")
+            elif command == "MAIL":
+                sender, recipients = line.split(":", 1)[1].split()[0].strip("<>"), []
+                await reply("250 OK")
+            elif command == "RCPT":
+                recipient = line.split(":", 1)[1].strip().strip("<>")
+                code = self.rejections.get(recipient)
+                if code:
+                    await reply(f"{code} rejected")
+                else:
+                    recipients.append(recipient)
+                    await reply("250 OK")
+            elif command == "DATA":
+                await reply("354 go ahead")
+                data = []
+                while (chunk := await reader.readline()) != b".\r\n":
+                    data.append(chunk.decode())
+                self.messages.append((sender, recipients, "".join(data)))
+                await reply("250 queued")
+            elif command == "QUIT":
+                await reply("221 bye")
+                break
+            else:
+                await reply("250 OK")
+        writer.close()
+
+
+@pytest_asyncio.fixture
+async def outbox_session_factory(db_session: AsyncSession):
+    connection = await db_session.connection()
+    return async_sessionmaker(
+        bind=connection,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+
+
+@pytest_asyncio.fixture
+async def smtp_sink():
+    sink = SmtpSink(rejections={"busy@test.com": 451, "bad@test.com": 550})
+    await sink.start()
+    yield sink
+    await sink.stop()
+
+
+def _worker(smtp_sink: SmtpSink, session_factory, **kwargs) -> EmailOutboxWorker:
+    mailer = SmtpMailer(
+        hostname="127.0.0.1",
+        port=smtp_sink.port,
+        username=None,
+        password=None,
+        sender="noreply@test.com",
+        start_tls=False,
+        timeout=5,
+    )
+    return EmailOutboxWorker(mailer, session_factory, rate_per_second=1000, **kwargs)
+
+
+async def _outbox(db_session: AsyncSession) -> dict[str, EmailOutbox]:
+    result = await db_session.execute(select(EmailOutbox).execution_options(populate_existing=True))
+    return {message.recipient: message for message in result.scalars()}
+
+
+@pytest.mark.asyncio
+async def test_register_queues_verification_email_in_the_user_transaction(client, db_session):
+    payload = {"email": "outbox@test.com", "username": "outbox_user", "password": "Strong_password-33"}
+
+    assert (await client.post("/auth/register", json=payload)).status_code == 201
+    assert (await client.post("/auth/register", json=payload)).status_code == 409
+
+    outbox = await _outbox(db_session)
+    assert list(outbox) == ["outbox@test.com"]
+    assert "http://testserver/auth/verify?token=" in outbox["outbox@test.com"].body
+    assert outbox["outbox@test.com"].sent_at is None
+
+
+@pytest.mark.asyncio
+async def test_email_worker_sends_a_batch_over_one_smtp_connection(db_session, outbox_session_factory, smtp_sink):
+    repository = EmailOutboxRepository(db_session)
+    for index in range(5):
+        repository.enqueue(f"user{index}@test.com", "Hello", f"message {index}")
+    await db_session.flush()
+
+    worker = _worker(smtp_sink, outbox_session_factory, batch_size=10)
+    try:
+        assert await worker.run_once() == 5
+        assert await worker.run_once() == 0
+        stats = await worker.stats()
+    finally:
+        await worker.mailer.aclose()
+
+    assert smtp_sink.connections == 1
+    assert [recipients for _, recipients, _ in smtp_sink.messages] == [[f"user{index}@test.com"] for index in range(5)]
+    assert all(message.sent_at is not None for message in (await _outbox(db_session)).values())
+    assert stats["queue_depth"] == 0
+    assert stats["sent"] == 5
+    assert stats["smtp_connections"] == 1
+
+
+@pytest.mark.asyncio
+async def test_email_worker_retries_transient_errors_and_gives_up_on_permanent_ones(
+        db_session, outbox_session_factory, smtp_sink
+):
+    repository = EmailOutboxRepository(db_session)
+    for recipient in ("ok@test.com", "busy@test.com", "bad@test.com"):
+        repository.enqueue(recipient, "Hello", "body")
+    await db_session.flush()
+
+    worker = _worker(smtp_sink, outbox_session_factory, max_attempts=2, retry_base_seconds=0)
+    try:
+        assert await worker.run_once() == 3
+        outbox = await _outbox(db_session)
+        assert outbox["ok@test.com"].sent_at is not None
+        assert outbox["bad@test.com"].failed_at is not None
+        assert outbox["busy@test.com"].failed_at is None
+        assert outbox["busy@test.com"].attempts == 1
+        assert "451" in outbox["busy@test.com"].last_error
+
+        assert await worker.run_once() == 1
+        assert await worker.run_once() == 0
+    finally:
+        await worker.mailer.aclose()
+
+    outbox = await _outbox(db_session)
+    assert outbox["busy@test.com"].attempts == 2
+    assert outbox["busy@test.com"].failed_at is not None
+    assert (worker.sent, worker.retried, worker.failed) == (1, 1, 2)
+    assert (await worker.stats())["queue_depth"] == 0
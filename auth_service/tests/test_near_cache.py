@@ -0,0 +1,124 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+
+from auth_service.src.infrastructure.near_cache import NearCache
+from auth_service.src.infrastructure.repositories.profile_cache import ProfileCache, ProfileCacheStats
+
+
+async def _eventually(predicate, timeout: float = 2.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < deadline, "condition was not met in time"
+        await asyncio.sleep(0.01)
+
+
+@pytest_asyncio.fixture
+async def start_near_cache(redis_client):
+    caches: list[NearCache] = []
+
+    async def start(**kwargs) -> NearCache:
+        kwargs.setdefault("prefixes", ["hot:", "profile:", "profile_version:"])
+        cache = NearCache(redis_client, **kwargs)
+        caches.append(cache)
+        await cache.start(timeout=5)
+        assert cache.tracking
+        return cache
+
+    yield start
+    for cache in caches:
+        await cache.aclose()
+
+
+@pytest.mark.asyncio
+async def test_near_cache_serves_repeated_reads_until_redis_reports_a_write(start_near_cache, redis_client):
+    await redis_client.set("hot:flag", "1")
+    cache = await start_near_cache()
+
+    assert await cache.get("hot:flag") == "1"
+    assert await cache.get("hot:flag") == "1"
+    assert cache.hits == 1
+
+    await redis_client.set("hot:flag", "2")
+    await _eventually(lambda: cache.invalidations == 1)
+
+    assert await cache.get("hot:flag") == "2"
+    assert cache.stats()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_near_cache_caches_missing_keys_until_they_are_created(start_near_cache, redis_client):
+    cache = await start_near_cache()
+
+    assert await cache.get("hot:missing") is None
+    assert await cache.get("hot:missing") is None
+    assert cache.hits == 1
+
+    await redis_client.hset("hot:missing", mapping={"a": "1"})
+    await _eventually(lambda: cache.invalidations == 1)
+
+    assert await cache.hmget("hot:missing", "a", "b") == ["1", None]
+
+
+@pytest.mark.asyncio
+async def test_near_cache_is_bounded_and_skips_untracked_prefixes(start_near_cache, redis_client):
+    cache = await start_near_cache(max_keys=3)
+
+    for index in range(5):
+        await cache.get(f"hot:{index}")
+    await cache.get("cold:key")
+    await cache.get("cold:key")
+
+    stats = cache.stats()
+    assert stats["size"] == 3
+    assert stats["evictions"] == 2
+    assert stats["hits"] == 0
+
+    await redis_client.flushall()
+    await _eventually(lambda: cache.stats()["size"] == 0)
+
+
+@pytest.mark.asyncio
+async def test_near_cache_drops_entries_while_tracking_connection_is_down(start_near_cache, redis_client):
+    await redis_client.set("hot:flag", "1")
+    cache = await start_near_cache(retry_seconds=0.05)
+    await cache.get("hot:flag")
+    assert cache.stats()["size"] == 1
+
+    tracking_clients = [client for client in await redis_client.client_list() if "t" in client["flags"]]
+    assert len(tracking_clients) == 1
+    await redis_client.client_kill_filter(_id=tracking_clients[0]["id"])
+
+    await _eventually(lambda: cache.stats()["size"] == 0)
+    await _eventually(lambda: cache.tracking)
+    assert await cache.get("hot:flag") == "1"
+    assert cache.hits == 0
+
+
+@pytest.mark.asyncio
+async def test_profile_cache_serves_hits_from_near_cache_until_invalidated(start_near_cache, redis_client):
+    near_cache = await start_near_cache()
+    cache = ProfileCache(redis_client, ttl_seconds=60, stats=ProfileCacheStats(), near_cache=near_cache)
+    user_id = uuid4()
+    loads = 0
+
+    async def loader() -> bytes:
+        nonlocal loads
+        loads += 1
+        return b'{"username": "near"}'
+
+    assert await cache.get_or_load(user_id, loader) == b'{"username": "near"}'
+    await _eventually(lambda: near_cache.invalidations >= 1)
+    for _ in range(3):
+        assert await cache.get_or_load(user_id, loader) == b'{"username": "near"}'
+    assert loads == 1
+    assert near_cache.hits >= 2
+
+    await cache.invalidate(user_id)
+    await _eventually(lambda: near_cache.stats()["size"] == 0)
+
+    assert await cache.get_or_load(user_id, loader) == b'{"username": "near"}'
+    assert loads == 2
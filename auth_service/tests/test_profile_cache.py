@@ -0,0 +1,228 @@
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+from redis.asyncio import Redis
+from sqlalchemy import update
+
+from auth_service.src.infrastructure.models import UserDB
+from auth_service.src.infrastructure.repositories.profile_cache import (
+    ProfileCache,
+    ProfileCacheStats,
+    _background_invalidations,
+)
+from auth_service.tests.helpers import login_user
+
+
+def _cache(redis, **kwargs) -> ProfileCache:
+    return ProfileCache(redis, ttl_seconds=60, stats=ProfileCacheStats(), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_profile_cache_serves_hits_until_invalidated(redis_client):
+    cache = _cache(redis_client)
+    user_id = uuid4()
+    versions = iter([b'{"bio": "old"}', b'{"bio": "new"}'])
+    loads = 0
+
+    async def loader():
+        nonlocal loads
+        loads += 1
+        return next(versions)
+
+    assert await cache.get_or_load(user_id, loader) == b'{"bio": "old"}'
+    assert await cache.get_or_load(user_id, loader) == b'{"bio": "old"}'
+    assert loads == 1
+
+    await cache.invalidate(user_id)
+    assert await cache.get_or_load(user_id, loader) == b'{"bio": "new"}'
+    assert loads == 2
+
+    stats = cache.stats.snapshot()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["invalidations"] == 1
+    assert stats["hit_ratio"] == pytest.approx(1 / 3)
+
+
+@pytest.mark.asyncio
+async def test_profile_cache_invalidates_fan_outs_after_returning(redis_client):
+    cache = _cache(redis_client)
+    user_ids = [uuid4() for _ in range(3)]
+
+    async def loader():
+        return b'{"bio": "cached"}'
+
+    for user_id in user_ids:
+        await cache.get_or_load(user_id, loader)
+
+    cache.invalidate_in_background(*user_ids)
+    assert cache.stats.invalidations == 0
+
+    while _background_invalidations:
+        await asyncio.gather(*_background_invalidations)
+    assert cache.stats.invalidations == 3
+    assert await redis_client.exists(*(f"profile:{user_id}" for user_id in user_ids)) == 0
+
+
+@pytest.mark.asyncio
+async def test_profile_cache_drops_fills_that_raced_with_a_write(redis_client):
+    cache = _cache(redis_client)
+    user_id = uuid4()
+    snapshots = iter([b'{"bio": "before write"}', b'{"bio": "after write"}'])
+
+    async def loader_racing_with_writer():
+        payload = next(snapshots)
+        # The writer commits and invalidates while this read is in flight.
+        await cache.invalidate(user_id)
+        return payload
+
+    async def loader():
+        return next(snapshots)
+
+    assert await cache.get_or_load(user_id, loader_racing_with_writer) == b'{"bio": "before write"}'
+    assert cache.stats.stale_fills == 1
+    assert await cache.get_or_load(user_id, loader) == b'{"bio": "after write"}'
+    assert cache.stats.fills == 1
+
+
+@pytest.mark.asyncio
+async def test_profile_cache_coalesces_concurrent_misses(redis_client):
+    cache = _cache(redis_client, wait_ms=2000)
+    user_id = uuid4()
+    loads = 0
+
+    async def slow_loader():
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.05)
+        return b'{"bio": "loaded once"}'
+
+    results = await asyncio.gather(*(cache.get_or_load(user_id, slow_loader) for _ in range(20)))
+
+    assert set(results) == {b'{"bio": "loaded once"}'}
+    assert loads == 1
+    assert cache.stats.coalesced == 19
+    assert not await redis_client.exists(f"profile_lock:{user_id}")
+
+
+@pytest.mark.asyncio
+async def test_profile_cache_batch_reads_hits_and_loads_only_misses(redis_client):
+    cache = _cache(redis_client)
+    cached_id, uncached_id, missing_id = uuid4(), uuid4(), uuid4()
+    requested_loads = []
+
+    async def loader(user_ids):
+        requested_loads.append(user_ids)
+        return {user_id: b'{"id": "%s"}' % str(user_id).encode() for user_id in user_ids if user_id != missing_id}
+
+    async def single_loader():
+        return b'{"id": "cached"}'
+
+    await cache.get_or_load(cached_id, single_loader)
+    profiles = await cache.get_or_load_many([cached_id, uncached_id, missing_id], loader)
+
+    assert requested_loads == [[uncached_id, missing_id]]
+    assert profiles[cached_id] == b'{"id": "cached"}'
+    assert profiles[uncached_id] == b'{"id": "%s"}' % str(uncached_id).encode()
+    assert missing_id not in profiles
+
+    await cache.invalidate(cached_id)
+    await cache.get_or_load_many([cached_id, uncached_id], loader)
+    assert requested_loads[-1] == [cached_id]
+    assert cache.stats.fills == 3
+
+
+@pytest.mark.asyncio
+async def test_profile_cache_does_not_cache_missing_users(redis_client):
+    cache = _cache(redis_client)
+    user_id = uuid4()
+    loads = 0
+
+    async def missing():
+        nonlocal loads
+        loads += 1
+        return None
+
+    assert await cache.get_or_load(user_id, missing) is None
+    assert await cache.get_or_load(user_id, missing) is None
+    assert loads == 2
+    assert cache.stats.stale_fills == 0
+
+
+@pytest.mark.asyncio
+async def test_profile_cache_falls_back_to_loader_when_redis_is_down():
+    redis = Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.1)
+    cache = _cache(redis)
+
+    async def loader():
+        return b'{"bio": "from db"}'
+
+    try:
+        assert await cache.get_or_load(uuid4(), loader) == b'{"bio": "from db"}'
+        await cache.invalidate(uuid4())
+    finally:
+        await redis.aclose()
+
+    assert cache.stats.errors == 2
+
+
+@pytest.mark.asyncio
+async def test_public_profile_is_never_stale_after_writes(client, verified_user, db_session):
+    user_data, user = verified_user
+    tokens = await login_user(client, user_data["email"], user_data["password"])
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    other_payload = {"email": "cached-other@test.com", "username": "cached_other", "password": "Strong_password-33"}
+    assert (await client.post("/auth/register", json=other_payload)).status_code == 201
+    other_id = await db_session.scalar(
+        update(UserDB).where(UserDB.email == other_payload["email"]).values(is_verified=True).returning(UserDB.id)
+    )
+    await db_session.commit()
+    other_tokens = await login_user(client, other_payload["email"], other_payload["password"])
+    other_headers = {"Authorization": f"Bearer {other_tokens['access_token']}"}
+
+    async def profile(user_id):
+        response = await client.get(f"/users/{user_id}")
+        return response.status_code, response.json()
+
+    assert (await profile(user.id))[1]["bio"] is None
+    assert (await profile(user.id))[1]["bio"] is None
+
+    assert (await client.patch("/users/me", json={"bio": "Fresh bio"}, headers=headers)).status_code == 200
+    assert (await profile(user.id))[1]["bio"] == "Fresh bio"
+
+    skill = await client.post("/skills/", json={"name": "Rust", "slug": "rust"}, headers=headers)
+    added = await client.post("/users/me/skills", json={"skill_id": skill.json()["id"], "level": 2}, headers=headers)
+    assert added.status_code == 201
+    assert [item["level"] for item in (await profile(user.id))[1]["skills"]] == [2]
+
+    updated = await client.patch(f"/users/me/skills/{skill.json()['id']}", json={"level": 4}, headers=headers)
+    assert updated.status_code == 200
+    assert [item["level"] for item in (await profile(user.id))[1]["skills"]] == [4]
+
+    assert (await client.delete(f"/users/me/skills/{skill.json()['id']}", headers=headers)).status_code == 204
+    assert (await profile(user.id))[1]["skills"] == []
+
+    assert (await profile(other_id))[1]["following_count"] == 0
+    assert (await client.post(f"/users/{user.id}/follow", headers=other_headers)).status_code == 200
+    assert (await profile(user.id))[1]["followers_count"] == 1
+    assert (await profile(other_id))[1]["following_count"] == 1
+
+    assert (await client.delete("/users/me", headers=headers)).status_code == 200
+    assert (await profile(user.id))[0] == 404
+    assert (await profile(other_id))[1]["following_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cached_public_profile_matches_uncached_response(client, verified_user, redis_client):
+    _, user = verified_user
+
+    first = await client.get(f"/users/{user.id}")
+    assert await redis_client.exists(f"profile:{user.id}")
+    second = await client.get(f"/users/{user.id}")
+
+    assert first.content == second.content
+    assert json.loads(second.content)["id"] == str(user.id)
+    assert "email" not in second.json()
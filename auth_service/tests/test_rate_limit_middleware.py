@@ -0,0 +1,218 @@
+from functools import partial
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from redis.asyncio import Redis
+
+from auth_service.src.infrastructure.redis import get_redis_client
+from auth_service.src.infrastructure.security import create_token, decode_access_token
+from common.rate_limit import LocalPrefilter, RateLimitMiddleware, RateLimitRule, build_rate_limit_prefilter
+
+
+class CountingRedis:
+    def __init__(self, redis: Redis):
+        self.redis = redis
+        self.calls = 0
+
+    def register_script(self, script: str):
+        registered = self.redis.register_script(script)
+
+        async def counted(*args, **kwargs):
+            self.calls += 1
+            return await registered(*args, **kwargs)
+
+        return counted
+
+
+def _app(redis, rules, prefilter=None, **kwargs) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/skills/")
+    async def skills():
+        return []
+
+    @app.post("/auth/register")
+    async def register():
+        return {}
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        rules=rules,
+        redis_factory=get_redis_client,
+        user_id_decoder=partial(decode_access_token, token_type="auth"),
+        exempt_paths=["/health"],
+        prefilter=prefilter,
+        **kwargs,
+    )
+    app.dependency_overrides[get_redis_client] = lambda: redis
+    return app
+
+
+def _client(app: FastAPI) -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_rejects_after_budget_with_headers(redis_client):
+    rules = [RateLimitRule(name="register", path="/auth/register", methods=["POST"], limit=3)]
+
+    async with _client(_app(redis_client, rules)) as client:
+        responses = [await client.post("/auth/register") for _ in range(4)]
+        assert (await client.get("/skills/")).status_code == 200
+
+    assert [response.status_code for response in responses] == [200, 200, 200, 429]
+    assert [response.headers["RateLimit-Remaining"] for response in responses] == ["2", "1", "0", "0"]
+    assert responses[0].headers["RateLimit-Limit"] == "3"
+    assert responses[0].headers["RateLimit-Policy"] == "3;w=60"
+    assert responses[-1].json() == {"detail": "Too many requests"}
+    assert 1 <= int(responses[-1].headers["Retry-After"]) <= 20
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_keeps_separate_buckets_per_user_and_ip(redis_client):
+    rules = [
+        RateLimitRule(name="global_ip", path="/", scope="ip", limit=100),
+        RateLimitRule(name="global_user", path="/", scope="user", limit=2),
+    ]
+    first = {"Authorization": f"Bearer {create_token(uuid4(), 'auth')}"}
+    second = {"Authorization": f"Bearer {create_token(uuid4(), 'auth')}"}
+
+    async with _client(_app(redis_client, rules)) as client:
+        first_codes = [(await client.get("/skills/", headers=first)).status_code for _ in range(3)]
+        second_codes = [(await client.get("/skills/", headers=second)).status_code for _ in range(2)]
+        anonymous = await client.get("/skills/", headers={"Authorization": "Bearer not-a-token"})
+
+    assert first_codes == [200, 200, 429]
+    assert second_codes == [200, 200]
+    assert anonymous.status_code == 200
+    assert anonymous.headers["RateLimit-Limit"] == "100"
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_judges_all_rules_in_one_call_and_charges_none_on_rejection(redis_client):
+    counting = CountingRedis(redis_client)
+    rules = [
+        RateLimitRule(name="global_ip", path="/", limit=100),
+        RateLimitRule(name="register", path="/auth/register", methods=["POST"], limit=2),
+    ]
+
+    async with _client(_app(counting, rules)) as client:
+        codes = [(await client.post("/auth/register")).status_code for _ in range(4)]
+
+    assert codes == [200, 200, 429, 429]
+    assert counting.calls == 4
+    tokens = float(await redis_client.hget("ratelimit:global_ip:ip:127.0.0.1", "tokens"))
+    assert 98 <= tokens < 99
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_prefilter_admits_locally_and_charges_redis_later(redis_client):
+    counting = CountingRedis(redis_client)
+    rules = [RateLimitRule(name="skills", path="/skills", limit=100)]
+    prefilter = LocalPrefilter(share=0.5, sync_seconds=60, max_keys=10)
+
+    async with _client(_app(counting, rules, prefilter)) as client:
+        for _ in range(60):
+            assert (await client.get("/skills/")).status_code == 200
+
+    assert counting.calls == 2
+    tokens = float(await redis_client.hget("ratelimit:skills:ip:127.0.0.1", "tokens"))
+    assert 49 <= tokens < 51
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_prefilter_never_exceeds_budget(redis_client):
+    rules = [RateLimitRule(name="register", path="/auth/register", limit=10, period_seconds=3600)]
+    prefilter = LocalPrefilter(share=0.5, sync_seconds=60, max_keys=10)
+
+    async with _client(_app(redis_client, rules, prefilter)) as client:
+        codes = [(await client.post("/auth/register")).status_code for _ in range(30)]
+
+    assert codes.count(200) == 10
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_prefilter_leaves_low_limit_rules_to_redis(redis_client):
+    counting = CountingRedis(redis_client)
+    rules = [RateLimitRule(name="register", path="/auth/register", methods=["POST"], limit=20)]
+    prefilter = LocalPrefilter(share=0.5, sync_seconds=60, max_keys=10, min_limit=100)
+
+    async with _client(_app(counting, rules, prefilter)) as client:
+        codes = [(await client.post("/auth/register")).status_code for _ in range(25)]
+
+    assert counting.calls == 25
+    assert codes.count(200) == 20
+
+
+def test_rate_limit_prefilter_share_is_split_across_processes():
+    prefilter = build_rate_limit_prefilter(share=0.5, sync_seconds=1, max_keys=10, min_limit=100, processes=8)
+
+    assert prefilter.share == 0.5 / 8
+    assert prefilter.min_limit == 100
+    assert build_rate_limit_prefilter(share=0, sync_seconds=1, max_keys=10) is None
+    assert prefilter.covers(RateLimitRule(name="register", path="/auth/register", limit=20)) is False
+    assert prefilter.covers(RateLimitRule(name="global_ip", path="/", limit=1200)) is True
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_skips_exempt_paths_and_fails_open():
+    redis = Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.1)
+    rules = [RateLimitRule(name="global_ip", path="/", limit=1)]
+
+    try:
+        async with _client(_app(redis, rules)) as client:
+            responses = [await client.get("/skills/") for _ in range(3)]
+            health = await client.get("/health")
+    finally:
+        await redis.aclose()
+
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    assert "RateLimit-Limit" not in responses[0].headers
+    assert health.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_uses_forwarded_address_only_when_trusted(redis_client):
+    rules = [RateLimitRule(name="global_ip", path="/", limit=1)]
+
+    for trusted, expected in ((False, [200, 429]), (True, [200, 200])):
+        await redis_client.flushall()
+        async with _client(_app(redis_client, rules, trust_forwarded=trusted)) as client:
+            codes = [
+                (await client.get("/skills/", headers={"X-Forwarded-For": f"203.0.113.7, 10.0.0.{index}"})).status_code
+                for index in range(2)
+            ]
+        assert codes == expected
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_ignores_client_supplied_forwarded_entries(redis_client):
+    rules = [RateLimitRule(name="register", path="/auth/register", methods=["POST"], limit=1)]
+
+    async with _client(_app(redis_client, rules, trust_forwarded=True)) as client:
+        spoofed = [
+            (await client.post("/auth/register", headers={"X-Forwarded-For": f"198.51.100.{index}, 10.0.0.1"})).status_code
+            for index in range(3)
+        ]
+    assert spoofed == [200, 429, 429]
+
+
+def test_rate_limit_client_ip_counts_trusted_proxies_from_the_right():
+    def client_ip(trusted_proxies, *forwarded):
+        middleware = RateLimitMiddleware(
+            None, [], redis_factory=get_redis_client, trust_forwarded=True, trusted_proxies=trusted_proxies
+        )
+        headers = [(b"x-forwarded-for", value.encode()) for value in forwarded]
+        return middleware._client_ip({"headers": headers, "client": ("10.9.9.9", 1234)})
+
+    assert client_ip(1, "1.1.1.1, 2.2.2.2") == "2.2.2.2"
+    assert client_ip(2, "1.1.1.1, 2.2.2.2, 3.3.3.3") == "2.2.2.2"
+    assert client_ip(2, "1.1.1.1", "2.2.2.2, 3.3.3.3") == "2.2.2.2"
+    assert client_ip(2, "3.3.3.3") == "10.9.9.9"
+    assert client_ip(1) == "10.9.9.9"
@@ -1,20 +1,29 @@
+import asyncio
+import json
+import socket
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
 from uuid import uuid4
 
 import grpc
 import pytest
 from fastapi import HTTPException
 from jose import jwt
+from sqlalchemy.exc import SQLAlchemyError
 
-from auth_service.src.application.user_service import AccessType
+from auth_service.src.application.user_service import UserService
+from auth_service.src.grpc_main import serve_grpc
 from auth_service.src.infrastructure.config import settings
-from auth_service.src.infrastructure.email import send_verification_email
+from auth_service.src.infrastructure.email import build_verification_email
 from auth_service.src.infrastructure.exceptions import TokenExpiredError, TokenInvalidError
-from auth_service.src.infrastructure.generated import users_pb2
+from auth_service.src.infrastructure.existence_batcher import ExistenceBatcher
+from auth_service.src.infrastructure.generated import users_pb2, users_pb2_grpc
+from auth_service.src.infrastructure.repositories.profile_cache import ProfileCache
 from auth_service.src.infrastructure.security import create_token, decode_access_token
-from auth_service.src.presentation.dependencies import get_current_user
+from auth_service.src.infrastructure.user_existence_index import BloomFilter, UserExistenceIndex
+from auth_service.src.presentation.dependencies import get_current_principal, get_current_user_id
 from auth_service.src.presentation.grpc_handler import UsersServicer
-from auth_service.src.presentation.schemas import UserData
 
 
 def _token(user_id, *, token_type="auth", expires_delta=timedelta(minutes=5), sub=None):
@@ -70,55 +79,83 @@ async def test_auth_security_tokens_reject_bad_shape_and_wrong_type():
 
 
 @pytest.mark.asyncio
-async def test_get_current_user_maps_token_errors_to_http_responses():
+async def test_get_current_user_id_maps_token_errors_to_http_responses():
     user_id = uuid4()
 
-    class UserServiceStub:
-        async def get_user(self, requested_user_id, access_type=AccessType.FREE):
-            assert requested_user_id == user_id
-            assert access_type == AccessType.PRIVATE
-            return UserData(
-                id=user_id,
-                email="current@test.com",
-                username="current",
-                bio=None,
-                followers_count=0,
-                following_count=0,
-                created_at=datetime.now(UTC),
-            )
-
     with pytest.raises(HTTPException) as missing:
-        await get_current_user(None, UserServiceStub())
+        await get_current_user_id(None)
     assert missing.value.status_code == 403
 
     with pytest.raises(HTTPException) as invalid:
-        await get_current_user("not-a-token", UserServiceStub())
+        await get_current_user_id("not-a-token")
     assert invalid.value.status_code == 401
 
     with pytest.raises(HTTPException) as expired:
-        await get_current_user(_token(user_id, expires_delta=timedelta(seconds=-1)), UserServiceStub())
+        await get_current_user_id(_token(user_id, expires_delta=timedelta(seconds=-1)))
     assert expired.value.status_code == 401
 
-    current = await get_current_user(_token(user_id), UserServiceStub())
-    assert current.id == user_id
-    assert current.email == "current@test.com"
+    assert await get_current_user_id(_token(user_id)) == user_id
 
 
 @pytest.mark.asyncio
-async def test_verification_email_uses_public_app_url(monkeypatch):
-    sent_messages = []
+async def test_get_current_principal_confirms_writers_and_optionally_readers(monkeypatch):
+    user_id = uuid4()
+
+    class UserRepositoryStub:
+        def __init__(self, existing):
+            self.existing = existing
+            self.calls = 0
+
+        async def exists(self, requested_user_id):
+            self.calls += 1
+            return requested_user_id in self.existing
+
+    class PresenceCacheStub:
+        def __init__(self):
+            self.known = {}
+
+        async def is_known(self, requested_user_id):
+            return requested_user_id in self.known
+
+        async def remember(self, requested_user_id, ttl):
+            self.known[requested_user_id] = ttl
+
+    repository = UserRepositoryStub({user_id})
+    cache = PresenceCacheStub()
+    read, write = SimpleNamespace(method="GET"), SimpleNamespace(method="POST")
+
+    with pytest.raises(HTTPException) as missing:
+        await get_current_principal(read, None, repository, cache)
+    assert missing.value.status_code == 403
 
-    class FastMailStub:
-        async def send_message(self, message):
-            sent_messages.append(message)
+    with pytest.raises(HTTPException) as expired:
+        await get_current_principal(read, _token(user_id, expires_delta=timedelta(seconds=-1)), repository, cache)
+    assert expired.value.status_code == 401
+
+    principal = await get_current_principal(read, _token(user_id), repository, cache)
+    assert principal.id == user_id
+    assert repository.calls == 0
+    assert (await get_current_principal(read, _token(uuid4()), repository, cache)).id != user_id
+
+    await get_current_principal(write, _token(user_id), repository, cache)
+    await get_current_principal(write, _token(user_id), repository, cache)
+    assert repository.calls == 1
+    assert cache.known == {user_id: settings.PRINCIPAL_EXISTENCE_TTL_SECONDS}
+
+    with pytest.raises(HTTPException) as deleted_write:
+        await get_current_principal(write, _token(uuid4()), repository, cache)
+    assert deleted_write.value.status_code == 401
+
+    monkeypatch.setattr(settings, "PRINCIPAL_EXISTENCE_CHECK", True)
+    with pytest.raises(HTTPException) as deleted_read:
+        await get_current_principal(read, _token(uuid4()), repository, cache)
+    assert deleted_read.value.status_code == 401
 
-    monkeypatch.setattr("auth_service.src.infrastructure.email.fastmail", FastMailStub())
 
-    await send_verification_email("target@test.com", "verify-token")
+def test_verification_email_uses_public_app_url():
+    _, body = build_verification_email("verify-token")
 
-    assert len(sent_messages) == 1
-    assert sent_messages[0].recipients[0].email == "target@test.com"
-    assert "http://testserver/auth/verify?token=verify-token" in sent_messages[0].body
+    assert "http://testserver/auth/verify?token=verify-token" in body
 
 
 @pytest.mark.asyncio
@@ -137,10 +174,7 @@ async def test_users_grpc_servicer_requires_service_token_and_valid_uuid():
     assert invalid_uuid_context.abort_code == grpc.StatusCode.INVALID_ARGUMENT
 
 
-@pytest.mark.asyncio
-async def test_users_grpc_servicer_returns_existence(monkeypatch, db_session, verified_user):
-    _, user = verified_user
-
+def _use_test_session(monkeypatch, db_session):
     class SessionContext:
         async def __aenter__(self):
             return db_session
@@ -150,6 +184,12 @@ async def test_users_grpc_servicer_returns_existence(monkeypatch, db_session, ve
 
     monkeypatch.setattr("auth_service.src.presentation.grpc_handler.async_session_factory", lambda: SessionContext())
 
+
+@pytest.mark.asyncio
+async def test_users_grpc_servicer_returns_existence(monkeypatch, db_session, verified_user):
+    _, user = verified_user
+    _use_test_session(monkeypatch, db_session)
+
     servicer = UsersServicer()
 
     existing = await servicer.GetUserExistence(
@@ -163,3 +203,249 @@ async def test_users_grpc_servicer_returns_existence(monkeypatch, db_session, ve
 
     assert existing.exists is True
     assert missing.exists is False
+
+
+@pytest.mark.asyncio
+async def test_users_grpc_servicer_rejects_oversized_and_malformed_batches():
+    servicer = UsersServicer()
+
+    wrong_token_context = FakeGrpcContext("wrong")
+    with pytest.raises(AbortError):
+        await servicer.GetUsersExistence(users_pb2.UsersRequest(user_ids=[str(uuid4())]), wrong_token_context)
+    assert wrong_token_context.abort_code == grpc.StatusCode.UNAUTHENTICATED
+
+    oversized_context = FakeGrpcContext(settings.GRPC_SERVICE_TOKEN)
+    oversized = users_pb2.UsersRequest(user_ids=[str(uuid4()) for _ in range(UsersServicer.MAX_BATCH_SIZE + 1)])
+    with pytest.raises(AbortError):
+        await servicer.GetUsersExistence(oversized, oversized_context)
+    assert oversized_context.abort_code == grpc.StatusCode.INVALID_ARGUMENT
+
+    malformed_context = FakeGrpcContext(settings.GRPC_SERVICE_TOKEN)
+    with pytest.raises(AbortError):
+        await servicer.GetUsersExistence(users_pb2.UsersRequest(user_ids=["bad-uuid"]), malformed_context)
+    assert malformed_context.abort_code == grpc.StatusCode.INVALID_ARGUMENT
+
+
+@pytest.mark.asyncio
+async def test_users_grpc_servicer_resolves_batches_in_request_order(monkeypatch, db_session, verified_user):
+    _, user = verified_user
+    _use_test_session(monkeypatch, db_session)
+    missing_id = str(uuid4())
+    requested = [missing_id, str(user.id), missing_id]
+
+    servicer = UsersServicer()
+    batch = await servicer.GetUsersExistence(
+        users_pb2.UsersRequest(user_ids=requested),
+        FakeGrpcContext(settings.GRPC_SERVICE_TOKEN),
+    )
+    assert [(item.user_id, item.exists) for item in batch.users] == [
+        (missing_id, False),
+        (str(user.id), True),
+        (missing_id, False),
+    ]
+
+    async def requests():
+        yield users_pb2.UsersRequest(user_ids=[str(user.id)])
+        yield users_pb2.UsersRequest(user_ids=[missing_id])
+
+    responses = [
+        response
+        async for response in servicer.StreamUsersExistence(requests(), FakeGrpcContext(settings.GRPC_SERVICE_TOKEN))
+    ]
+    assert [[item.exists for item in response.users] for response in responses] == [[True], [False]]
+
+
+@pytest.mark.asyncio
+async def test_users_grpc_servicer_returns_user_summaries(monkeypatch, db_session, verified_user, redis_client):
+    _, user = verified_user
+    _use_test_session(monkeypatch, db_session)
+    missing_id = str(uuid4())
+
+    servicer = UsersServicer(redis=redis_client, profile_cache=ProfileCache(redis_client))
+    for _ in range(2):
+        summary = await servicer.GetUsersSummary(
+            users_pb2.UsersRequest(user_ids=[str(user.id), missing_id]),
+            FakeGrpcContext(settings.GRPC_SERVICE_TOKEN),
+        )
+        found, missing = summary.users
+        assert (found.user_id, found.found, found.username) == (str(user.id), True, user.username)
+        assert found.HasField("bio") is False
+        assert (missing.user_id, missing.found) == (missing_id, False)
+
+    oversized_context = FakeGrpcContext(settings.GRPC_SERVICE_TOKEN)
+    oversized = users_pb2.UsersRequest(
+        user_ids=[str(uuid4()) for _ in range(UsersServicer.MAX_SUMMARY_BATCH_SIZE + 1)]
+    )
+    with pytest.raises(AbortError):
+        await servicer.GetUsersSummary(oversized, oversized_context)
+    assert oversized_context.abort_code == grpc.StatusCode.INVALID_ARGUMENT
+
+
+@asynccontextmanager
+async def _serve_on_unix_socket(tmp_path):
+    socket_path = str(tmp_path / "auth.sock")
+    server = asyncio.create_task(serve_grpc(0, uds_path=socket_path, grace=0))
+    try:
+        for _ in range(200):
+            try:
+                _, writer = await asyncio.open_unix_connection(socket_path)
+            except OSError:
+                await asyncio.sleep(0.01)
+            else:
+                writer.close()
+                break
+        async with grpc.aio.insecure_channel(
+            f"unix:{socket_path}", options=[("grpc.max_receive_message_length", -1)]
+        ) as channel:
+            yield users_pb2_grpc.UsersExternalStub(channel)
+    finally:
+        server.cancel()
+        await server
+
+
+@pytest.mark.asyncio
+async def test_users_summary_batch_of_largest_profiles_fits_the_send_limit(monkeypatch, tmp_path):
+    profile = json.dumps({
+        "username": "u" * 50,
+        "bio": "\U0001F680" * 1000,
+        "followers_count": 2**31 - 1,
+        "following_count": 2**31 - 1,
+        "skills": [
+            {"skill": {"slug": f"{index:02d}" + "s" * 48, "name": "\U0001F680" * 50, "group": "g" * 30}, "level": 4}
+            for index in range(50)
+        ],
+    }).encode()
+
+    async def get_users_batch(self, user_ids):
+        return [(user_id, profile) for user_id in user_ids]
+
+    monkeypatch.setattr(UserService, "get_users_batch", get_users_batch)
+    user_ids = [str(uuid4()) for _ in range(UsersServicer.MAX_SUMMARY_BATCH_SIZE)]
+
+    async with _serve_on_unix_socket(tmp_path) as stub:
+        summary = await stub.GetUsersSummary(
+            users_pb2.UsersRequest(user_ids=user_ids),
+            metadata=(("x-service-token", settings.GRPC_SERVICE_TOKEN),),
+            timeout=10,
+        )
+
+    assert [item.user_id for item in summary.users] == user_ids
+    assert all(len(item.skills) == 50 for item in summary.users)
+    assert max(item.ByteSize() for item in summary.users) <= UsersServicer.MAX_SUMMARY_BYTES
+    assert summary.ByteSize() <= UsersServicer.MAX_SEND_MESSAGE_LENGTH
+
+
+@pytest.mark.asyncio
+async def test_serve_grpc_answers_over_a_unix_socket_left_behind_by_a_previous_run(monkeypatch, tmp_path):
+    existing_id, missing_id = uuid4(), uuid4()
+
+    async def load_existing_ids(user_ids):
+        return {user_id for user_id in user_ids if user_id == existing_id}
+
+    monkeypatch.setattr(UsersServicer, "_load_existing_ids", staticmethod(load_existing_ids))
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(tmp_path / "auth.sock"))
+    stale.close()
+
+    async with _serve_on_unix_socket(tmp_path) as stub:
+        metadata = (("x-service-token", settings.GRPC_SERVICE_TOKEN),)
+        existing = await stub.GetUserExistence(users_pb2.UserRequest(user_id=str(existing_id)), metadata=metadata)
+        missing = await stub.GetUserExistence(users_pb2.UserRequest(user_id=str(missing_id)), metadata=metadata)
+        with pytest.raises(grpc.aio.AioRpcError) as unauthenticated:
+            await stub.GetUserExistence(users_pb2.UserRequest(user_id=str(existing_id)))
+
+    assert (existing.exists, missing.exists) == (True, False)
+    assert unauthenticated.value.code() == grpc.StatusCode.UNAUTHENTICATED
+
+
+@pytest.mark.asyncio
+async def test_existence_batcher_coalesces_concurrent_lookups():
+    existing_id, missing_id, overflow_id = uuid4(), uuid4(), uuid4()
+    calls = []
+
+    async def loader(user_ids):
+        calls.append(sorted(user_ids))
+        return {existing_id}
+
+    batcher = ExistenceBatcher(loader, window_seconds=0.01, max_batch_size=2)
+
+    results = await asyncio.gather(
+        batcher.load(existing_id),
+        batcher.load(missing_id),
+        batcher.load(existing_id),
+        batcher.load(overflow_id),
+    )
+
+    assert results == [True, False, True, False]
+    assert calls == [sorted([existing_id, missing_id]), [overflow_id]]
+    stats = batcher.stats()
+    assert stats["requests"] == 4
+    assert stats["batches"] == 2
+    assert stats["loaded_ids"] == 3
+    assert stats["max_batch_size"] == 2
+
+
+@pytest.mark.asyncio
+async def test_existence_batcher_propagates_loader_failure_to_every_waiter():
+    async def loader(user_ids):
+        raise SQLAlchemyError("boom")
+
+    batcher = ExistenceBatcher(loader, window_seconds=0)
+    results = await asyncio.gather(batcher.load(uuid4()), batcher.load(uuid4()), return_exceptions=True)
+
+    assert all(isinstance(result, SQLAlchemyError) for result in results)
+    assert batcher.stats()["batches"] == 1
+
+    context = FakeGrpcContext(settings.GRPC_SERVICE_TOKEN)
+    with pytest.raises(AbortError):
+        await UsersServicer(batcher).GetUserExistence(users_pb2.UserRequest(user_id=str(uuid4())), context)
+    assert context.abort_code == grpc.StatusCode.INTERNAL
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    bloom = BloomFilter(capacity=5_000, error_rate=0.01)
+    added = [uuid4() for _ in range(5_000)]
+    for user_id in added:
+        bloom.add(user_id)
+
+    assert all(user_id in bloom for user_id in added)
+    false_positives = sum(uuid4() in bloom for _ in range(5_000))
+    assert false_positives < 5_000 * 0.03
+    assert bloom.memory_bytes < 8_000
+
+
+@pytest.mark.asyncio
+async def test_users_grpc_servicer_confirms_existence_index_misses_in_the_database():
+    existing_id, deleted_id, unannounced_id = uuid4(), uuid4(), uuid4()
+    loaded = []
+
+    async def loader(user_ids):
+        loaded.append(sorted(user_ids))
+        return {existing_id, unannounced_id} & set(user_ids)
+
+    index = UserExistenceIndex(capacity=100, error_rate=0.01)
+    index.ready = True
+    index.apply_event(f"created:{existing_id}")
+    index.apply_event(f"created:{deleted_id}")
+    index.apply_event(f"deleted:{deleted_id}")
+    index.apply_event("created:not-a-uuid")
+
+    servicer = UsersServicer(ExistenceBatcher(loader, window_seconds=0), index)
+    context = FakeGrpcContext(settings.GRPC_SERVICE_TOKEN)
+
+    missing_id = uuid4()
+    missing = await servicer.GetUserExistence(users_pb2.UserRequest(user_id=str(missing_id)), context)
+    existing = await servicer.GetUserExistence(users_pb2.UserRequest(user_id=str(existing_id)), context)
+    deleted = await servicer.GetUserExistence(users_pb2.UserRequest(user_id=str(deleted_id)), context)
+    unannounced = await servicer.GetUserExistence(users_pb2.UserRequest(user_id=str(unannounced_id)), context)
+
+    # Every answer, including filter misses, comes from the database.
+    assert (missing.exists, existing.exists, deleted.exists, unannounced.exists) == (False, True, False, True)
+    assert loaded == [[missing_id], [existing_id], [deleted_id], [unannounced_id]]
+    stats = index.stats()
+    assert stats["lookups"] == 4
+    assert stats["negative_rate"] == pytest.approx(2 / 4)
+    assert stats["false_positive_rate"] == pytest.approx(1 / 4)
+    assert stats["stale_negatives"] == 1
+    assert stats["deleted_since_warm"] == 1
+    assert index.might_exist(unannounced_id)
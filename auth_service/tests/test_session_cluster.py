@@ -0,0 +1,89 @@
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from redis.asyncio import RedisCluster
+
+from auth_service.src.infrastructure.config import settings
+from auth_service.src.infrastructure.repositories.token_repository import TokenRepository
+from auth_service.src.infrastructure.security import create_refresh_token
+
+REDIS_CLUSTER_URL = os.getenv("REDIS_CLUSTER_URL")
+
+pytestmark = pytest.mark.skipif(
+    not REDIS_CLUSTER_URL,
+    reason="set REDIS_CLUSTER_URL (e.g. redis://127.0.0.1:7000 from `docker compose --profile cluster up`)",
+)
+
+
+@pytest_asyncio.fixture
+async def cluster():
+    client = RedisCluster.from_url(REDIS_CLUSTER_URL, decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+@pytest_asyncio.fixture
+async def user_id(cluster):
+    user_id = str(uuid4())
+    yield user_id
+    await TokenRepository(cluster).delete_all_user_tokens(user_id)
+
+
+@pytest.mark.asyncio
+async def test_cluster_rotation_is_single_use(cluster, user_id):
+    repository = TokenRepository(cluster)
+    refresh_token = create_refresh_token(user_id)
+    await repository.save_token(user_id, refresh_token, "phone", ttl=600)
+
+    rotations = await asyncio.gather(*(
+        repository.rotate_token(user_id, refresh_token, create_refresh_token(user_id), "phone", ttl=600)
+        for _ in range(10)
+    ))
+
+    assert rotations.count(True) == 1
+    assert await repository.get_token_data(refresh_token) is None
+    assert await cluster.zcard(f"sessions:{{{user_id}}}") == 1
+
+
+@pytest.mark.asyncio
+async def test_cluster_logout_and_logout_all(cluster, user_id):
+    repository = TokenRepository(cluster)
+    tokens = [create_refresh_token(user_id) for _ in range(5)]
+    for refresh_token in tokens:
+        await repository.save_token(user_id, refresh_token, "desktop", ttl=600)
+
+    await repository.delete_token(user_id, tokens[0])
+    assert await repository.get_token_data(tokens[0]) is None
+    assert await repository.get_token_data(tokens[1]) == {"user_id": user_id, "fingerprint": "desktop"}
+
+    await repository.delete_all_user_tokens(user_id)
+    for refresh_token in tokens:
+        assert await repository.get_token_data(refresh_token) is None
+    assert not await cluster.exists(f"sessions:{{{user_id}}}")
+
+
+@pytest.mark.asyncio
+async def test_cluster_migrates_sessions_issued_before_owner_prefix(cluster, user_id, monkeypatch):
+    monkeypatch.setattr(settings, "LEGACY_SESSIONS_UNTIL", datetime.now(timezone.utc) + timedelta(days=1))
+    repository = TokenRepository(cluster)
+    legacy_token = "legacy-refresh-token-" + uuid4().hex
+    legacy_digest = repository._legacy_digest(legacy_token)
+    await cluster.setex(
+        f"refresh_token:{legacy_digest}",
+        600,
+        json.dumps({"user_id": user_id, "fingerprint": "tablet"}),
+    )
+    await cluster.sadd(f"user_sessions:{user_id}", legacy_digest)
+
+    assert (await repository.get_token_data(legacy_token))["fingerprint"] == "tablet"
+
+    new_token = create_refresh_token(user_id)
+    assert await repository.rotate_token(user_id, legacy_token, new_token, "tablet", ttl=600)
+    assert not await repository.rotate_token(user_id, legacy_token, create_refresh_token(user_id), "tablet", ttl=600)
+    assert await repository.get_token_data(legacy_token) is None
+    assert await repository.get_token_data(new_token) == {"user_id": user_id, "fingerprint": "tablet"}
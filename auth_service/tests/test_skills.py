@@ -1,8 +1,18 @@
+import io
+import json
+from datetime import datetime
 from uuid import uuid4
 
 import pytest
 
-from auth_service.tests.helpers import login_user
+from auth_service.src.application.skill_service import SkillService
+from auth_service.src.infrastructure.repositories.profile_cache import build_profile_cache
+from auth_service.src.infrastructure.repositories.skill_repository import SkillRepository
+from auth_service.src.infrastructure.repositories.user_repository import UserRepository
+from auth_service.src.presentation.schemas import MAX_USER_SKILLS
+from auth_service.src.presentation.serializers import to_user_data, to_user_read
+from auth_service.src.skill_catalog import read_rows
+from auth_service.tests.helpers import capture_sql, login_user
 
 
 async def create_skill(client, headers, *, name: str, slug: str, group: str = "backend") -> dict:
@@ -193,3 +203,130 @@ async def test_user_skill_missing_resources_return_404(client, verified_user):
 
     unknown_user = await client.get(f"/users/{uuid4()}/skills")
     assert unknown_user.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_user_skill_additions_stop_at_the_profile_limit(client, verified_user, db_session, redis_client):
+    user_data, _ = verified_user
+    tokens = await login_user(client, user_data["email"], user_data["password"])
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    repository = SkillRepository(db_session)
+    service = SkillService(repository, UserRepository(db_session), build_profile_cache(redis_client))
+    await service.import_skills(
+        (line, {"name": f"Skill {line}", "slug": f"skill-{line}"}) for line in range(MAX_USER_SKILLS + 1)
+    )
+    skills = await repository.list_skills(search=None, group=None, limit=MAX_USER_SKILLS + 1, offset=0)
+    *allowed, extra = [str(skill.id) for skill in skills]
+
+    replaced = await client.put(
+        "/users/me/skills",
+        json={"skills": [{"skill_id": skill_id, "level": 1} for skill_id in allowed]},
+        headers=headers,
+    )
+    assert replaced.status_code == 200
+    assert len(replaced.json()) == MAX_USER_SKILLS
+
+    over_limit = await client.post("/users/me/skills", json={"skill_id": extra, "level": 1}, headers=headers)
+    assert over_limit.status_code == 409
+    assert over_limit.json()["detail"] == f"A user can have at most {MAX_USER_SKILLS} skills"
+
+    assert (await client.delete(f"/users/me/skills/{allowed[0]}", headers=headers)).status_code == 204
+    added = await client.post("/users/me/skills", json={"skill_id": extra, "level": 1}, headers=headers)
+    assert added.status_code == 201
+    assert len(added.json()) == MAX_USER_SKILLS
+
+
+@pytest.mark.asyncio
+async def test_profile_json_matches_orm_serialization(client, verified_user, db_session):
+    user_data, user = verified_user
+    tokens = await login_user(client, user_data["email"], user_data["password"])
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    python = await create_skill(client, headers, name="Python", slug="python")
+    figma = await create_skill(client, headers, name="Figma", slug="figma", group="design")
+    replaced = await client.put(
+        "/users/me/skills",
+        json={"skills": [{"skill_id": python["id"], "level": 4}, {"skill_id": figma["id"], "level": 1}]},
+        headers=headers,
+    )
+    assert replaced.status_code == 200
+
+    repository = UserRepository(db_session)
+    db_session.expunge_all()
+    stored = await repository.get_by_id(user.id)
+    async with capture_sql(db_session) as statements:
+        public_payload = await repository.get_profile_json(user.id)
+        private_payload = await repository.get_profile_json(user.id, private=True)
+    assert len(statements) == 2
+    assert await repository.get_profile_json(uuid4()) is None
+
+    public = await client.get(f"/users/{user.id}")
+    private = await client.get("/users/me", headers=headers)
+    assert public.content == public_payload
+    assert private.content == private_payload
+
+    assert public.json() == to_user_read(stored).model_dump(mode="json")
+    private_json = private.json()
+    expected_private = to_user_data(stored).model_dump(mode="json")
+    # Postgres and pydantic may spell the same timestamp differently.
+    assert datetime.fromisoformat(private_json.pop("created_at")) == stored.created_at
+    expected_private.pop("created_at")
+    assert private_json == expected_private
+    assert [item["skill"]["slug"] for item in public.json()["skills"]] == ["python", "figma"]
+
+
+@pytest.mark.asyncio
+async def test_skill_catalog_import_merges_by_slug_and_export_streams_ndjson(
+        client, verified_user, db_session, redis_client
+):
+    user_data, user = verified_user
+    tokens = await login_user(client, user_data["email"], user_data["password"])
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    python = await create_skill(client, headers, name="Python", slug="python")
+    await create_skill(client, headers, name="FastAPI", slug="fastapi")
+    await client.post("/users/me/skills", json={"skill_id": python["id"], "level": 3}, headers=headers)
+    assert (await client.get(f"/users/{user.id}")).json()["skills"][0]["skill"]["name"] == "Python"
+
+    ndjson = "\n".join([
+        '{"name": "Python 3", "slug": "python", "group": "backend"}',
+        '{"name": "FastAPI", "slug": "fastapi", "group": "backend"}',
+        '{"name": "Go", "slug": "go", "group": "backend"}',
+        '{"name": "Golang", "slug": "go", "group": "backend"}',
+        '{"name": "FastAPI", "slug": "fast-api"}',
+        '{"name": "Rust", "slug": "Not A Slug"}',
+        "not json",
+        "",
+    ])
+    service = SkillService(SkillRepository(db_session), UserRepository(db_session), build_profile_cache(redis_client))
+    report = await service.import_skills(read_rows(io.StringIO(ndjson), "ndjson"))
+
+    assert report.model_dump(exclude={"errors"}) == {
+        "received": 7,
+        "invalid": 2,
+        "inserted": 1,
+        "updated": 1,
+        "unchanged": 1,
+        "conflicts": 1,
+    }
+    assert [error.split(":")[0] for error in report.errors] == ["line 6", "line 7"]
+
+    profile = await client.get(f"/users/{user.id}")
+    assert profile.json()["skills"][0]["skill"]["name"] == "Python 3"
+
+    exported = await client.get("/skills/export")
+    assert exported.status_code == 200
+    assert exported.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in exported.text.splitlines()]
+    assert [(row["slug"], row["name"], row["group"]) for row in rows] == [
+        ("fastapi", "FastAPI", "backend"),
+        ("go", "Golang", "backend"),
+        ("python", "Python 3", "backend"),
+    ]
+    assert rows[2]["id"] == python["id"]
+
+
+def test_skill_catalog_reads_csv_rows_lazily_with_defaults():
+    rows = read_rows(io.StringIO("id,name,slug,group\n,Python,python,\n,Figma,figma,design\n"), "csv")
+
+    assert next(rows) == (2, {"name": "Python", "slug": "python"})
+    assert list(rows) == [(3, {"name": "Figma", "slug": "figma", "group": "design"})]
@@ -0,0 +1,77 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import grpc
+import httpx
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until(check, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if check():
+                return
+        except (httpx.HTTPError, grpc.FutureTimeoutError):
+            pass
+        time.sleep(0.2)
+    raise AssertionError("Supervisor workers did not become ready")
+
+
+def _grpc_ready(port: int) -> bool:
+    with grpc.insecure_channel(f"127.0.0.1:{port}") as channel:
+        grpc.channel_ready_future(channel).result(timeout=1)
+    return True
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX signals are required")
+def test_supervisor_serves_http_and_grpc_and_drains_on_sigterm():
+    http_port, grpc_port = _free_port(), _free_port()
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(REPO_ROOT),
+        "APP_HOST": "127.0.0.1",
+        "APP_PORT": str(http_port),
+        "GRPC_PORT": str(grpc_port),
+        "HTTP_WORKERS": "2",
+        "GRPC_WORKERS": "2",
+        "SHUTDOWN_GRACE_SECONDS": "2",
+        "LOG_LEVEL": "warning",
+    }
+    supervisor = subprocess.Popen([sys.executable, "-m", "auth_service.src.supervisor"], cwd=REPO_ROOT, env=env)
+    try:
+        _wait_until(lambda: httpx.get(f"http://127.0.0.1:{http_port}/health").status_code == 200)
+        _wait_until(lambda: _grpc_ready(grpc_port))
+
+        supervisor.send_signal(signal.SIGTERM)
+        assert supervisor.wait(timeout=30) == 0
+    finally:
+        if supervisor.poll() is None:
+            supervisor.kill()
+            supervisor.wait()
+
+
+def test_supervisor_splits_password_hashing_cores_between_http_workers(monkeypatch):
+    from auth_service.src import supervisor
+    from auth_service.src.infrastructure.config import settings
+
+    monkeypatch.setattr(supervisor.os, "cpu_count", lambda: 8)
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", None)
+    assert supervisor.Supervisor(4, 1, 1).hash_workers == 2
+    assert supervisor.Supervisor(16, 1, 1).hash_workers == 1
+
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 3)
+    assert supervisor.Supervisor(4, 1, 1).hash_workers == 3
@@ -1,3 +1,4 @@
+import json
 from datetime import UTC, datetime
 from types import SimpleNamespace
 from uuid import uuid4
@@ -7,7 +8,9 @@ from fastapi import HTTPException
 from sqlalchemy.exc import IntegrityError
 
 from auth_service.src.application.user_service import AccessType, UserService
+from auth_service.src.infrastructure.config import settings
 from auth_service.src.infrastructure.exceptions import UserDoesNotExist
+from auth_service.src.presentation.serializers import encode_follow_cursor
 
 
 class TokenRepositoryStub:
@@ -27,16 +30,30 @@ class UserRepositoryStub:
         self.raise_missing = False
         self.raise_integrity = False
         self.follow_args = None
+        self.unfollow_result = True
         self.followers_args = None
         self.following_args = None
+        self.profile_args = None
+        self.neighbour_ids = []
 
     async def get_by_id(self, user_id):
         if self.raise_missing:
             raise UserDoesNotExist
         return self.user
 
+    async def get_profile_json(self, user_id, private=False):
+        self.profile_args = (user_id, private)
+        if self.raise_missing:
+            return None
+        return b'{"id": "%s"}' % str(user_id).encode()
+
+    async def get_profiles_json(self, user_ids):
+        self.profiles_args = list(user_ids)
+        return {user_id: b'{"id": "%s"}' % str(user_id).encode() for user_id in user_ids if user_id == self.user.id}
+
     async def delete(self, user_id):
         self.deleted_user_id = user_id
+        return self.neighbour_ids
 
     async def commit(self):
         self.commits += 1
@@ -55,16 +72,35 @@ class UserRepositoryStub:
             raise IntegrityError("insert", {}, Exception("duplicate"))
         self.follow_args = (user_id, follower_id)
 
+    async def unfollow(self, user_id, follower_id):
+        return self.unfollow_result
+
     async def rollback(self):
         self.rolled_back = True
 
-    async def get_followers(self, user_id, limit, offset):
-        self.followers_args = (user_id, limit, offset)
-        return [self.user]
+    async def get_followers(self, user_id, limit, offset, after):
+        self.followers_args = (user_id, limit, offset, after)
+        return [(self.user, self.user.created_at)]
+
+    async def get_following(self, user_id, limit, offset, after):
+        self.following_args = (user_id, limit, offset, after)
+        return [(self.user, self.user.created_at)]
+
+
+class ProfileCacheStub:
+    def __init__(self):
+        self.invalidated = []
+        self.loads = 0
+
+    async def get_or_load(self, user_id, loader):
+        self.loads += 1
+        return await loader()
+
+    async def invalidate(self, *user_ids):
+        self.invalidated.append(user_ids)
 
-    async def get_following(self, user_id, limit, offset):
-        self.following_args = (user_id, limit, offset)
-        return [self.user]
+    def invalidate_in_background(self, *user_ids):
+        self.invalidated.append(("background", *user_ids))
 
 
 def _user(user_id):
@@ -98,10 +134,11 @@ async def test_user_service_get_edit_delete_and_pagination_paths():
     assert not hasattr(public_user, "email")
     assert private_user.email == "unit@test.com"
     assert edited.bio == "Updated bio"
-    assert followers[0].username == "unit"
-    assert following[0].username == "unit"
-    assert user_repository.followers_args == (user_id, 10, 20)
-    assert user_repository.following_args == (user_id, 5, 5)
+    assert followers.items[0].username == "unit"
+    assert following.items[0].username == "unit"
+    assert followers.next_cursor is None
+    assert user_repository.followers_args == (user_id, 11, 20, None)
+    assert user_repository.following_args == (user_id, 6, 5, None)
     assert deleted == {"msg": "Account deleted"}
     assert token_repository.deleted_user_id == str(user_id)
     assert user_repository.deleted_user_id == user_id
@@ -135,3 +172,134 @@ async def test_user_service_maps_missing_user_and_follow_errors():
 
     assert duplicate_follow.value.status_code == 400
     assert user_repository.rolled_back is True
+
+
+@pytest.mark.asyncio
+async def test_user_service_unfollow_requires_existing_subscription():
+    user_id = uuid4()
+    user_repository = UserRepositoryStub(_user(user_id))
+    service = UserService(user_repository, TokenRepositoryStub())
+
+    assert await service.unfollow_user(user_id, uuid4()) == {"msg": "Unsubscribed successfully"}
+    assert user_repository.commits == 1
+
+    user_repository.unfollow_result = False
+    with pytest.raises(HTTPException) as missing:
+        await service.unfollow_user(user_id, uuid4())
+    assert missing.value.status_code == 404
+    assert user_repository.commits == 1
+
+
+@pytest.mark.asyncio
+async def test_user_service_follow_pages_use_keyset_cursor():
+    user_id = uuid4()
+    user = _user(user_id)
+    user.created_at = datetime(2026, 1, 1, 12, 30)
+    calls = []
+
+    class PagedRepository(UserRepositoryStub):
+        async def get_followers(self, requested_user_id, limit, offset, after):
+            calls.append((requested_user_id, limit, offset, after))
+            return [(user, user.created_at)] * limit
+
+    service = UserService(PagedRepository(user), TokenRepositoryStub())
+
+    first_page = await service.get_followers(user_id, page=1, limit=1)
+    assert len(first_page.items) == 1
+    assert first_page.next_cursor
+
+    await service.get_followers(user_id, page=7, limit=1, cursor=first_page.next_cursor)
+    assert calls == [
+        (user_id, 2, 0, None),
+        (user_id, 2, 0, (user.created_at, user_id)),
+    ]
+
+    with pytest.raises(HTTPException) as invalid_cursor:
+        await service.get_followers(user_id, page=1, limit=1, cursor="not-a-cursor")
+    assert invalid_cursor.value.status_code == 400
+
+    aware_cursor = encode_follow_cursor(datetime.now(UTC), user_id)
+    with pytest.raises(HTTPException) as aware:
+        await service.get_followers(user_id, page=1, limit=1, cursor=aware_cursor)
+    assert aware.value.status_code == 400
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_user_service_renders_profile_json_in_the_database(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_JSON_AGGREGATION", True)
+    user_id = uuid4()
+    user_repository = UserRepositoryStub(_user(user_id))
+    service = UserService(user_repository, TokenRepositoryStub())
+
+    assert await service.get_user_json(user_id) == b'{"id": "%s"}' % str(user_id).encode()
+    assert user_repository.profile_args == (user_id, False)
+
+    await service.get_user_json(user_id, access_type=AccessType.PRIVATE)
+    assert user_repository.profile_args == (user_id, True)
+
+    user_repository.raise_missing = True
+    with pytest.raises(HTTPException) as missing:
+        await service.get_user_json(user_id)
+    assert missing.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_user_service_profile_json_falls_back_to_orm_serialization(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_JSON_AGGREGATION", False)
+    user_id = uuid4()
+    user_repository = UserRepositoryStub(_user(user_id))
+    service = UserService(user_repository, TokenRepositoryStub())
+
+    payload = json.loads(await service.get_user_json(user_id, access_type=AccessType.PRIVATE))
+
+    assert payload["id"] == str(user_id)
+    assert payload["email"] == "unit@test.com"
+    assert user_repository.profile_args is None
+
+
+@pytest.mark.asyncio
+async def test_user_service_invalidates_cached_profiles_after_writes(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_JSON_AGGREGATION", True)
+    user_id = uuid4()
+    follower_id = uuid4()
+    user_repository = UserRepositoryStub(_user(user_id))
+    user_repository.neighbour_ids = [follower_id]
+    profile_cache = ProfileCacheStub()
+    service = UserService(user_repository, TokenRepositoryStub(), profile_cache=profile_cache)
+
+    await service.get_user_json(user_id)
+    await service.get_user_json(user_id, access_type=AccessType.PRIVATE)
+    assert profile_cache.loads == 1
+
+    await service.edit_user(user_id, "Bio")
+    await service.follow_user(user_id, follower_id)
+    await service.unfollow_user(user_id, follower_id)
+    await service.delete_user(user_id)
+
+    assert profile_cache.invalidated == [
+        (user_id,),
+        (user_id, follower_id),
+        (user_id, follower_id),
+        (user_id,),
+        ("background", follower_id),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_user_service_batch_lookup_keeps_request_order_and_flags_missing(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_JSON_AGGREGATION", True)
+    user_id = uuid4()
+    missing_id = uuid4()
+    user_repository = UserRepositoryStub(_user(user_id))
+    service = UserService(user_repository, TokenRepositoryStub())
+
+    results = await service.get_users_batch([missing_id, user_id, missing_id, user_id])
+
+    assert [(requested_id, profile is not None) for requested_id, profile in results] == [
+        (missing_id, False),
+        (user_id, True),
+        (missing_id, False),
+        (user_id, True),
+    ]
+    assert user_repository.profiles_args == [missing_id, user_id]
@@ -1,8 +1,12 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
 import pytest
-from sqlalchemy import select
+from sqlalchemy import select, update
 
-from auth_service.src.infrastructure.models import UserDB
-from auth_service.tests.helpers import login_user
+from auth_service.src.infrastructure.models import Subscription, UserDB
+from auth_service.src.infrastructure.repositories.user_repository import UserRepository
+from auth_service.tests.helpers import capture_sql, login_user
 
 
 @pytest.mark.asyncio
@@ -81,3 +85,234 @@ async def test_private_fields_are_not_returned_from_public_profile(client, verif
     response = await client.get(f"/users/{user.id}")
     assert response.status_code == 200
     assert "email" not in response.json()
+
+
+@pytest.mark.asyncio
+async def test_follow_counters_follow_unfollow_reconcile_and_delete(client, verified_user, db_session):
+    user1_data, user1 = verified_user
+    user1_id = user1.id
+    user2_payload = {
+        "email": "counter-target@test.com",
+        "username": "counter_target",
+        "password": "Strong_password-33",
+    }
+    await client.post("/auth/register", json=user2_payload)
+    user2 = (await db_session.execute(select(UserDB).where(UserDB.email == user2_payload["email"]))).scalar_one()
+    user2_id = user2.id
+
+    tokens = await login_user(client, user1_data["email"], user1_data["password"])
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    async def counters(user_id):
+        body = (await client.get(f"/users/{user_id}")).json()
+        return body["followers_count"], body["following_count"]
+
+    assert (await client.post(f"/users/{user2_id}/follow", headers=headers)).status_code == 200
+    assert await counters(user2_id) == (1, 0)
+    assert await counters(user1_id) == (0, 1)
+
+    assert (await client.delete(f"/users/{user2_id}/follow", headers=headers)).status_code == 200
+    assert (await client.delete(f"/users/{user2_id}/follow", headers=headers)).status_code == 404
+    assert await counters(user2_id) == (0, 0)
+    assert await counters(user1_id) == (0, 0)
+
+    assert (await client.post(f"/users/{user2_id}/follow", headers=headers)).status_code == 200
+    await db_session.execute(update(UserDB).where(UserDB.id == user2_id).values(followers_count=42))
+    await db_session.commit()
+
+    fixed, last_id = await UserRepository(db_session).reconcile_follow_counters(None, 100)
+    await db_session.commit()
+    assert fixed == 1
+    assert last_id is not None
+    assert await counters(user2_id) == (1, 0)
+
+    assert (await client.delete("/users/me", headers=headers)).status_code == 200
+    assert await counters(user2_id) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_followers_are_paginated_with_keyset_cursor(client, verified_user, db_session):
+    _, author = verified_user
+    followed_at = datetime(2026, 1, 1)
+    followers = []
+    for index in range(3):
+        follower = UserDB(
+            id=uuid4(),
+            email=f"cursor{index}@test.com",
+            username=f"cursor_{index}",
+            hashed_password="not-used",
+            is_verified=True,
+        )
+        db_session.add(follower)
+        await db_session.flush()
+        db_session.add(
+            Subscription(
+                subscriber_id=follower.id,
+                author_id=author.id,
+                created_at=followed_at + timedelta(minutes=index),
+            )
+        )
+        followers.append(follower.id)
+    await db_session.commit()
+
+    first = await client.get(f"/users/{author.id}/followers", params={"limit": 2})
+    assert first.status_code == 200
+    assert [item["id"] for item in first.json()] == [str(followers[2]), str(followers[1])]
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = await client.get(f"/users/{author.id}/followers", params={"limit": 2, "cursor": cursor})
+    assert second.status_code == 200
+    assert [item["id"] for item in second.json()] == [str(followers[0])]
+    assert "X-Next-Cursor" not in second.headers
+
+    legacy = await client.get(f"/users/{author.id}/followers", params={"limit": 2, "page": 2})
+    assert [item["id"] for item in legacy.json()] == [str(followers[0])]
+
+    invalid = await client.get(f"/users/{author.id}/followers", params={"cursor": "garbage"})
+    assert invalid.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_hot_user_lookups_use_narrow_projections(verified_user, db_session):
+    payload, user = verified_user
+    repository = UserRepository(db_session)
+    db_session.expunge_all()
+
+    async with capture_sql(db_session) as statements:
+        assert await repository.exists(user.id) is True
+        assert await repository.get_existing_ids([user.id, uuid4()]) == {user.id}
+        found = await repository.get_by_email(payload["email"])
+        await repository.mark_as_verified(user.id)
+
+    assert found.id == user.id
+    assert found.hashed_password == user.hashed_password
+    assert found.is_verified is True
+    assert len(statements) == 4
+    for statement in statements:
+        for heavy_column in ("users.username", "users.bio", "users.created_at", "followers_count", "following_count"):
+            assert heavy_column not in statement, statement
+
+
+@pytest.mark.asyncio
+async def test_users_batch_returns_profiles_in_request_order(client, verified_user, db_session):
+    _, user = verified_user
+    missing_id = str(uuid4())
+    requested = [missing_id, str(user.id), missing_id]
+
+    async with capture_sql(db_session) as statements:
+        first = await client.post("/users/batch", json={"ids": requested})
+    assert first.status_code == 200
+    assert len([statement for statement in statements if "FROM users" in statement]) == 1
+
+    items = first.json()["items"]
+    assert [(item["id"], item["found"]) for item in items] == [
+        (missing_id, False),
+        (str(user.id), True),
+        (missing_id, False),
+    ]
+    assert items[0]["user"] is None
+    assert items[1]["user"] == (await client.get(f"/users/{user.id}")).json()
+
+    async with capture_sql(db_session) as statements:
+        cached = await client.post("/users/batch", json={"ids": [str(user.id)]})
+    assert cached.json()["items"][0]["user"]["username"] == user.username
+    assert not [statement for statement in statements if "FROM users" in statement]
+
+    assert (await client.post("/users/batch", json={"ids": []})).status_code == 422
+    oversized = {"ids": [str(uuid4()) for _ in range(301)]}
+    assert (await client.post("/users/batch", json=oversized)).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_follow_counters_lock_both_users_in_primary_key_order(verified_user, db_session):
+    _, author = verified_user
+    follower = UserDB(
+        id=uuid4(),
+        email="locking@test.com",
+        username="locking_user",
+        hashed_password="not-used",
+        is_verified=True,
+    )
+    db_session.add(follower)
+    await db_session.flush()
+    repository = UserRepository(db_session)
+
+    async with capture_sql(db_session) as statements:
+        await repository.follow(user_id=author.id, follower_id=follower.id)
+        assert await repository.unfollow(user_id=author.id, follower_id=follower.id) is True
+
+    locks = [index for index, statement in enumerate(statements) if "ORDER BY users.id FOR NO KEY UPDATE" in statement]
+    updates = [index for index, statement in enumerate(statements) if statement.startswith("UPDATE users")]
+    assert len(locks) == len(updates) == 2
+    assert [index + 1 for index in locks] == updates
+
+
+@pytest.mark.asyncio
+async def test_account_deletion_locks_itself_then_neighbours_in_primary_key_order(verified_user, db_session):
+    _, user = verified_user
+    neighbours = [
+        UserDB(
+            id=uuid4(),
+            email=f"neighbour{index}@test.com",
+            username=f"neighbour_{index}",
+            hashed_password="not-used",
+            is_verified=True,
+        )
+        for index in range(3)
+    ]
+    db_session.add_all(neighbours)
+    await db_session.flush()
+    repository = UserRepository(db_session)
+    await repository.follow(user_id=neighbours[0].id, follower_id=user.id)
+    await repository.follow(user_id=user.id, follower_id=neighbours[1].id)
+    await repository.follow(user_id=user.id, follower_id=neighbours[2].id)
+
+    async with capture_sql(db_session) as statements:
+        neighbour_ids = await repository.delete(user.id)
+
+    assert sorted(neighbour_ids) == sorted(neighbour.id for neighbour in neighbours)
+    own_lock = next(index for index, statement in enumerate(statements) if statement.endswith("FOR UPDATE"))
+    neighbour_lock = next(
+        index for index, statement in enumerate(statements) if "ORDER BY users.id FOR NO KEY UPDATE" in statement
+    )
+    updates = [index for index, statement in enumerate(statements) if statement.startswith("UPDATE users")]
+    assert own_lock < neighbour_lock < min(updates)
+    assert len(updates) == 2
+
+
+@pytest.mark.asyncio
+async def test_deleted_user_token_is_rejected_on_every_write_route(client, verified_user):
+    user_data, _ = verified_user
+    other = await client.post(
+        "/auth/register",
+        json={"email": "other@test.com", "username": "other_user", "password": "Strong_password-33"},
+    )
+    tokens = await login_user(client, user_data["email"], user_data["password"])
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert (await client.patch("/users/me", json={"bio": "still here"}, headers=headers)).status_code == 200
+
+    assert (await client.delete("/users/me", headers=headers)).status_code == 200
+
+    other_id = other.json()["id"]
+    skill_id = str(uuid4())
+    writes = [
+        ("PATCH", "/users/me", {"bio": "ghost"}),
+        ("DELETE", "/users/me", None),
+        ("POST", "/users/me/skills", {"skill_id": skill_id, "level": 1}),
+        ("PUT", "/users/me/skills", {"skills": []}),
+        ("PATCH", f"/users/me/skills/{skill_id}", {"level": 2}),
+        ("DELETE", f"/users/me/skills/{skill_id}", None),
+        ("POST", "/skills/", {"name": "Ghost", "slug": "ghost"}),
+        ("POST", f"/users/{other_id}/follow", None),
+        ("DELETE", f"/users/{other_id}/follow", None),
+        ("DELETE", "/auth/logout-all", None),
+    ]
+    for method, path, body in writes:
+        response = await client.request(method, path, json=body, headers=headers)
+        assert response.status_code == 401, (method, path, response.text)
+        assert response.json()["detail"] == "User not found"
+
+    logout = await client.request(
+        "DELETE", "/auth/logout", json={"refresh_token": tokens["refresh_token"]}, headers=headers
+    )
+    assert logout.status_code == 401
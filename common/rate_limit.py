@@ -0,0 +1,322 @@
+import json
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Literal
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+from redis.asyncio import Redis
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+ERROR_LOG_INTERVAL_SECONDS = 10.0
+
+
+class RateLimitRule(BaseModel):
+    name: str
+    path: str = "/"
+    methods: list[str] = []
+    scope: Literal["ip", "user"] = "ip"
+    limit: int = Field(ge=1)
+    period_seconds: float = Field(default=60, gt=0)
+
+
+class BucketState:
+    __slots__ = ("allowed", "remaining", "retry_after_ms", "reset_after_ms")
+
+    def __init__(self, allowed: bool, remaining: int, retry_after_ms: int, reset_after_ms: int):
+        self.allowed = allowed
+        self.remaining = remaining
+        self.retry_after_ms = retry_after_ms
+        self.reset_after_ms = reset_after_ms
+
+
+class TokenBucketLimiter:
+    # Judges every bucket a request falls into in one round trip. ARGV[1] is
+    # the cost, followed by (capacity, rate, deferred) for each key; deferred
+    # carries requests that were admitted locally since the last sync and is
+    # charged unconditionally. The cost is only taken when every bucket can
+    # pay it, so a request rejected by one rule does not drain the others.
+    _TAKE_SCRIPT = """
+    local cost = tonumber(ARGV[1])
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) * 1000 + tonumber(clock[2]) / 1000
+    local buckets = {}
+    local admitted = true
+    for i, key in ipairs(KEYS) do
+        local capacity = tonumber(ARGV[i * 3 - 1])
+        local rate = tonumber(ARGV[i * 3])
+        local deferred = tonumber(ARGV[i * 3 + 1])
+        local state = redis.call('HMGET', key, 'tokens', 'ts')
+        local tokens = tonumber(state[1]) or capacity
+        local ts = tonumber(state[2]) or now
+        tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate) - deferred
+        if tokens < -capacity then
+            tokens = -capacity
+        end
+        if tokens < cost then
+            admitted = false
+        end
+        buckets[i] = {capacity, rate, tokens}
+    end
+    local result = {}
+    for i, key in ipairs(KEYS) do
+        local capacity, rate, tokens = buckets[i][1], buckets[i][2], buckets[i][3]
+        local allowed = 0
+        local retry_after = 0
+        if tokens >= cost then
+            allowed = 1
+        else
+            retry_after = math.ceil((cost - tokens) / rate)
+        end
+        if admitted then
+            tokens = tokens - cost
+        end
+        local reset_after = math.ceil((capacity - tokens) / rate)
+        redis.call('HSET', key, 'tokens', string.format('%.6f', tokens), 'ts', string.format('%.3f', now))
+        redis.call('PEXPIRE', key, reset_after + 1000)
+        table.insert(result, {allowed, math.floor(math.max(tokens, 0)), retry_after, reset_after})
+    end
+    return result
+    """
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+        self._take_script = redis.register_script(self._TAKE_SCRIPT)
+
+    async def take(self, buckets: list[tuple[str, RateLimitRule, int]]) -> list[BucketState]:
+        args: list[float] = [1]
+        for _, rule, deferred in buckets:
+            args += [rule.limit, rule.limit / (rule.period_seconds * 1000), deferred]
+        results = await self._take_script(keys=[f"ratelimit:{key}" for key, _, _ in buckets], args=args)
+        return [
+            BucketState(bool(allowed), int(remaining), int(retry_after_ms), int(reset_after_ms))
+            for allowed, remaining, retry_after_ms, reset_after_ms in results
+        ]
+
+
+class LocalPrefilter:
+    # Remembers the last budget Redis reported for each bucket and admits a
+    # share of it in-process. The admitted requests are charged to Redis on
+    # the next sync, so a busy client is reconciled at least every
+    # sync_seconds and a quiet one never needs Redis twice in a row.
+    #
+    # Each process admits on its own: with P processes and a per-process
+    # share s, a client can get up to P * s of its remaining budget within
+    # one sync window before Redis sees it. build_rate_limit_prefilter divides
+    # the configured share by P, which keeps the overshoot below that share
+    # of the remaining budget. Rules under min_limit always go to Redis
+    # because even that is a large part of a small limit.
+    def __init__(self, share: float, sync_seconds: float, max_keys: int, min_limit: int = 0):
+        self.share = share
+        self.sync_seconds = sync_seconds
+        self.max_keys = max_keys
+        self.min_limit = min_limit
+        self._entries: OrderedDict[str, list] = OrderedDict()
+
+    def covers(self, rule: RateLimitRule) -> bool:
+        return self.share > 0 and rule.limit >= self.min_limit
+
+    def admit(self, key: str) -> BucketState | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        remaining, synced_at, pending, reset_after_ms = entry
+        elapsed = time.monotonic() - synced_at
+        if elapsed >= self.sync_seconds or pending + 1 > remaining * self.share:
+            return None
+
+        entry[2] = pending + 1
+        self._entries.move_to_end(key)
+        return BucketState(True, remaining - pending - 1, 0, max(0, reset_after_ms - int(elapsed * 1000)))
+
+    def pending(self, key: str) -> int:
+        entry = self._entries.get(key)
+        return entry[2] if entry is not None else 0
+
+    def record(self, key: str, state: BucketState) -> None:
+        self._entries[key] = [state.remaining, time.monotonic(), 0, state.reset_after_ms]
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_keys:
+            self._entries.popitem(last=False)
+
+
+class RateLimitMiddleware:
+    def __init__(
+            self,
+            app: ASGIApp,
+            rules: list[RateLimitRule],
+            redis_factory: Callable[[], Redis],
+            user_id_decoder: Callable[[str], UUID] | None = None,
+            exempt_paths: list[str] | None = None,
+            prefilter: LocalPrefilter | None = None,
+            trust_forwarded: bool = False,
+            trusted_proxies: int = 1,
+    ):
+        self.app = app
+        self.rules = rules
+        self.redis_factory = redis_factory
+        self.user_id_decoder = user_id_decoder
+        self.exempt_paths = set(exempt_paths or ())
+        self.prefilter = prefilter
+        self.trust_forwarded = trust_forwarded
+        self.trusted_proxies = trusted_proxies
+        self._last_error_logged = 0.0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        decision = await self._check(scope)
+        if decision is None:
+            await self.app(scope, receive, send)
+            return
+
+        rule, state = decision
+        headers = _rate_limit_headers(rule, state)
+        if not state.allowed:
+            await _send_too_many_requests(send, headers, state)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), *headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    async def _check(self, scope: Scope) -> tuple[RateLimitRule, BucketState] | None:
+        method = scope["method"]
+        path = scope["path"]
+        identities = {"ip": self._client_ip(scope), "user": None}
+        if any(rule.scope == "user" for rule in self.rules):
+            identities["user"] = self._user_id(scope)
+
+        decisions: list[tuple[RateLimitRule, BucketState]] = []
+        remote: list[tuple[RateLimitRule, str, LocalPrefilter | None]] = []
+        for rule in self.rules:
+            if not path.startswith(rule.path) or (rule.methods and method not in rule.methods):
+                continue
+            identity = identities[rule.scope]
+            if identity is None:
+                continue
+
+            key = f"{rule.name}:{rule.scope}:{identity}"
+            prefilter = self.prefilter if self.prefilter is not None and self.prefilter.covers(rule) else None
+            state = prefilter.admit(key) if prefilter is not None else None
+            if state is None:
+                remote.append((rule, key, prefilter))
+            else:
+                decisions.append((rule, state))
+
+        if remote:
+            try:
+                limiter = TokenBucketLimiter(self._redis(scope))
+                states = await limiter.take([
+                    (key, rule, prefilter.pending(key) if prefilter is not None else 0)
+                    for rule, key, prefilter in remote
+                ])
+            except Exception:
+                self._log_failure()
+            else:
+                for (rule, key, prefilter), state in zip(remote, states, strict=True):
+                    if prefilter is not None:
+                        prefilter.record(key, state)
+                    decisions.append((rule, state))
+
+        if not decisions:
+            return None
+        denied = [decision for decision in decisions if not decision[1].allowed]
+        if denied:
+            return max(denied, key=lambda decision: decision[1].retry_after_ms)
+        return min(decisions, key=lambda decision: decision[1].remaining)
+
+    def _redis(self, scope: Scope) -> Redis:
+        # Resolve Redis the way routes do, so dependency overrides apply.
+        app = scope.get("app")
+        overrides = getattr(app, "dependency_overrides", {})
+        return overrides.get(self.redis_factory, self.redis_factory)()
+
+    def _client_ip(self, scope: Scope) -> str:
+        if self.trust_forwarded:
+            # Proxies append the address they received the request from, so
+            # everything left of what our own proxies added is client-supplied.
+            forwarded = [
+                entry.strip()
+                for name, value in scope["headers"]
+                if name == b"x-forwarded-for"
+                for entry in value.decode("latin-1").split(",")
+                if entry.strip()
+            ]
+            if len(forwarded) >= self.trusted_proxies:
+                return forwarded[-self.trusted_proxies]
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def _log_failure(self) -> None:
+        now = time.monotonic()
+        if now - self._last_error_logged >= ERROR_LOG_INTERVAL_SECONDS:
+            self._last_error_logged = now
+            logger.warning("Rate limiter is unavailable, letting requests through", exc_info=True)
+
+    def _user_id(self, scope: Scope) -> UUID | None:
+        if self.user_id_decoder is None:
+            return None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() != "bearer" or not token:
+                    return None
+                try:
+                    return self.user_id_decoder(token)
+                except Exception:
+                    return None
+        return None
+
+
+def _rate_limit_headers(rule: RateLimitRule, state: BucketState) -> list[tuple[bytes, bytes]]:
+    period = math.ceil(rule.period_seconds)
+    return [
+        (b"ratelimit-limit", str(rule.limit).encode()),
+        (b"ratelimit-remaining", str(state.remaining).encode()),
+        (b"ratelimit-reset", str(math.ceil(state.reset_after_ms / 1000)).encode()),
+        (b"ratelimit-policy", f"{rule.limit};w={period}".encode()),
+    ]
+
+
+async def _send_too_many_requests(send: Send, headers: list[tuple[bytes, bytes]], state: BucketState) -> None:
+    body = json.dumps({"detail": "Too many requests"}).encode()
+    retry_after = max(1, math.ceil(state.retry_after_ms / 1000))
+    await send({
+        "type": "http.response.start",
+        "status": 429,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(retry_after).encode()),
+            *headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def build_rate_limit_prefilter(
+        share: float,
+        sync_seconds: float,
+        max_keys: int,
+        min_limit: int = 0,
+        processes: int = 1,
+) -> LocalPrefilter | None:
+    if not share:
+        return None
+    return LocalPrefilter(
+        share=share / processes,
+        sync_seconds=sync_seconds,
+        max_keys=max_keys,
+        min_limit=min_limit,
+    )
@@ -0,0 +1,35 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, Callable, Mapping
+
+logger = logging.getLogger(__name__)
+
+StatsSource = Callable[[], Mapping[str, object]]
+
+
+def log_stats(sources: Mapping[str, StatsSource]) -> None:
+    for name, snapshot in sources.items():
+        try:
+            logger.info("%s stats: %s", name, snapshot())
+        except Exception:
+            logger.exception("Failed to collect %s stats", name)
+
+
+@asynccontextmanager
+async def periodic_stats_log(sources: Mapping[str, StatsSource], interval_seconds: float) -> AsyncIterator[None]:
+    # Counters are process-local, so every worker logs its own at each
+    # interval and once more when it shuts down.
+    async def run() -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            log_stats(sources)
+
+    task = asyncio.create_task(run())
+    try:
+        yield
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+        log_stats(sources)
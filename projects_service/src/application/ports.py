@@ -1,7 +1,10 @@
-from typing import Protocol
+from typing import Iterable, Protocol
 from uuid import UUID
 
 
 class UsersGateway(Protocol):
     async def check_user_exists(self, user_id: UUID) -> bool:
         ...
+
+    async def check_users_exist(self, user_ids: Iterable[UUID]) -> dict[UUID, bool]:
+        ...
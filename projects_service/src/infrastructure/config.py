@@ -4,6 +4,8 @@ from urllib.parse import quote_plus
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from common.rate_limit import RateLimitRule
+
 
 class Settings(BaseSettings):
     DB_HOST: str
@@ -16,6 +18,12 @@ class Settings(BaseSettings):
     REDIS_PORT: int
     REDIS_PASSWORD: str | None = None
     REDIS_DB: int = 0
+    REDIS_AUTO_PIPELINE: bool = False
+    REDIS_AUTO_PIPELINE_MAX_BATCH: int = Field(default=512, ge=1)
+    REDIS_NEAR_CACHE_ENABLED: bool = False
+    REDIS_NEAR_CACHE_PREFIXES: list[str] = ["projects:user_exists:"]
+    REDIS_NEAR_CACHE_MAX_KEYS: int = Field(default=10_000, ge=1)
+    REDIS_NEAR_CACHE_HEALTH_CHECK_SECONDS: float = Field(default=5, gt=0)
 
     JWT_SECRET: str = Field(min_length=32)
     JWT_ALGORITHM: Literal["HS256"] = "HS256"
@@ -27,8 +35,42 @@ class Settings(BaseSettings):
     AUTH_GRPC_HOST: str = "auth_service"
     AUTH_GRPC_PORT: int = 50051
     AUTH_GRPC_TIMEOUT_SECONDS: float = Field(default=2.0, gt=0, le=10)
+    AUTH_GRPC_TARGETS: list[str] = []
+    AUTH_GRPC_UDS_PATH: str | None = None
+    AUTH_GRPC_LB_POLICY: Literal["round_robin", "pick_first"] = "round_robin"
+    AUTH_GRPC_CHANNEL_POOL_SIZE: int = Field(default=2, ge=1, le=16)
+    AUTH_GRPC_KEEPALIVE_TIME_MS: int = Field(default=30_000, ge=10_000)
+    AUTH_GRPC_KEEPALIVE_TIMEOUT_MS: int = Field(default=10_000, ge=1_000)
+    AUTH_GRPC_WARMUP_TIMEOUT_SECONDS: float = Field(default=3.0, ge=0)
+    AUTH_GRPC_BREAKER_FAILURE_THRESHOLD: int = Field(default=5, ge=1)
+    AUTH_GRPC_BREAKER_RECOVERY_SECONDS: float = Field(default=10.0, gt=0)
+    AUTH_GRPC_MAX_RETRIES: int = Field(default=2, ge=0)
+    AUTH_GRPC_RETRY_BUDGET_TOKENS: float = Field(default=10.0, ge=0)
+    AUTH_GRPC_RETRY_BUDGET_RATIO: float = Field(default=0.1, ge=0)
+    AUTH_GRPC_HEDGE_ENABLED: bool = False
+    AUTH_GRPC_HEDGE_MIN_DELAY_MS: float = Field(default=10.0, ge=0)
     GRPC_SERVICE_TOKEN: str = Field(min_length=32)
+    USERS_CACHE_MAX_SIZE: int = Field(default=10_000, ge=0)
+    USERS_CACHE_POSITIVE_TTL_SECONDS: float = Field(default=60, ge=0)
+    USERS_CACHE_NEGATIVE_TTL_SECONDS: float = Field(default=5, ge=0)
+    USERS_CACHE_REDIS_ENABLED: bool = False
     ALLOWED_ORIGINS: list[str] = ["http://localhost:3000"]
+    STATS_LOG_INTERVAL_SECONDS: float = Field(default=60, gt=0)
+
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMIT_RULES: list[RateLimitRule] = [
+        RateLimitRule(name="projects_list", path="/projects", methods=["GET"], scope="ip", limit=300),
+        RateLimitRule(name="global_ip", path="/", scope="ip", limit=1200),
+        RateLimitRule(name="global_user", path="/", scope="user", limit=1200),
+    ]
+    RATE_LIMIT_EXEMPT_PATHS: list[str] = ["/health"]
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
+    RATE_LIMIT_TRUSTED_PROXIES: int = Field(default=1, ge=1)
+    RATE_LIMIT_LOCAL_SHARE: float = Field(default=0.5, ge=0, le=1)
+    RATE_LIMIT_LOCAL_SYNC_SECONDS: float = Field(default=1.0, gt=0)
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = Field(default=10_000, ge=1)
+    RATE_LIMIT_LOCAL_MIN_LIMIT: int = Field(default=100, ge=0)
+    RATE_LIMIT_REPLICAS: int = Field(default=1, ge=1)
 
     @field_validator("USERS_SERVICE_URL")
     @classmethod
@@ -48,6 +90,12 @@ class Settings(BaseSettings):
         credentials = f":{quote_plus(self.REDIS_PASSWORD)}@" if self.REDIS_PASSWORD else ""
         return f"redis://{credentials}{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
 
+    @property
+    def AUTH_GRPC_ENDPOINTS(self) -> list[str]:
+        if self.AUTH_GRPC_UDS_PATH:
+            return [f"unix:{self.AUTH_GRPC_UDS_PATH}"]
+        return self.AUTH_GRPC_TARGETS
+
     @property
     def AUTH_LOGIN_URL(self):
         return f"{self.USERS_SERVICE_URL}/auth/login"
@@ -10,3 +10,7 @@ class TokenInvalidError(TokenError):
 
 class ExternalServiceUnavailable(Exception):
     pass
+
+
+class CircuitOpenError(ExternalServiceUnavailable):
+    pass
@@ -1,53 +1,180 @@
+import asyncio
 import logging
+from typing import Awaitable, Callable, Iterable, TypeVar
 from uuid import UUID
 
 import grpc
 
 from projects_service.src.infrastructure.exceptions import ExternalServiceUnavailable
+from projects_service.src.infrastructure.resilience import GatewayResilience
+from projects_service.src.infrastructure.user_existence_cache import UserExistenceCache
 
 from .generated import users_pb2, users_pb2_grpc
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class UsersGrpcClient:
-    def __init__(self, host: str, port: int, service_token: str, timeout_seconds: float):
-        self.addr = f"{host}:{port}"
+    MAX_BATCH_SIZE = 500
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            service_token: str,
+            timeout_seconds: float,
+            cache: UserExistenceCache | None = None,
+            resilience: GatewayResilience | None = None,
+            targets: list[str] | None = None,
+            pool_size: int = 1,
+            lb_policy: str = "round_robin",
+            keepalive_time_ms: int = 30_000,
+            keepalive_timeout_ms: int = 10_000,
+    ):
+        self.targets = list(targets) if targets else [f"dns:///{host}:{port}"]
         self.service_token = service_token
         self.timeout_seconds = timeout_seconds
-        self._channel: grpc.aio.Channel | None = None
-        self._stub: users_pb2_grpc.UsersExternalStub | None = None
-
-    def _get_channel(self) -> grpc.aio.Channel:
-        if self._channel is None:
-            self._channel = grpc.aio.insecure_channel(
-                self.addr,
-                options=[
-                    ("grpc.max_receive_message_length", 64 * 1024),
-                    ("grpc.max_send_message_length", 64 * 1024),
-                ],
-            )
-        return self._channel
+        self.cache = cache
+        self.resilience = resilience
+        self.pool_size = pool_size
+        self.lb_policy = lb_policy
+        self.keepalive_time_ms = keepalive_time_ms
+        self.keepalive_timeout_ms = keepalive_timeout_ms
+        self._channels: list[grpc.aio.Channel] = []
+        self._stubs: list[users_pb2_grpc.UsersExternalStub] = []
+        self._next_stub = 0
+        self._in_flight: dict[UUID, asyncio.Task[bool]] = {}
+
+    def _get_channels(self) -> list[grpc.aio.Channel]:
+        if not self._channels:
+            options = [
+                ("grpc.max_receive_message_length", 64 * 1024),
+                ("grpc.max_send_message_length", 64 * 1024),
+                ("grpc.lb_policy_name", self.lb_policy),
+                ("grpc.keepalive_time_ms", self.keepalive_time_ms),
+                ("grpc.keepalive_timeout_ms", self.keepalive_timeout_ms),
+                ("grpc.keepalive_permit_without_calls", 1),
+                ("grpc.http2.max_pings_without_data", 0),
+                # Without a local subchannel pool, channels with equal arguments
+                # share one connection and the pool would not add capacity.
+                ("grpc.use_local_subchannel_pool", 1),
+            ]
+            self._channels = [
+                grpc.aio.insecure_channel(target, options=options)
+                for target in self.targets
+                for _ in range(self.pool_size)
+            ]
+        return self._channels
 
     def _get_stub(self) -> users_pb2_grpc.UsersExternalStub:
-        if self._stub is None:
-            channel = self._get_channel()
-            self._stub = users_pb2_grpc.UsersExternalStub(channel)
-        return self._stub
+        if not self._stubs:
+            self._stubs = [users_pb2_grpc.UsersExternalStub(channel) for channel in self._get_channels()]
+        stub = self._stubs[self._next_stub % len(self._stubs)]
+        self._next_stub += 1
+        return stub
+
+    async def warm_up(self, timeout: float) -> int:
+        channels = self._get_channels()
+        results = await asyncio.gather(
+            *(asyncio.wait_for(channel.channel_ready(), timeout) for channel in channels),
+            return_exceptions=True,
+        )
+        ready = sum(result is None for result in results)
+        if ready < len(channels):
+            logger.warning("Only %s of %s auth gRPC channels became ready", ready, len(channels))
+        return ready
 
     async def check_user_exists(self, user_id: UUID) -> bool:
+        if self.cache is not None:
+            cached = await self.cache.get(user_id)
+            if cached is not None:
+                return cached
+
+        task = self._in_flight.get(user_id)
+        if task is None:
+            task = asyncio.create_task(self._fetch_user_exists(user_id))
+            self._in_flight[user_id] = task
+            task.add_done_callback(lambda done: self._forget_in_flight(user_id, done))
+        return await asyncio.shield(task)
+
+    def _forget_in_flight(self, user_id: UUID, task: asyncio.Task) -> None:
+        if self._in_flight.get(user_id) is task:
+            del self._in_flight[user_id]
+
+    async def _fetch_user_exists(self, user_id: UUID) -> bool:
+        exists = await self._call_user_exists(user_id)
+        if self.cache is not None:
+            await self.cache.set(user_id, exists)
+        return exists
+
+    async def _invoke(self, attempt: Callable[[], Awaitable[T]]) -> T:
+        if self.resilience is None:
+            return await attempt()
+        return await self.resilience.call(attempt)
+
+    async def _call_user_exists(self, user_id: UUID) -> bool:
         stub = self._get_stub()
-        try:
-            response = await stub.GetUserExistence(
+
+        async def attempt():
+            return await stub.GetUserExistence(
                 users_pb2.UserRequest(user_id=str(user_id)),
                 timeout=self.timeout_seconds,
                 metadata=(("x-service-token", self.service_token),),
             )
+
+        try:
+            response = await self._invoke(attempt)
             return response.exists
         except grpc.aio.AioRpcError as exc:
             logger.warning("Auth gRPC call failed with status %s", exc.code())
             raise ExternalServiceUnavailable("Auth service is unavailable") from exc
 
+    async def check_users_exist(self, user_ids: Iterable[UUID]) -> dict[UUID, bool]:
+        result: dict[UUID, bool] = {}
+        unique_ids = []
+        for user_id in dict.fromkeys(user_ids):
+            cached = await self.cache.get(user_id) if self.cache is not None else None
+            if cached is None:
+                unique_ids.append(user_id)
+            else:
+                result[user_id] = cached
+
+        stub = self._get_stub()
+        for start in range(0, len(unique_ids), self.MAX_BATCH_SIZE):
+            request = users_pb2.UsersRequest(
+                user_ids=[str(user_id) for user_id in unique_ids[start:start + self.MAX_BATCH_SIZE]]
+            )
+
+            async def attempt(request=request):
+                return await stub.GetUsersExistence(
+                    request,
+                    timeout=self.timeout_seconds,
+                    metadata=(("x-service-token", self.service_token),),
+                )
+
+            try:
+                response = await self._invoke(attempt)
+            except grpc.aio.AioRpcError as exc:
+                logger.warning("Auth gRPC batch call failed with status %s", exc.code())
+                raise ExternalServiceUnavailable("Auth service is unavailable") from exc
+            for item in response.users:
+                user_id = UUID(item.user_id)
+                result[user_id] = item.exists
+                if self.cache is not None:
+                    await self.cache.set(user_id, item.exists)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "channels": len(self._channels),
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "resilience": self.resilience.stats() if self.resilience is not None else None,
+        }
+
     async def close(self):
-        if self._channel:
-            await self._channel.close()
+        for channel in self._channels:
+            await channel.close()
+        self._channels = []
+        self._stubs = []
@@ -0,0 +1,229 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+import grpc
+
+from projects_service.src.infrastructure.exceptions import CircuitOpenError
+
+T = TypeVar("T")
+
+RETRYABLE_CODES = frozenset({grpc.StatusCode.UNAVAILABLE})
+FAILURE_CODES = frozenset({
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+    grpc.StatusCode.INTERNAL,
+    grpc.StatusCode.UNKNOWN,
+})
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+            self,
+            failure_threshold: int = 5,
+            recovery_seconds: float = 10.0,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.clock = clock
+        self.state = self.CLOSED
+        self.transitions = {self.CLOSED: 0, self.OPEN: 0, self.HALF_OPEN: 0}
+        self.rejected = 0
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN:
+            if self.clock() - self._opened_at < self.recovery_seconds:
+                self.rejected += 1
+                return False
+            self._set_state(self.HALF_OPEN)
+
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                self.rejected += 1
+                return False
+            self._probe_in_flight = True
+
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._probe_in_flight = False
+        if self.state != self.CLOSED:
+            self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        self._probe_in_flight = False
+        self._failures += 1
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._opened_at = self.clock()
+            self._set_state(self.OPEN)
+
+    def release(self) -> None:
+        self._probe_in_flight = False
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        self.transitions[state] += 1
+
+
+class RetryBudget:
+    def __init__(self, max_tokens: float = 10.0, token_ratio: float = 0.1):
+        self.max_tokens = max_tokens
+        self.token_ratio = token_ratio
+        self.tokens = max_tokens
+
+    def record_request(self) -> None:
+        self.tokens = min(self.max_tokens, self.tokens + self.token_ratio)
+
+    def try_spend(self) -> bool:
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class LatencyTracker:
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> float | None:
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class GatewayResilience:
+    def __init__(
+            self,
+            breaker: CircuitBreaker | None = None,
+            retry_budget: RetryBudget | None = None,
+            max_retries: int = 2,
+            hedge: bool = False,
+            hedge_min_delay: float = 0.01,
+            latency: LatencyTracker | None = None,
+    ):
+        self.breaker = breaker or CircuitBreaker()
+        self.retry_budget = retry_budget or RetryBudget()
+        self.max_retries = max_retries
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+        self.latency = latency or LatencyTracker()
+
+        self.calls = 0
+        self.failures = 0
+        self.short_circuited = 0
+        self.retries = 0
+        self.retries_denied = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    async def call(self, attempt: Callable[[], Awaitable[T]]) -> T:
+        if not self.breaker.allow():
+            self.short_circuited += 1
+            raise CircuitOpenError("Auth service circuit is open")
+
+        self.calls += 1
+        self.retry_budget.record_request()
+        retries = 0
+        while True:
+            try:
+                result = await self._attempt(attempt)
+            except grpc.aio.AioRpcError as exc:
+                code = exc.code()
+                if code in RETRYABLE_CODES and retries < self.max_retries:
+                    if self.retry_budget.try_spend():
+                        retries += 1
+                        self.retries += 1
+                        continue
+                    self.retries_denied += 1
+
+                if code in FAILURE_CODES:
+                    self.failures += 1
+                    self.breaker.record_failure()
+                else:
+                    # The service answered; the caller sent a bad request.
+                    self.breaker.record_success()
+                raise
+            except BaseException:
+                self.breaker.release()
+                raise
+
+            self.breaker.record_success()
+            return result
+
+    def stats(self) -> dict[str, float | int | str | None]:
+        p95 = self.latency.percentile(95)
+        return {
+            "state": self.breaker.state,
+            "opened": self.breaker.transitions[CircuitBreaker.OPEN],
+            "half_opened": self.breaker.transitions[CircuitBreaker.HALF_OPEN],
+            "closed": self.breaker.transitions[CircuitBreaker.CLOSED],
+            "calls": self.calls,
+            "failures": self.failures,
+            "short_circuited": self.short_circuited,
+            "retries": self.retries,
+            "retries_denied": self.retries_denied,
+            "retry_tokens": self.retry_budget.tokens,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "p95_ms": p95 * 1000 if p95 is not None else None,
+        }
+
+    def _hedge_delay(self) -> float | None:
+        if not self.hedge:
+            return None
+        p95 = self.latency.percentile(95)
+        if p95 is None:
+            return None
+        return max(self.hedge_min_delay, p95)
+
+    async def _attempt(self, attempt: Callable[[], Awaitable[T]]) -> T:
+        started = time.perf_counter()
+        delay = self._hedge_delay()
+        if delay is None:
+            result = await attempt()
+        else:
+            result = await self._hedged(attempt, delay)
+        self.latency.observe(time.perf_counter() - started)
+        return result
+
+    async def _hedged(self, attempt: Callable[[], Awaitable[T]], delay: float) -> T:
+        primary = asyncio.ensure_future(attempt())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return primary.result()
+
+            self.hedges += 1
+            hedge = asyncio.ensure_future(attempt())
+            tasks.add(hedge)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+            return hedge.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
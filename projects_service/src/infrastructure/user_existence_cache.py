@@ -0,0 +1,109 @@
+import logging
+import time
+from collections import OrderedDict
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from projects_service.src.infrastructure.near_cache import NearCache
+
+logger = logging.getLogger(__name__)
+
+
+class UserExistenceCache:
+    def __init__(
+            self,
+            max_size: int = 10_000,
+            positive_ttl: float = 60,
+            negative_ttl: float = 5,
+            redis: Redis | None = None,
+            near_cache: NearCache | None = None,
+    ):
+        self.max_size = max_size
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.redis = redis
+        self.near_cache = near_cache
+        self._entries: OrderedDict[UUID, tuple[bool, float]] = OrderedDict()
+
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(user_id: UUID) -> str:
+        return f"projects:user_exists:{user_id}"
+
+    async def get(self, user_id: UUID) -> bool | None:
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            exists, expires_at = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return exists
+            del self._entries[user_id]
+
+        if self.redis is not None:
+            try:
+                exists = await self._get_shared(user_id)
+            except RedisError:
+                logger.warning("Redis is unavailable for user existence cache lookup")
+                exists = None
+            if exists is not None:
+                self.redis_hits += 1
+                return exists
+
+        self.misses += 1
+        return None
+
+    async def set(self, user_id: UUID, exists: bool) -> None:
+        self._remember_locally(user_id, exists)
+        if self.redis is not None:
+            try:
+                await self.redis.set(self._key(user_id), int(exists), px=int(self._ttl(exists) * 1000))
+            except RedisError:
+                logger.warning("Redis is unavailable for user existence cache fill")
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+        }
+
+    async def _get_shared(self, user_id: UUID) -> bool | None:
+        key = self._key(user_id)
+        if self.near_cache is not None:
+            # The near cache is already the in-process copy and drops the key
+            # when Redis expires it, so it is not copied into local entries.
+            raw_value = await self.near_cache.get(key)
+            return None if raw_value is None else raw_value == "1"
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.get(key)
+            pipe.pttl(key)
+            raw_value, remaining_ms = await pipe.execute()
+        if raw_value is None:
+            return None
+        exists = raw_value == "1"
+        # Another replica filled the key earlier, so only its remaining
+        # lifetime is left; restarting the full TTL here would outlive it.
+        if remaining_ms > 0:
+            self._remember_locally(user_id, exists, min(self._ttl(exists), remaining_ms / 1000))
+        return exists
+
+    def _ttl(self, exists: bool) -> float:
+        return self.positive_ttl if exists else self.negative_ttl
+
+    def _remember_locally(self, user_id: UUID, exists: bool, ttl: float | None = None) -> None:
+        ttl = self._ttl(exists) if ttl is None else ttl
+        self._entries[user_id] = (exists, time.monotonic() + ttl)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
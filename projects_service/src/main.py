@@ -3,10 +3,14 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from common.stats_log import periodic_stats_log
 from projects_service.src.infrastructure.config import settings
 from projects_service.src.infrastructure.database import engine
 from projects_service.src.infrastructure.grpc_client import UsersGrpcClient
 from projects_service.src.infrastructure.middleware import setup_middleware
+from projects_service.src.infrastructure.redis import close_redis_pool, get_near_cache, get_redis_client
+from projects_service.src.infrastructure.resilience import CircuitBreaker, GatewayResilience, RetryBudget
+from projects_service.src.infrastructure.user_existence_cache import UserExistenceCache
 from projects_service.src.presentation.routes import router as projects_router
 
 logger = logging.getLogger(__name__)
@@ -14,18 +18,56 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    near_cache = get_near_cache()
+    if near_cache is not None:
+        await near_cache.start()
+
+    cache = None
+    if settings.USERS_CACHE_MAX_SIZE:
+        cache = UserExistenceCache(
+            max_size=settings.USERS_CACHE_MAX_SIZE,
+            positive_ttl=settings.USERS_CACHE_POSITIVE_TTL_SECONDS,
+            negative_ttl=settings.USERS_CACHE_NEGATIVE_TTL_SECONDS,
+            redis=get_redis_client() if settings.USERS_CACHE_REDIS_ENABLED else None,
+            near_cache=near_cache if settings.USERS_CACHE_REDIS_ENABLED else None,
+        )
     client = UsersGrpcClient(
         host=settings.AUTH_GRPC_HOST,
         port=settings.AUTH_GRPC_PORT,
         service_token=settings.GRPC_SERVICE_TOKEN,
         timeout_seconds=settings.AUTH_GRPC_TIMEOUT_SECONDS,
+        targets=settings.AUTH_GRPC_ENDPOINTS,
+        pool_size=settings.AUTH_GRPC_CHANNEL_POOL_SIZE,
+        lb_policy=settings.AUTH_GRPC_LB_POLICY,
+        keepalive_time_ms=settings.AUTH_GRPC_KEEPALIVE_TIME_MS,
+        keepalive_timeout_ms=settings.AUTH_GRPC_KEEPALIVE_TIMEOUT_MS,
+        cache=cache,
+        resilience=GatewayResilience(
+            breaker=CircuitBreaker(
+                failure_threshold=settings.AUTH_GRPC_BREAKER_FAILURE_THRESHOLD,
+                recovery_seconds=settings.AUTH_GRPC_BREAKER_RECOVERY_SECONDS,
+            ),
+            retry_budget=RetryBudget(
+                max_tokens=settings.AUTH_GRPC_RETRY_BUDGET_TOKENS,
+                token_ratio=settings.AUTH_GRPC_RETRY_BUDGET_RATIO,
+            ),
+            max_retries=settings.AUTH_GRPC_MAX_RETRIES,
+            hedge=settings.AUTH_GRPC_HEDGE_ENABLED,
+            hedge_min_delay=settings.AUTH_GRPC_HEDGE_MIN_DELAY_MS / 1000,
+        ),
     )
     app.state.users_gateway = client
+    if settings.AUTH_GRPC_WARMUP_TIMEOUT_SECONDS:
+        await client.warm_up(settings.AUTH_GRPC_WARMUP_TIMEOUT_SECONDS)
     logger.info("Configured Auth Service gRPC client")
 
-    yield
-
+    stats_sources = {"Auth Service gRPC client": client.stats}
+    if near_cache is not None:
+        stats_sources["Redis near cache"] = near_cache.stats
+    async with periodic_stats_log(stats_sources, settings.STATS_LOG_INTERVAL_SECONDS):
+        yield
     await client.close()
+    await close_redis_pool()
     await engine.dispose()
 
 
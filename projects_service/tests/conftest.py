@@ -50,6 +50,9 @@ class FakeUsersGateway:
             raise ExternalServiceUnavailable("auth is down")
         return user_id in self.existing_users
 
+    async def check_users_exist(self, user_ids) -> dict[UUID, bool]:
+        return {user_id: await self.check_user_exists(user_id) for user_id in user_ids}
+
 
 async def _reset_database() -> None:
     if "test" not in settings.DB_NAME.lower():
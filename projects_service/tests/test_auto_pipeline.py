@@ -0,0 +1,73 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from projects_service.src.infrastructure.auto_pipeline import AutoPipelineRedis
+from projects_service.src.infrastructure.config import settings
+from projects_service.src.infrastructure.user_existence_cache import UserExistenceCache
+
+
+@pytest_asyncio.fixture
+async def redis_client():
+    redis = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    yield redis
+    keys = [key async for key in redis.scan_iter("auto:*")]
+    if keys:
+        await redis.delete(*keys)
+    await redis.aclose()
+
+
+@pytest_asyncio.fixture
+async def auto_redis(redis_client):
+    client = AutoPipelineRedis(connection_pool=redis_client.connection_pool)
+    yield client
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_commands_share_one_pipeline(auto_redis):
+    results = await asyncio.gather(*(auto_redis.incr("auto:counter") for _ in range(50)))
+
+    assert sorted(results) == list(range(1, 51))
+    assert auto_redis.batches == 1
+    assert auto_redis.batched_commands == 50
+
+
+@pytest.mark.asyncio
+async def test_auto_pipeline_splits_batches_and_keeps_errors_with_their_command(redis_client):
+    client = AutoPipelineRedis(connection_pool=redis_client.connection_pool, max_batch_size=2)
+    await redis_client.set("auto:string", "value")
+
+    try:
+        results = await asyncio.gather(
+            client.set("auto:ok", 1),
+            client.lpush("auto:string", "item"),
+            client.get("auto:string"),
+            return_exceptions=True,
+        )
+        assert client.batches == 2
+    finally:
+        await client.aclose()
+
+    assert results[0] is True
+    assert isinstance(results[1], ResponseError)
+    assert results[2] == "value"
+
+
+@pytest.mark.asyncio
+async def test_user_existence_cache_runs_unchanged_on_auto_pipeline(auto_redis, redis_client):
+    user_ids = [uuid4() for _ in range(20)]
+    cache = UserExistenceCache(positive_ttl=0, negative_ttl=0, redis=auto_redis)
+
+    try:
+        await asyncio.gather(*(cache.set(user_id, index % 2 == 0) for index, user_id in enumerate(user_ids)))
+        found = await asyncio.gather(*(cache.get(user_id) for user_id in user_ids))
+    finally:
+        await redis_client.delete(*(cache._key(user_id) for user_id in user_ids))
+
+    assert found == [index % 2 == 0 for index in range(len(user_ids))]
+    assert auto_redis.batches <= 4
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from redis.asyncio import Redis
+
+from projects_service.src.infrastructure.config import settings
+from projects_service.src.infrastructure.near_cache import NearCache
+from projects_service.src.infrastructure.user_existence_cache import UserExistenceCache
+
+
+@pytest_asyncio.fixture
+async def near_cache_redis():
+    redis = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    yield redis
+    keys = [key async for key in redis.scan_iter("projects:user_exists:*")]
+    if keys:
+        await redis.delete(*keys)
+    await redis.aclose()
+
+
+@pytest.mark.asyncio
+async def test_user_existence_reads_use_near_cache_until_another_replica_invalidates(near_cache_redis):
+    user_id = uuid4()
+    writer = UserExistenceCache(redis=near_cache_redis)
+    await writer.set(user_id, True)
+
+    near_cache = NearCache(near_cache_redis, prefixes=settings.REDIS_NEAR_CACHE_PREFIXES)
+    await near_cache.start(timeout=5)
+    reader = UserExistenceCache(positive_ttl=0, negative_ttl=0, redis=near_cache_redis, near_cache=near_cache)
+    try:
+        assert await reader.get(user_id) is True
+        assert await reader.get(user_id) is True
+        assert near_cache.hits == 1
+
+        await writer.set(user_id, False)
+        for _ in range(200):
+            if near_cache.invalidations:
+                break
+            await asyncio.sleep(0.01)
+
+        assert await reader.get(user_id) is False
+    finally:
+        await near_cache.aclose()
+
+
+def test_user_existence_keys_do_not_collide_with_auth_presence_keys():
+    user_id = uuid4()
+    key = UserExistenceCache._key(user_id)
+
+    assert key == f"projects:user_exists:{user_id}"
+    assert any(key.startswith(prefix) for prefix in settings.REDIS_NEAR_CACHE_PREFIXES)
+
+
+@pytest.mark.asyncio
+async def test_user_existence_redis_hits_keep_only_the_remaining_ttl_locally(near_cache_redis):
+    user_id = uuid4()
+    writer = UserExistenceCache(redis=near_cache_redis)
+    await writer.set(user_id, True)
+    await near_cache_redis.pexpire(writer._key(user_id), 200)
+
+    reader = UserExistenceCache(positive_ttl=60, redis=near_cache_redis)
+    assert await reader.get(user_id) is True
+    _, expires_at = reader._entries[user_id]
+    assert expires_at - time.monotonic() <= 0.2
+
+    await asyncio.sleep(0.25)
+    assert await reader.get(user_id) is None
+    assert reader.stats()["redis_hits"] == 1
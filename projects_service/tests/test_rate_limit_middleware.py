@@ -0,0 +1,90 @@
+from functools import partial
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from jose import jwt
+from redis.asyncio import Redis
+
+from common.rate_limit import RateLimitMiddleware, RateLimitRule
+from projects_service.src.infrastructure.config import settings
+from projects_service.src.infrastructure.redis import get_redis_client
+from projects_service.src.infrastructure.security import decode_access_token
+
+
+@pytest_asyncio.fixture
+async def rate_limit_redis():
+    redis = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    yield redis
+    keys = [key async for key in redis.scan_iter("ratelimit:*")]
+    if keys:
+        await redis.delete(*keys)
+    await redis.aclose()
+
+
+def _app(redis: Redis, rules: list[RateLimitRule], **kwargs) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/projects/")
+    async def list_projects():
+        return []
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        rules=rules,
+        redis_factory=get_redis_client,
+        user_id_decoder=partial(decode_access_token, token_type="auth"),
+        **kwargs,
+    )
+    app.dependency_overrides[get_redis_client] = lambda: redis
+    return app
+
+
+def _auth_header(user_id) -> dict[str, str]:
+    token = jwt.encode(
+        {"sub": str(user_id), "type": "auth", "iss": settings.JWT_ISSUER, "aud": settings.JWT_AUDIENCE},
+        settings.JWT_SECRET,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+async def test_project_listing_is_limited_per_ip_and_per_user(rate_limit_redis):
+    listing = f"projects_list_{uuid4().hex}"
+    per_user = f"global_user_{uuid4().hex}"
+    rules = [
+        RateLimitRule(name=listing, path="/projects", methods=["GET"], limit=3),
+        RateLimitRule(name=per_user, path="/", scope="user", limit=1),
+    ]
+    transport = ASGITransport(app=_app(rate_limit_redis, rules))
+    headers = _auth_header(uuid4())
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        authenticated = [(await client.get("/projects/", headers=headers)).status_code for _ in range(2)]
+        anonymous = [await client.get("/projects/") for _ in range(3)]
+
+    # The rejected request is not charged to the listing bucket.
+    assert authenticated == [200, 429]
+    assert [response.status_code for response in anonymous] == [200, 200, 429]
+    assert anonymous[1].headers["RateLimit-Remaining"] == "0"
+    assert int(anonymous[2].headers["Retry-After"]) >= 1
+
+
+@pytest.mark.asyncio
+async def test_project_listing_ignores_client_supplied_forwarded_entries(rate_limit_redis):
+    rules = [RateLimitRule(name=f"projects_list_{uuid4().hex}", path="/projects", methods=["GET"], limit=1)]
+    transport = ASGITransport(app=_app(rate_limit_redis, rules, trust_forwarded=True))
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        spoofed = [
+            (await client.get("/projects/", headers={"X-Forwarded-For": f"198.51.100.{index}, 10.0.0.1"})).status_code
+            for index in range(3)
+        ]
+        other_client = await client.get("/projects/", headers={"X-Forwarded-For": "198.51.100.1, 10.0.0.2"})
+
+    assert spoofed == [200, 429, 429]
+    assert other_client.status_code == 200
+
@@ -1,19 +1,30 @@
+import asyncio
 from datetime import UTC, datetime, timedelta
 from types import SimpleNamespace
 
 import grpc
 import pytest
+import pytest_asyncio
 from fastapi import HTTPException
 from jose import jwt
 
 from projects_service.src.infrastructure.config import settings
 from projects_service.src.infrastructure.exceptions import (
+    CircuitOpenError,
     ExternalServiceUnavailable,
     TokenExpiredError,
     TokenInvalidError,
 )
+from projects_service.src.infrastructure.generated import users_pb2, users_pb2_grpc
 from projects_service.src.infrastructure.grpc_client import UsersGrpcClient
+from projects_service.src.infrastructure.resilience import (
+    CircuitBreaker,
+    GatewayResilience,
+    LatencyTracker,
+    RetryBudget,
+)
 from projects_service.src.infrastructure.security import decode_access_token
+from projects_service.src.infrastructure.user_existence_cache import UserExistenceCache
 from projects_service.src.presentation.dependencies import (
     get_current_user_id,
     get_optional_user_id,
@@ -88,7 +99,7 @@ async def test_users_grpc_client_sends_service_token_metadata(user_id):
 
     stub = Stub()
     client = UsersGrpcClient("auth", 50051, "service-token", 1.5)
-    client._stub = stub
+    client._stubs = [stub]
 
     assert await client.check_user_exists(user_id) is True
     assert stub.request.user_id == str(user_id)
@@ -107,7 +118,219 @@ async def test_users_grpc_client_wraps_rpc_errors(user_id):
             raise FakeRpcError(grpc.StatusCode.UNAVAILABLE, None, None)
 
     client = UsersGrpcClient("auth", 50051, "service-token", 1.5)
-    client._stub = Stub()
+    client._stubs = [Stub()]
 
     with pytest.raises(ExternalServiceUnavailable):
         await client.check_user_exists(user_id)
+
+
+@pytest.mark.asyncio
+async def test_users_grpc_client_checks_users_in_deduplicated_batches(user_id, another_user_id, monkeypatch):
+    class Stub:
+        def __init__(self):
+            self.batches = []
+
+        async def GetUsersExistence(self, request, timeout, metadata):
+            self.batches.append(list(request.user_ids))
+            assert metadata == (("x-service-token", "service-token"),)
+            return SimpleNamespace(
+                users=[SimpleNamespace(user_id=raw_id, exists=raw_id == str(user_id)) for raw_id in request.user_ids]
+            )
+
+    monkeypatch.setattr(UsersGrpcClient, "MAX_BATCH_SIZE", 1)
+    stub = Stub()
+    client = UsersGrpcClient("auth", 50051, "service-token", 1.5)
+    client._stubs = [stub]
+
+    result = await client.check_users_exist([user_id, another_user_id, user_id])
+
+    assert result == {user_id: True, another_user_id: False}
+    assert stub.batches == [[str(user_id)], [str(another_user_id)]]
+
+
+@pytest.mark.asyncio
+async def test_users_grpc_client_caches_and_coalesces_existence_checks(user_id, another_user_id):
+    class Stub:
+        def __init__(self):
+            self.calls = []
+            self.release = asyncio.Event()
+
+        async def GetUserExistence(self, request, timeout, metadata):
+            self.calls.append(request.user_id)
+            await self.release.wait()
+            return SimpleNamespace(exists=request.user_id == str(user_id))
+
+    stub = Stub()
+    cache = UserExistenceCache(max_size=1, positive_ttl=60, negative_ttl=0)
+    client = UsersGrpcClient("auth", 50051, "service-token", 1.5, cache=cache)
+    client._stubs = [stub]
+
+    pending = [asyncio.create_task(client.check_user_exists(user_id)) for _ in range(5)]
+    await asyncio.sleep(0)
+    stub.release.set()
+    assert await asyncio.gather(*pending) == [True] * 5
+    assert stub.calls == [str(user_id)]
+
+    assert await client.check_user_exists(user_id) is True
+    assert stub.calls == [str(user_id)]
+
+    assert await client.check_user_exists(another_user_id) is False
+    assert await client.check_user_exists(another_user_id) is False
+    assert stub.calls == [str(user_id), str(another_user_id), str(another_user_id)]
+
+    cache.clear()
+    assert await client.check_user_exists(user_id) is True
+    assert len(stub.calls) == 4
+    assert cache.stats()["size"] == 1
+
+
+class FlakyUsersServicer(users_pb2_grpc.UsersExternalServicer):
+    def __init__(self):
+        self.calls = 0
+        self.unavailable_calls = 0
+        self.slow_calls = 0
+        self.peers = set()
+
+    async def GetUserExistence(self, request, context):
+        self.calls += 1
+        self.peers.add(context.peer())
+        if self.unavailable_calls:
+            self.unavailable_calls -= 1
+            await context.abort(grpc.StatusCode.UNAVAILABLE, "warming up")
+        if self.slow_calls:
+            self.slow_calls -= 1
+            await asyncio.sleep(1)
+        return users_pb2.ExistenceResponse(exists=True)
+
+
+@pytest_asyncio.fixture
+async def flaky_auth_server():
+    servicer = FlakyUsersServicer()
+    server = grpc.aio.server()
+    users_pb2_grpc.add_UsersExternalServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    yield servicer, port
+    await server.stop(None)
+
+
+@pytest.mark.asyncio
+async def test_gateway_resilience_retries_unavailable_within_budget(flaky_auth_server, user_id):
+    servicer, port = flaky_auth_server
+    resilience = GatewayResilience(retry_budget=RetryBudget(max_tokens=1, token_ratio=0), max_retries=2)
+    client = UsersGrpcClient("127.0.0.1", port, "service-token", 1.5, resilience=resilience)
+
+    try:
+        servicer.unavailable_calls = 1
+        assert await client.check_user_exists(user_id) is True
+        assert servicer.calls == 2
+
+        servicer.unavailable_calls = 1
+        with pytest.raises(ExternalServiceUnavailable):
+            await client.check_user_exists(user_id)
+        assert servicer.calls == 3
+    finally:
+        await client.close()
+
+    stats = resilience.stats()
+    assert stats["retries"] == 1
+    assert stats["retries_denied"] == 1
+    assert stats["failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_gateway_resilience_opens_circuit_and_recovers(flaky_auth_server, user_id):
+    servicer, port = flaky_auth_server
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, recovery_seconds=5, clock=lambda: now[0])
+    resilience = GatewayResilience(breaker=breaker, max_retries=0)
+    client = UsersGrpcClient("127.0.0.1", port, "service-token", 1.5, resilience=resilience)
+
+    try:
+        servicer.unavailable_calls = 2
+        for _ in range(2):
+            with pytest.raises(ExternalServiceUnavailable):
+                await client.check_user_exists(user_id)
+        assert breaker.state == CircuitBreaker.OPEN
+
+        with pytest.raises(CircuitOpenError):
+            await client.check_user_exists(user_id)
+        assert servicer.calls == 2
+
+        now[0] = 5
+        assert await client.check_user_exists(user_id) is True
+        assert breaker.state == CircuitBreaker.CLOSED
+    finally:
+        await client.close()
+
+    stats = resilience.stats()
+    assert (stats["opened"], stats["half_opened"], stats["closed"]) == (1, 1, 1)
+    assert stats["short_circuited"] == 1
+
+
+@pytest.mark.asyncio
+async def test_gateway_resilience_hedges_slow_calls(flaky_auth_server, user_id):
+    servicer, port = flaky_auth_server
+    resilience = GatewayResilience(hedge=True, hedge_min_delay=0.05, latency=LatencyTracker(min_samples=1))
+    resilience.latency.observe(0.001)
+    client = UsersGrpcClient("127.0.0.1", port, "service-token", 1.5, resilience=resilience)
+
+    try:
+        servicer.slow_calls = 1
+        started = asyncio.get_running_loop().time()
+        assert await client.check_user_exists(user_id) is True
+        assert asyncio.get_running_loop().time() - started < 0.5
+    finally:
+        await client.close()
+
+    assert servicer.calls == 2
+    assert resilience.stats()["hedges"] == 1
+    assert resilience.stats()["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_users_grpc_client_pools_channels_across_targets(flaky_auth_server, user_id):
+    servicer, port = flaky_auth_server
+    second_servicer = FlakyUsersServicer()
+    second_server = grpc.aio.server()
+    users_pb2_grpc.add_UsersExternalServicer_to_server(second_servicer, second_server)
+    second_port = second_server.add_insecure_port("127.0.0.1:0")
+    await second_server.start()
+
+    client = UsersGrpcClient(
+        "unused",
+        0,
+        "service-token",
+        1.5,
+        targets=[f"127.0.0.1:{port}", f"127.0.0.1:{second_port}"],
+        pool_size=2,
+    )
+    try:
+        assert await client.warm_up(timeout=5) == 4
+        for _ in range(8):
+            assert await client._call_user_exists(user_id) is True
+    finally:
+        await client.close()
+        await second_server.stop(None)
+
+    assert servicer.calls == second_servicer.calls == 4
+    assert len(servicer.peers) == len(second_servicer.peers) == 2
+
+
+@pytest.mark.asyncio
+async def test_users_grpc_client_dials_unix_domain_socket(tmp_path, user_id):
+    socket_path = tmp_path / "auth-grpc.sock"
+    servicer = FlakyUsersServicer()
+    server = grpc.aio.server()
+    users_pb2_grpc.add_UsersExternalServicer_to_server(servicer, server)
+    server.add_insecure_port(f"unix:{socket_path}")
+    await server.start()
+
+    client = UsersGrpcClient("unused", 0, "service-token", 1.5, targets=[f"unix:{socket_path}"])
+    try:
+        assert await client.check_user_exists(user_id) is True
+    finally:
+        await client.close()
+        await server.stop(None)
+
+    assert servicer.calls == 1
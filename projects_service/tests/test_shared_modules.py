@@ -0,0 +1,18 @@
+from pathlib import Path
+
+import pytest
+
+REPOSITORY_ROOT = Path(__file__).resolve().parents[2]
+
+
+# Both services ship these modules in their own image; the copies must stay
+# identical apart from the package they import from.
+@pytest.mark.parametrize("module", ["auto_pipeline.py", "near_cache.py"])
+def test_infrastructure_module_matches_the_auth_service_copy(module):
+    auth_copy = REPOSITORY_ROOT / "auth_service" / "src" / "infrastructure" / module
+    if not auth_copy.exists():
+        pytest.skip("auth_service sources are not available")
+    projects_copy = REPOSITORY_ROOT / "projects_service" / "src" / "infrastructure" / module
+
+    expected = auth_copy.read_text(encoding="utf-8").replace("auth_service", "projects_service")
+    assert projects_copy.read_text(encoding="utf-8") == expected